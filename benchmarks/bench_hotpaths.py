@@ -0,0 +1,201 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+# Benchmarks for the hot paths: text extraction, field extraction, saving a
+# resume, resume search and offer letter generation. Each stage is timed
+# pytest-benchmark style (warmup, then rounds of N iterations, stats over
+# per-call times) and run once more under tracemalloc for peak memory.
+# Results are written as JSON in pytest-benchmark's layout, so
+# `pytest-benchmark compare` can read them as well as --compare here.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_hotpaths --rows 100000 --json results/main.json
+#   python -m benchmarks.bench_hotpaths --compare results/main.json
+#
+# The app opens mira_resumes.db and templates/ relative to the working
+# directory, so the suite runs inside --workdir (a fresh temp dir by default).
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ROUNDS = 5
+MIN_ROUND_TIME = 0.05   # seconds; iterations per round are scaled to reach this
+SEARCH_TERMS = ["python", "kubernetes leadership", "skills:terraform", "Garcia"]
+
+# --- HARNESS ---
+def _iterations(fn):
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    return max(1, int(MIN_ROUND_TIME / once)) if once > 0 else 1000
+
+def _peak_bytes(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def _quartiles(data):
+    if len(data) < 2:
+        return data[0], data[0]
+    q = statistics.quantiles(data, n=4)
+    return q[0], q[2]
+
+def bench(group, name, fn, rounds=DEFAULT_ROUNDS, warmup=1):
+    # Returns one pytest-benchmark style record; times are seconds per call.
+    for _ in range(warmup):
+        fn()
+    iterations = _iterations(fn)
+    data = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                fn()
+            data.append((time.perf_counter() - start) / iterations)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    q1, q3 = _quartiles(data)
+    mean = statistics.fmean(data)
+    return {
+        "group": group, "name": name, "fullname": f"benchmarks/bench_hotpaths.py::{group}::{name}",
+        "params": None, "param": None,
+        "extra_info": {"peak_bytes": _peak_bytes(fn)},
+        "stats": {
+            "min": min(data), "max": max(data), "mean": mean,
+            "stddev": statistics.stdev(data) if len(data) > 1 else 0.0,
+            "median": statistics.median(data), "q1": q1, "q3": q3, "iqr": q3 - q1,
+            "rounds": rounds, "iterations": iterations, "total": sum(data) * iterations,
+            "ops": 1 / mean if mean else 0.0, "data": data,
+        },
+    }
+
+def machine_info():
+    return {
+        "node": platform.node(), "processor": platform.processor(), "machine": platform.machine(),
+        "python_version": platform.python_version(), "python_implementation": platform.python_implementation(),
+        "system": platform.system(), "release": platform.release(),
+        "cpu_count": os.cpu_count(), "sqlite_version": sqlite3.sqlite_version,
+    }
+
+def commit_info():
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=REPO, capture_output=True, text=True, timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
+    return {"id": git("rev-parse", "HEAD"), "branch": git("rev-parse", "--abbrev-ref", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+# --- STAGES ---
+def stages(rng):
+    # (group, name, fn) for every benchmark; inputs are built up front so
+    # only the call under test is timed.
+    import io
+    from benchmarks.synthetic import docx_bytes, pdf_bytes, resume_text
+    from mira_db import get_connection, insert_parsed_resume
+    from mira_offers import load_template, render_offer
+    from mira_parsing import extract_details, extract_text_from_docx, extract_text_from_pdf
+    from mira_search import search_resumes
+
+    for size in ("small", "medium", "large"):
+        text = resume_text(rng, size)
+        pdf, docx = pdf_bytes(text), docx_bytes(text)
+        yield "extract_text_from_pdf", size, lambda pdf=pdf: extract_text_from_pdf(io.BytesIO(pdf))
+        yield "extract_text_from_docx", size, lambda docx=docx: extract_text_from_docx(io.BytesIO(docx))
+        yield "extract_details", size, lambda text=text: extract_details(text)
+
+    # save_to_db minus the embedding index sync, which has its own model cost.
+    details = extract_details(resume_text(rng, "medium"))
+    counter = iter(range(10**9))
+    yield "save_to_db", "insert_parsed_resume", lambda: insert_parsed_resume(details, "bench.pdf", f"bench-{next(counter)}")
+
+    conn = get_connection()
+    for term in SEARCH_TERMS:
+        yield "resume_search", f"fts[{term}]", lambda term=term: search_resumes(conn, term, limit=50)
+    # The LIKE scan the FTS index replaced, as a baseline at this row count.
+    like = "%python%"
+    yield "resume_search", "like[python]", lambda: conn.execute(
+        "SELECT * FROM resumes WHERE name LIKE ? OR email LIKE ? OR skills LIKE ? OR experience LIKE ? LIMIT 50",
+        (like, like, like, like)).fetchall()
+
+    template = load_template()
+    hire = {"name": "Ana Garcia", "email": "ana@example.com", "position": "Data Engineer", "start_date": "2026-01-05", "salary": 125000}
+    yield "generate_onboarding_doc", "render_offer", lambda: render_offer(hire, template)
+
+# --- REPORTING ---
+def _fmt(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds >= 1 / scale or unit == "us":
+            return f"{seconds * scale:8.2f} {unit}"
+
+def print_results(results, baseline=None):
+    base = {(b["group"], b["name"]): b for b in (baseline or {}).get("benchmarks", [])}
+    print(f"{'stage':<48} {'median':>11} {'min':>11} {'ops/s':>10} {'peak KiB':>9}" + ("  vs base" if base else ""))
+    for r in results:
+        s = r["stats"]
+        line = f"{r['group'] + '::' + r['name']:<48} {_fmt(s['median'])} {_fmt(s['min'])} {s['ops']:10.0f} {r['extra_info']['peak_bytes'] / 1024:9.0f}"
+        old = base.get((r["group"], r["name"]))
+        if old:
+            line += f"  {s['median'] / old['stats']['median']:6.2f}x"
+        print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MIRA hot paths.")
+    parser.add_argument("--rows", type=int, default=10_000, help="Resumes to seed before the search stages")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workdir", help="Directory holding mira_resumes.db (default: a new temp dir)")
+    parser.add_argument("--filter", default="", help="Only run stages whose group::name contains this")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Print the ratio against an earlier results file")
+    args = parser.parse_args()
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="mira-bench-"))
+    os.makedirs(workdir, exist_ok=True)
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline = json.load(open(args.compare)) if args.compare else None
+    os.chdir(workdir)
+    # Timers would be measuring themselves.
+    os.environ["MIRA_METRICS"] = "0"
+
+    from benchmarks.seed_db import seed
+    from mira_db import get_connection
+    from mira_migrations import migrate
+
+    conn = get_connection()
+    migrate(conn)
+    started = time.perf_counter()
+    seed(conn, args.rows, seed=args.seed)
+    print(f"{workdir}: {conn.execute('SELECT COUNT(*) FROM resumes').fetchone()[0]} resumes (seeded in {time.perf_counter() - started:.1f}s)")
+
+    results = []
+    for group, name, fn in stages(random.Random(args.seed)):
+        if args.filter in f"{group}::{name}":
+            results.append(bench(group, name, fn, args.rounds))
+    print_results(results, baseline)
+
+    if json_path:
+        os.makedirs(os.path.dirname(json_path) or ".", exist_ok=True)
+        with open(json_path, "w") as f:
+            json.dump({
+                "machine_info": machine_info(), "commit_info": commit_info(), "benchmarks": results,
+                "datetime": datetime.now().isoformat(), "version": "mira-bench-1",
+                "options": {"rows": args.rows, "rounds": args.rounds, "seed": args.seed, "argv": sys.argv[1:]},
+            }, f, indent=2)
+        print(f"Wrote {json_path}")
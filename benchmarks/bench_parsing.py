@@ -0,0 +1,51 @@
+import argparse
+import random
+import re
+import time
+
+from benchmarks.synthetic import synthetic_resume
+from mira_parsing import extract_details
+
+# Micro-benchmark for resume field extraction on a synthetic corpus.
+# Run from the repository root:  python -m benchmarks.bench_parsing
+
+def legacy_extract_details(text):
+    # The extractor this module replaced, kept here as the baseline.
+    name = text.split("\n")[0].strip() if text else ""
+    email_match = re.search(r"[\w\.-]+@[\w\.-]+", text)
+    phone_match = re.search(r"(\+\d{1,2}\s)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text)
+    email = email_match.group() if email_match else ""
+    phone = phone_match.group() if phone_match else ""
+    skills = experience = ""
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        if "skills" in line.lower():
+            skills = "\n".join(lines[i+1:i+6])
+        if "experience" in line.lower():
+            experience = "\n".join(lines[i+1:i+10])
+    return name, email, phone, skills, experience
+
+def run(fn, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark resume field extraction.")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--sections", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [synthetic_resume(rng, args.sections) for _ in range(args.docs)]
+    mb = sum(len(t) for t in corpus) / 1e6
+    print(f"{args.docs} resumes, {mb:.1f} MB of text (best of {args.repeat})")
+    for label, fn in (("legacy", legacy_extract_details), ("tokenizer", extract_details)):
+        seconds = run(fn, corpus, args.repeat)
+        print(f"  {label:<10} {seconds * 1000:8.1f} ms  {args.docs / seconds:9.0f} docs/s  {mb / seconds:6.1f} MB/s")
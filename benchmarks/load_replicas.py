@@ -0,0 +1,129 @@
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+# Load test for the multi-process deployment: 1, 2, 4, ... reader processes
+# (stand-ins for Streamlit replicas) run resume searches and page loads on
+# read-only WAL connections for a fixed time, optionally while writer
+# processes insert feedback through the mira_writer service. Prints queries
+# per second per step and the scaling efficiency against one process, which
+# should stay near 1.0 up to the number of cores.
+#
+# Run from the repository root:
+#   python -m benchmarks.load_replicas --rows 100000 --procs 1 2 4 8 --writers 2
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEARCH_TERMS = ["python", "kubernetes leadership", "skills:terraform", "Garcia", "data engineer", "react"]
+PAGE_COLUMNS = ["id", "name", "email", "phone", "skills", "experience"]
+WRITE_INTERVAL = 0.01   # seconds between writes per writer process
+
+# --- WORKERS ---
+def _reader(db_file, duration, seed, start, counts):
+    os.environ["MIRA_METRICS"] = "0"
+    from mira_db import READ_PRAGMAS
+    from mira_metrics import connection_factory
+    from mira_pagination import fetch_page
+    from mira_search import search_resumes
+
+    conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True, factory=connection_factory())
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
+    rng = random.Random(seed)
+    start.wait()
+    done, deadline = 0, time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        if rng.random() < 0.5:
+            search_resumes(conn, rng.choice(SEARCH_TERMS), limit=25)
+        else:
+            # A first page and the one after it, as the resume list loads them.
+            _, cursor = fetch_page(conn, "resumes", PAGE_COLUMNS, 25)
+            fetch_page(conn, "resumes", PAGE_COLUMNS, 25, cursor)
+        done += 1
+    counts.put(done)
+
+def _writer(socket_path, duration, seed, start, counts):
+    from mira_writer import WriterClient
+
+    client = WriterClient(socket_path)
+    rng = random.Random(seed)
+    start.wait()
+    done, deadline = 0, time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        client.run([(
+            "INSERT INTO feedback_surveys (candidate_name, rating, comments, timestamp) VALUES (?, ?, ?, datetime('now'))",
+            (f"Load {seed}", rng.randrange(1, 11), "load test"),
+        )])
+        done += 1
+        time.sleep(WRITE_INTERVAL)
+    counts.put(-done)
+
+def run_step(db_file, procs, duration, writers=0, socket_path=None):
+    # Returns (reads/s, writes/s) for one step.
+    ctx = multiprocessing.get_context("spawn")
+    start, counts = ctx.Event(), ctx.Queue()
+    workers = [ctx.Process(target=_reader, args=(db_file, duration, i, start, counts)) for i in range(procs)]
+    workers += [ctx.Process(target=_writer, args=(socket_path, duration, 1000 + i, start, counts)) for i in range(writers)]
+    for w in workers:
+        w.start()
+    time.sleep(0.5)   # let every process import and connect
+    start.set()
+    results = [counts.get() for _ in workers]
+    for w in workers:
+        w.join()
+    reads = sum(r for r in results if r > 0)
+    writes = -sum(r for r in results if r < 0)
+    return reads / duration, writes / duration
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure read scaling across MIRA replica processes.")
+    parser.add_argument("--rows", type=int, default=50_000, help="Resumes to seed first")
+    parser.add_argument("--procs", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per step")
+    parser.add_argument("--writers", type=int, default=0, help="Writer processes running alongside the readers")
+    parser.add_argument("--workdir", help="Directory holding mira_resumes.db (default: a new temp dir)")
+    args = parser.parse_args()
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="mira-load-"))
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    sys.path.insert(0, REPO)
+    os.environ["MIRA_METRICS"] = "0"
+
+    from benchmarks.seed_db import seed
+    from mira_db import DB_FILE, get_connection
+    from mira_migrations import migrate
+
+    db_file = os.path.join(workdir, DB_FILE)
+    conn = get_connection(db_file)
+    migrate(conn)
+    seed(conn, args.rows)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    print(f"{db_file}: {conn.execute('SELECT COUNT(*) FROM resumes').fetchone()[0]} resumes, {os.cpu_count()} CPUs")
+
+    writer = None
+    socket_path = os.path.join(workdir, "writer.sock")
+    if args.writers:
+        writer = subprocess.Popen([sys.executable, "-m", "mira_writer", "serve", "--db", db_file, "--socket", socket_path], cwd=REPO)
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.1)
+
+    try:
+        print(f"{'procs':>5} {'reads/s':>10} {'per proc':>10} {'scaling':>8}" + (f" {'writes/s':>9}" if args.writers else ""))
+        base = None
+        for procs in args.procs:
+            reads, writes = run_step(db_file, procs, args.duration, args.writers, socket_path)
+            base = base or reads
+            line = f"{procs:>5} {reads:>10.0f} {reads / procs:>10.0f} {reads / (base * procs):>8.2f}"
+            print(line + (f" {writes:>9.0f}" if args.writers else ""))
+    finally:
+        if writer:
+            writer.terminate()
+            writer.wait()
@@ -0,0 +1,77 @@
+import argparse
+import hashlib
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic import HEADERS, WORDS, candidate_name
+from mira_db import DB_FILE, get_connection
+from mira_parsing import DETAIL_COLUMNS
+
+# Fills the resumes table with synthetic rows for benchmarks. Row i always
+# gets the same content hash, so seeding is idempotent and growing a 10k
+# database to 100k only inserts the missing 90k.
+# Run from the repository root:  python -m benchmarks.seed_db --rows 100000
+
+PRESETS = (10_000, 100_000, 1_000_000)
+CHUNK_SIZE = 10_000
+STATUSES = ["New", "New", "New", "Screening", "Interview", "Offer", "Hired", "Rejected"]
+SPAN_DAYS = 365
+
+def _words(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+def resume_row(rng, i, now):
+    name = candidate_name(rng)
+    email = f"{name.split()[0].lower()}.{i}@example.com"
+    phone = f"(555) {rng.randrange(100, 999)}-{rng.randrange(1000, 9999)}"
+    details = (
+        name, email, phone,
+        ", ".join(rng.sample(WORDS, 6)),
+        "\n".join(f"- {_words(rng, 12)}" for _ in range(rng.randrange(2, 6))),
+        f"B.Sc. {rng.choice(HEADERS)} {_words(rng, 3)}",
+        _words(rng, 4) if rng.random() < 0.3 else "",
+        _words(rng, 20),
+        email, phone, f"https://linkedin.com/in/c{i}",
+    )
+    seen = now - timedelta(seconds=rng.randrange(SPAN_DAYS * 86400))
+    return (*details, f"resume_{i}.pdf", seen.isoformat(), hashlib.sha1(f"seed-{i}".encode()).hexdigest(),
+            rng.choice(STATUSES), rng.randrange(0, 101))
+
+def seed(conn, rows, chunk_size=CHUNK_SIZE, seed=7, progress=None):
+    # Returns the number of rows inserted. Each chunk is its own transaction.
+    columns = (*DETAIL_COLUMNS, "filename", "timestamp", "content_hash", "status", "score")
+    sql = f"INSERT OR IGNORE INTO resumes ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    now = datetime.now()
+    inserted = 0
+    for start in range(0, rows, chunk_size):
+        # Seeded per chunk so any chunk can be regenerated on its own.
+        rng = random.Random(seed * 1_000_003 + start)
+        batch = [resume_row(rng, i, now) for i in range(start, min(rows, start + chunk_size))]
+        with conn:
+            inserted += conn.executemany(sql, batch).rowcount
+        if progress:
+            progress(min(rows, start + chunk_size), inserted)
+    return inserted
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the resumes table with synthetic rows.")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database file")
+    parser.add_argument("--rows", type=int, default=PRESETS[0], help=f"Target row count (presets: {', '.join(map(str, PRESETS))})")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from mira_migrations import migrate
+
+    conn = get_connection(args.db)
+    migrate(conn)
+    started = time.perf_counter()
+
+    def report(done, inserted):
+        rate = done / (time.perf_counter() - started)
+        print(f"\r{done}/{args.rows} rows ({inserted} new, {rate:,.0f} rows/s)", end="", flush=True)
+
+    inserted = seed(conn, args.rows, args.chunk_size, args.seed, report)
+    total = conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+    print(f"\nInserted {inserted} rows in {time.perf_counter() - started:.1f}s; resumes now has {total} rows.")
@@ -0,0 +1,112 @@
+import argparse
+import io
+import os
+import random
+
+# Synthetic resumes for benchmarks: plain text, .docx and .pdf at a few
+# sizes. Everything is driven by a seeded Random, so the same seed gives
+# byte-identical files across runs and machines.
+# Run from the repository root:  python -m benchmarks.synthetic --out corpus
+
+WORDS = ("python sql kubernetes aws react leadership hiring analytics docker terraform "
+         "recruiting onboarding sourcing compliance payroll excel tableau java go rust").split()
+HEADERS = ["Summary", "Skills", "Work Experience", "Education", "Certifications", "Projects"]
+FIRST = ["Ana", "Ben", "Chen", "Dara", "Eli", "Fatima", "Gus", "Hana", "Ivan", "Jo", "Kai", "Lena"]
+LAST = ["Alvarez", "Brooks", "Cho", "Diaz", "Evans", "Fischer", "Garcia", "Hughes", "Ito", "Jensen"]
+# size -> sections of 8 lines; "large" is a long multi-page CV.
+SIZES = {"small": 4, "medium": 12, "large": 40}
+FORMATS = ("pdf", "docx")
+LINES_PER_PAGE = 50
+
+# --- TEXT ---
+def candidate_name(rng):
+    return f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+
+def synthetic_resume(rng, sections=12, lines_per_section=8):
+    # Long CVs that mention "skills" and "experience" in body text as well as
+    # in headers - the case the old line-by-line extractor handled worst.
+    out = [candidate_name(rng),
+           f"c{rng.randrange(10**6)}@example.com | (555) {rng.randrange(100, 999)}-{rng.randrange(1000, 9999)}",
+           f"https://linkedin.com/in/c{rng.randrange(10**6)}"]
+    for _ in range(sections):
+        out.append(rng.choice(HEADERS))
+        for _ in range(lines_per_section):
+            body = " ".join(rng.choice(WORDS) for _ in range(10))
+            out.append(f"- {body} with experience applying skills" if rng.random() < 0.3 else f"- {body}")
+    return "\n".join(out)
+
+def resume_text(rng, size="medium"):
+    return synthetic_resume(rng, SIZES[size])
+
+# --- DOCUMENTS ---
+def docx_bytes(text):
+    from docx import Document
+
+    doc = Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def pdf_bytes(text, lines_per_page=LINES_PER_PAGE):
+    # A minimal PDF with a real text layer (Helvetica, one content stream per
+    # page), so extraction cost is the backend's, not a fixture artefact.
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>",
+    ]
+    for i, page in enumerate(pages):
+        content = "BT /F1 11 Tf 14 TL 50 760 Td " + " ".join(f"({_pdf_escape(l)}) Tj T*" for l in page) + " ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{off:010d} 00000 n \n" for off in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def resume_document(rng, fmt, size="medium"):
+    text = resume_text(rng, size)
+    return pdf_bytes(text) if fmt == "pdf" else docx_bytes(text)
+
+# --- CORPUS ---
+def write_corpus(out_dir, count, sizes=tuple(SIZES), formats=FORMATS, seed=7):
+    # count files per (size, format); returns the paths written.
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for size in sizes:
+        for fmt in formats:
+            for i in range(count):
+                path = os.path.join(out_dir, f"{size}_{i:04d}.{fmt}")
+                with open(path, "wb") as f:
+                    f.write(resume_document(rng, fmt, size))
+                paths.append(path)
+    return paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic resumes for benchmarks.")
+    parser.add_argument("--out", default="corpus")
+    parser.add_argument("--count", type=int, default=10, help="Files per size and format")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"Comma-separated, from {', '.join(SIZES)}")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    paths = write_corpus(args.out, args.count, args.sizes.split(","), args.formats.split(","), args.seed)
+    total = sum(os.path.getsize(p) for p in paths)
+    print(f"Wrote {len(paths)} files ({total / 1e6:.1f} MB) to {args.out}")
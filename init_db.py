@@ -1,41 +1,17 @@
 import sqlite3
+import sys
 
-DB_FILE = "mira_resumes.db"
+from mira_db import DB_FILE
+from mira_migrations import migrate, schema_version
 
-conn = sqlite3.connect(DB_FILE)
-cur = conn.cursor()
+db_file = sys.argv[1] if len(sys.argv) > 1 else DB_FILE
 
-# Create all required tables
-cur.execute("""
-CREATE TABLE IF NOT EXISTS mira_logs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    question TEXT,
-    answer TEXT,
-    timestamp TEXT
-)
-""")
-
-cur.execute("""
-CREATE TABLE IF NOT EXISTS onboarding_logs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT,
-    email TEXT,
-    position TEXT,
-    start_date TEXT,
-    salary REAL,
-    filepath TEXT,
-    timestamp TEXT
-)
-""")
-
-cur.execute("""
-CREATE TABLE IF NOT EXISTS job_descriptions (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    content TEXT,
-    timestamp TEXT
-)
-""")
-
-conn.commit()
+conn = sqlite3.connect(db_file)
+applied = migrate(conn)
+version = schema_version(conn)
 conn.close()
-print("Database tables created.")
+
+if applied:
+    print(f"Applied migrations {applied}; schema is at version {version}.")
+else:
+    print(f"Database is up to date (schema version {version}).")
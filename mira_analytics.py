@@ -0,0 +1,107 @@
+import argparse
+from datetime import date, datetime, timedelta
+
+import streamlit as st
+
+from mira_db import DB_FILE, executemany, get_connection, get_read_connection
+from mira_migrations import fill_rollups, migrate
+
+# Pipeline analytics kept as rollup tables that SQLite triggers update on
+# every insert/update/delete, so the dashboard reads a few dozen
+# precomputed rows instead of scanning the source tables. A periodic
+# snapshot job, enqueued by the job workers (mira_jobs.PERIODIC), copies
+# headline numbers into analytics_snapshots for trends.
+
+DASHBOARD_DAYS = 30
+
+# --- ROLLUPS ---
+def rebuild_rollups(conn):
+    # Recomputes every rollup from the source tables, e.g. if they drift
+    # after manual edits, with the same SQL as the migrations' backfill. The
+    # triggers that maintain them are migrations 13 and 18. Runs in the
+    # caller's transaction.
+    for table in ("analytics_daily", "analytics_ratings", "analytics_funnel", "analytics_time_to_offer"):
+        conn.execute(f"DELETE FROM {table}")
+    fill_rollups(conn)
+
+# --- QUERIES ---
+def daily_series(conn, metric, days=DASHBOARD_DAYS):
+    since = (date.today() - timedelta(days=days - 1)).isoformat()
+    return conn.execute(
+        "SELECT day, count FROM analytics_daily WHERE metric = ? AND day >= ? ORDER BY day", (metric, since)
+    ).fetchall()
+
+def summary(conn):
+    totals = dict(conn.execute("SELECT metric, SUM(count) FROM analytics_daily GROUP BY metric").fetchall())
+    ratings = conn.execute("SELECT SUM(rating * count), SUM(count) FROM analytics_ratings").fetchone()
+    offers = conn.execute("SELECT SUM(total_days), SUM(offers) FROM analytics_time_to_offer").fetchone()
+    return {
+        "resumes": totals.get("resumes", 0),
+        "feedback": totals.get("feedback", 0),
+        "offers": totals.get("offers", 0),
+        "questions": totals.get("questions", 0),
+        "avg_rating": ratings[0] / ratings[1] if ratings[1] else None,
+        "avg_days_to_offer": offers[0] / offers[1] if offers[1] else None,
+    }
+
+# --- SNAPSHOTS ---
+def take_snapshot(db_file=DB_FILE):
+    conn = get_read_connection(db_file)
+    now = datetime.now().isoformat()
+    values = summary(conn)
+    rows = [(metric, value, now) for metric, value in values.items() if value is not None]
+    rows += [(f"funnel_{status}", count, now) for status, count in conn.execute("SELECT status, count FROM analytics_funnel")]
+    executemany("INSERT INTO analytics_snapshots (metric, value, timestamp) VALUES (?, ?, ?)", rows, db_file)
+    return len(rows)
+
+def snapshot_history(conn, metric, limit=90):
+    return conn.execute(
+        "SELECT timestamp, value FROM analytics_snapshots WHERE metric = ? ORDER BY timestamp DESC LIMIT ?", (metric, limit)
+    ).fetchall()[::-1]
+
+# --- DASHBOARD ---
+def render_dashboard():
+    conn = get_read_connection()
+    stats = summary(conn)
+
+    cols = st.columns(4)
+    cols[0].metric("Resumes", stats["resumes"])
+    cols[1].metric("Offers sent", stats["offers"])
+    cols[2].metric("Avg. rating", f"{stats['avg_rating']:.1f}/10" if stats["avg_rating"] is not None else "—")
+    cols[3].metric("Avg. days to offer", f"{stats['avg_days_to_offer']:.1f}" if stats["avg_days_to_offer"] is not None else "—")
+
+    left, right = st.columns(2)
+    with left:
+        st.markdown(f"**Activity, last {DASHBOARD_DAYS} days**")
+        days = [(date.today() - timedelta(days=i)).isoformat() for i in range(DASHBOARD_DAYS - 1, -1, -1)]
+        series = {label: dict(daily_series(conn, metric)) for label, metric in (("Resumes", "resumes"), ("Feedback", "feedback"), ("Offers", "offers"))}
+        st.line_chart({label: [values.get(d, 0) for d in days] for label, values in series.items()})
+        st.markdown("**Pipeline funnel**")
+        funnel = conn.execute("SELECT status, count FROM analytics_funnel WHERE count > 0 ORDER BY count DESC").fetchall()
+        if funnel:
+            st.bar_chart({"Candidates": {status: count for status, count in funnel}})
+    with right:
+        st.markdown("**Rating distribution**")
+        ratings = dict(conn.execute("SELECT rating, count FROM analytics_ratings").fetchall())
+        st.bar_chart({"Responses": {str(r): ratings.get(r, 0) for r in range(1, 11)}})
+        history = snapshot_history(conn, "avg_rating")
+        if len(history) > 1:
+            st.markdown("**Average rating over time**")
+            st.line_chart({"Avg. rating": {ts[:16]: value for ts, value in history}})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain MIRA analytics rollups.")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database file")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute rollups from the source tables")
+    parser.add_argument("--snapshot", action="store_true", help="Write a row per headline metric to analytics_snapshots")
+    args = parser.parse_args()
+
+    conn = get_connection(args.db)
+    migrate(conn)
+    if args.rebuild:
+        with conn:
+            rebuild_rollups(conn)
+    if args.snapshot:
+        print(f"Wrote {take_snapshot(args.db)} snapshot rows.")
+    for key, value in summary(conn).items():
+        print(f"{key:<18} {value}")
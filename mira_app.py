@@ -1,160 +1,51 @@
+from mira_startup import rerun_started, rerun_finished, show_startup_timings
+_rerun_start = rerun_started()
+
 import streamlit as st
 from mira_tab_logic import init_db, render_tabs  # ✅ import BEFORE calling it
 
 st.set_page_config(page_title="MIRA Assistant", layout="wide")  # ✅ must be first Streamlit command
 init_db()  # ✅ now safe to call after imports
 
-from datetime import datetime, timedelta
-import sqlite3
+from datetime import datetime
 import os
-import base64
-import dateparser
-import re
-import csv
-from io import StringIO
-import pdfplumber
-from docx import Document
-import openai
-
-DB_FILE = "mira_resumes.db"
+from mira_assets import header_image_data_uri
+from mira_db import get_connection, insert_resume, insert_mira_log
+from mira_parsing import extract_text_from_pdf, extract_text_from_docx, extract_details
+from mira_llm_cache import cached_completion
+from mira_llm import DEFAULT_MODEL, SYSTEM_PROMPT, get_gateway
+from mira_migrations import ensure_schema
+from mira_scheduling import book_interview
+from mira_search import search_resumes
+from mira_pagination import paginate_table, paginated_list, offset_fetcher
 
 # --- HELPER FUNCTIONS ---
-def ask_gpt(prompt):
-    openai.api_key = st.secrets["openai"]["api_key"]
-    response = openai.ChatCompletion.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are MIRA, an intelligent, helpful, and friendly AI recruiting assistant."},
-            {"role": "user", "content": prompt}
-        ]
-    )
-    return response.choices[0].message.content.strip()
+MODEL = DEFAULT_MODEL
 
-def extract_text_from_pdf(file):
-    with pdfplumber.open(file) as pdf:
-        return "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
+def _complete(prompt):
+    return get_gateway().chat(prompt, SYSTEM_PROMPT, MODEL).text
 
-def extract_text_from_docx(file):
-    doc = Document(file)
-    return "\n".join([para.text for para in doc.paragraphs])
+def ask_gpt_cached(prompt):
+    # Returns (answer, source); source is "cache", "similar" or "llm".
+    return cached_completion(MODEL, SYSTEM_PROMPT, prompt, _complete)
 
-def extract_details(text):
-    name = text.split("\n")[0].strip() if text else ""
-    email_match = re.search(r"[\w\.-]+@[\w\.-]+", text)
-    phone_match = re.search(r"(\+\d{1,2}\s)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text)
-    email = email_match.group() if email_match else ""
-    phone = phone_match.group() if phone_match else ""
-    skills = experience = ""
-    lines = text.split("\n")
-    for i, line in enumerate(lines):
-        if "skills" in line.lower():
-            skills = "\n".join(lines[i+1:i+6])
-        if "experience" in line.lower():
-            experience = "\n".join(lines[i+1:i+10])
-    return name, email, phone, skills, experience
+def ask_gpt(prompt):
+    return ask_gpt_cached(prompt)[0]
 
 def save_to_db(name, email, phone, skills, experience, filename):
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO resumes (name, email, phone, skills, experience, filename, timestamp)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (name, email, phone, skills, experience, filename, datetime.now().isoformat()))
-    conn.commit()
-    conn.close()
+    return insert_resume(name, email, phone, skills, experience, filename)
 
 def schedule_google_event(candidate_name, candidate_email, interview_date, interview_time, position_title):
-    from google.oauth2.service_account import Credentials
-    from googleapiclient.discovery import build
-
-    creds_dict = st.secrets["gcal"].to_dict()
-    creds = Credentials.from_service_account_info(creds_dict, scopes=["https://www.googleapis.com/auth/calendar.events"])
-    service = build('calendar', 'v3', credentials=creds)
-
-    start_datetime = datetime.strptime(f"{interview_date} {interview_time}", "%Y-%m-%d %H:%M")
-    end_datetime = start_datetime + timedelta(hours=1)
-
-    event = {
-        'summary': f'Interview with {candidate_name} - {position_title}',
-        'location': 'Google Meet',
-        'description': f'Scheduled interview for {position_title} with {candidate_name}.',
-        'start': {'dateTime': start_datetime.isoformat(), 'timeZone': 'America/Phoenix'},
-        'end': {'dateTime': end_datetime.isoformat(), 'timeZone': 'America/Phoenix'},
-        'reminders': {'useDefault': True},
-        'conferenceData': {
-            'createRequest': {
-                'requestId': f"{candidate_name.replace(' ', '_')}_interview",
-                'conferenceSolutionKey': {'type': 'hangoutsMeet'}
-            }
-        }
-    }
-
-    event = service.events().insert(
-        calendarId='primary',
-        body=event,
-        conferenceDataVersion=1
-    ).execute()
-
-    return event.get('htmlLink')
+    start = datetime.strptime(f"{interview_date} {interview_time}", "%Y-%m-%d %H:%M")
+    return book_interview(candidate_name, candidate_email, position_title, start)["join_url"]
 
 # --- DB SETUP ---
 def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS resumes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        email TEXT,
-        phone TEXT,
-        skills TEXT,
-        experience TEXT,
-        filename TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS mira_logs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        question TEXT,
-        answer TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS onboarding_logs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        email TEXT,
-        position TEXT,
-        start_date TEXT,
-        salary TEXT,
-        filepath TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS job_descriptions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        content TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    conn.commit()
-    conn.close()
+    ensure_schema()
 
 # --- UI ---
 
-def get_base64_image(image_path):
-    with open(image_path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
-mira_img_base64 = get_base64_image("mira.png")
+mira_img_uri = header_image_data_uri()
 col1, col2, col3 = st.columns([1, 10, 1])
 with col2:
     st.markdown(f'''
@@ -181,7 +72,7 @@ with col2:
             }}
         </style>
         <div class="mira-header">
-            <img src="data:image/png;base64,{mira_img_base64}" />
+            <img src="{mira_img_uri}" />
             <h1>MIRA: Your AI Recruiting Assistant</h1>
         </div>
     ''', unsafe_allow_html=True)
@@ -199,45 +90,44 @@ TABS = [
 tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(TABS)
 
 # --- Render all tabs ---
-def fetch_resumes(query=""):
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
+def fetch_resumes(query="", limit=50, offset=0):
+    conn = get_connection()
     if query:
-        cur.execute("""
-            SELECT * FROM resumes
-            WHERE name LIKE ? OR email LIKE ? OR phone LIKE ?
-            OR skills LIKE ? OR experience LIKE ?
-        """, (f"%{query}%",)*5)
+        rows = search_resumes(conn, query, limit, offset)
     else:
-        cur.execute("SELECT * FROM resumes")
-    rows = cur.fetchall()
-    conn.close()
+        rows = conn.execute("SELECT * FROM resumes ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?", (limit, offset)).fetchall()
     return rows
 
+def render_resume(r):
+    st.markdown(f"**{r[1]}** | {r[2]} | {r[3]}")
+    st.markdown(f"**Skills:** {r[4][:150]}...")
+    st.markdown(f"**Experience:** {r[5][:200]}...")
+    st.markdown("---")
+
 def render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7):
     with tab1:
         st.subheader("🧠 How can I help?")
         user_input = st.text_input("Type your command here:")
         if user_input:
             try:
-                response = ask_gpt(user_input)
+                response, source = ask_gpt_cached(user_input)
                 st.markdown(f"**MIRA says:** {response}")
-                conn = sqlite3.connect(DB_FILE)
-                conn.execute("INSERT INTO mira_logs (question, answer, timestamp) VALUES (?, ?, ?)", (user_input, response, datetime.now().isoformat()))
-                conn.commit()
-                conn.close()
+                if source == "llm":
+                    insert_mira_log(user_input, response)
+                else:
+                    st.caption("⚡ Served from cache")
             except Exception as e:
                 st.error(f"Error: {e}")
 
     with tab2:
         st.subheader("📂 View Resumes")
-        search = st.text_input("Search by name, email, skills, etc.")
-        resumes = fetch_resumes(search)
-        for r in resumes:
-            st.markdown(f"**{r[1]}** | {r[2]} | {r[3]}")
-            st.markdown(f"**Skills:** {r[4][:150]}...")
-            st.markdown(f"**Experience:** {r[5][:200]}...")
-            st.markdown("---")
+        search = st.text_input("Search by name, email, skills, etc. (e.g. skills:python)")
+        if search:
+            fetch = offset_fetcher(lambda limit, offset: fetch_resumes(search, limit, offset))
+            paginated_list("resumes", fetch, render_resume, empty_message="No matching resumes.", reset_on=search)
+        else:
+            conn = get_connection()
+            paginate_table("resumes", conn, "resumes", ["id", "name", "email", "phone", "skills", "experience"], render_resume)
 
     with tab3:
         st.subheader("📅 Interview Scheduling")
@@ -256,31 +146,35 @@ def render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7):
 
     with tab4:
         st.subheader("📁 Onboarding Docs")
-        conn = sqlite3.connect(DB_FILE)
-        rows = conn.execute("SELECT * FROM onboarding_logs ORDER BY timestamp DESC").fetchall()
-        for r in rows:
+        def render_doc(r):
             st.markdown(f"**{r[1]}** | {r[2]} | {r[3]} | ${r[5]} | Sent: {r[7]}")
             st.markdown("---")
 
+        conn = get_connection()
+        paginate_table("onboarding_logs", conn, "onboarding_logs", ["id", "name", "email", "position", "start_date", "salary", "filepath", "timestamp"], render_doc)
+
     with tab5:
         st.subheader("📂 Job Descriptions")
-        conn = sqlite3.connect(DB_FILE)
-        jobs = conn.execute("SELECT * FROM job_descriptions ORDER BY timestamp DESC").fetchall()
-        for jd in jobs:
+        def render_jd(jd):
             st.markdown(f"📝 **Generated:** {jd[2]}")
             st.code(jd[1])
             st.markdown("---")
 
+        conn = get_connection()
+        paginate_table("job_descriptions", conn, "job_descriptions", ["id", "content", "timestamp"], render_jd)
+
     with tab6:
         st.subheader("📈 Upskilling & Coaching")
         st.info("Coming soon: AI-generated coaching tips and growth plans")
 
     with tab7:
         st.subheader("📚 Q&A Log")
-        conn = sqlite3.connect(DB_FILE)
-        logs = conn.execute("SELECT * FROM mira_logs ORDER BY timestamp DESC").fetchall()
-        for row in logs:
+        def render_log(row):
             st.markdown(f"🕒 {row[3]}\n**Q:** {row[1]}\n**A:** {row[2]}")
             st.markdown("---")
 
-render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7)
\ No newline at end of file
+        conn = get_connection()
+        paginate_table("mira_logs", conn, "mira_logs", ["id", "question", "answer", "timestamp"], render_log)
+
+render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7)
+show_startup_timings(rerun_finished(_rerun_start))
@@ -0,0 +1,40 @@
+import base64
+import io
+import os
+
+import streamlit as st
+
+LOGO_PATH = "mira.png"
+THUMBNAIL_SIZE = 160   # 2x the largest size the header renders at
+
+# --- HEADER IMAGE ---
+@st.cache_data(show_spinner=False)
+def _encode_thumbnail(path, size, mtime):
+    # `mtime` is only part of the cache key, so replacing the file busts the cache.
+    try:
+        from PIL import Image
+    except ImportError:
+        with open(path, "rb") as f:
+            return base64.b64encode(f.read()).decode(), "png"
+
+    with Image.open(path) as img:
+        img.thumbnail((size, size))
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, format="JPEG", quality=85, optimize=True)
+    return base64.b64encode(buf.getvalue()).decode(), "jpeg"
+
+def header_image_data_uri(path=LOGO_PATH, size=THUMBNAIL_SIZE):
+    if not os.path.exists(path):
+        return None
+    encoded, fmt = _encode_thumbnail(path, size, os.path.getmtime(path))
+    return f"data:image/{fmt};base64,{encoded}"
+
+def show_header():
+    uri = header_image_data_uri()
+    img = f'<img src="{uri}" style="width:60px;height:60px;border-radius:50%;border:2px solid #a047fa;" />' if uri else ""
+    st.markdown(f"""
+        <div style='display: flex; align-items: center; gap: 12px; margin: 1rem 0 2.5rem 0;'>
+            {img}
+            <h1 style="font-size: 1.8em; color: #a047fa; margin: 0;">MIRA: Your AI Recruiting Assistant</h1>
+        </div>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,109 @@
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+# Cache shared by every Streamlit replica on a host. st.cache_data lives in
+# one process, so behind a load balancer each replica would warm its own copy
+# and a result computed on one port would be recomputed on the next. This
+# keeps results as JSON in a small SQLite file (MIRA_CACHE_FILE) instead;
+# WAL lets all replicas read it while one writes. JSON rather than pickle:
+# anyone who can write the file could otherwise run code in every replica
+# that reads it. Tuples come back as lists.
+
+CACHE_FILE = "mira_cache.db"
+MAX_ENTRIES = 10_000
+PRUNE_EVERY = 200        # writes between expiry sweeps
+
+class SharedCache:
+    def __init__(self, path, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        with self._conn() as conn:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires REAL NOT NULL
+            ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache (expires)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")   # losing the cache on a crash is fine
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        # Returns (hit, value).
+        row = self._conn().execute("SELECT value FROM cache WHERE key = ? AND expires > ?", (key, time.time())).fetchone()
+        if row is None:
+            return False, None
+        try:
+            return True, json.loads(row[0])
+        except ValueError:
+            # Not ours, e.g. a pickle written by an older version: a miss.
+            return False, None
+
+    def set(self, key, value, ttl):
+        conn = self._conn()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time() + ttl)
+                )
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                self.prune()
+        except sqlite3.OperationalError:
+            # Another replica held the lock past the timeout; skip caching.
+            pass
+
+    def prune(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+            conn.execute("""
+                DELETE FROM cache WHERE key IN (
+                    SELECT key FROM cache ORDER BY expires DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def clear(self, namespace=""):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache WHERE key >= ? AND key < ?", (namespace, namespace + "￿"))
+
+@st.cache_resource
+def get_shared_cache():
+    return SharedCache(os.environ.get("MIRA_CACHE_FILE", CACHE_FILE))
+
+def shared_cache(namespace, ttl):
+    # Like @st.cache_data for functions whose arguments and results are
+    # JSON-serializable; the key is the namespace plus a hash of the arguments.
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            digest = hashlib.sha1(json.dumps([args, sorted(kwargs.items())]).encode("utf-8")).hexdigest()
+            key = f"{namespace}:{digest}"
+            cache = get_shared_cache()
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            value = fn(*args, **kwargs)
+            cache.set(key, value, ttl)
+            return value
+        wrapper.clear = lambda: get_shared_cache().clear(f"{namespace}:")
+        return wrapper
+    return decorator
@@ -0,0 +1,164 @@
+import itertools
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+import streamlit as st
+
+# Calendar providers behind one interface. Each provider creates and cancels
+# events for interviews and returns (external_id, join_url). Google clients
+# are built once and pooled, since building a discovery service is slow
+# and the underlying httplib2 client must not be shared between threads.
+
+DEFAULT_TIMEZONE = "America/Phoenix"
+DEFAULT_JOIN_URL = "https://teams.microsoft.com/l/meetup-join/abc123"
+POOL_SIZE = 4
+
+class CalendarError(Exception):
+    pass
+
+# --- CLIENT POOL ---
+class ClientPool:
+    # Hands out up to `size` clients built by `factory`; callers block when
+    # all are checked out. Clients are created lazily and reused forever.
+
+    def __init__(self, factory, size=POOL_SIZE):
+        self._factory = factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def client(self):
+        with self._slots:
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                client = self._factory()
+            try:
+                yield client
+            finally:
+                self._idle.put(client)
+
+# --- PROVIDERS ---
+class CalendarProvider(ABC):
+    name = None
+
+    @abstractmethod
+    def create_event(self, summary, description, start, end, attendees, join_url=None, key=None):
+        # start/end are naive local datetimes in the provider's timezone;
+        # `key` identifies the interview so a retried call can be deduplicated.
+        ...
+
+    @abstractmethod
+    def cancel_event(self, external_id):
+        ...
+
+class FakeCalendarProvider(CalendarProvider):
+    # In-memory calendar for tests and offline use.
+    name = "fake"
+
+    def __init__(self):
+        self.events = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create_event(self, summary, description, start, end, attendees, join_url=None, key=None):
+        with self._lock:
+            external_id = f"fake-{next(self._ids)}"
+            url = join_url or f"https://meet.example.com/{external_id}"
+            self.events[external_id] = {
+                "summary": summary, "description": description, "start": start, "end": end,
+                "attendees": list(attendees), "join_url": url,
+            }
+        return external_id, url
+
+    def cancel_event(self, external_id):
+        with self._lock:
+            self.events.pop(external_id, None)
+
+class LinkOnlyProvider(CalendarProvider):
+    # No calendar integration: the recruiter pastes a meeting link (or the
+    # default Teams room is used) and sends the invite themselves.
+    name = "link"
+
+    def create_event(self, summary, description, start, end, attendees, join_url=None, key=None):
+        return None, join_url or DEFAULT_JOIN_URL
+
+    def cancel_event(self, external_id):
+        pass
+
+class GoogleCalendarProvider(CalendarProvider):
+    name = "google"
+
+    def __init__(self, credentials_info, calendar_id="primary", timezone=DEFAULT_TIMEZONE, pool_size=POOL_SIZE):
+        from google.oauth2.service_account import Credentials
+
+        # Credentials are shared (they refresh their own token); discovery
+        # services are pooled per thread of use.
+        self._creds = Credentials.from_service_account_info(
+            credentials_info, scopes=["https://www.googleapis.com/auth/calendar.events"]
+        )
+        self.calendar_id = calendar_id
+        self.timezone = timezone
+        self._pool = ClientPool(self._build, pool_size)
+
+    def _build(self):
+        from googleapiclient.discovery import build
+        return build("calendar", "v3", credentials=self._creds, cache_discovery=False)
+
+    def create_event(self, summary, description, start, end, attendees, join_url=None, key=None):
+        body = {
+            "summary": summary,
+            "description": description + (f"\n\nJoin: {join_url}" if join_url else ""),
+            "start": {"dateTime": start.isoformat(), "timeZone": self.timezone},
+            "end": {"dateTime": end.isoformat(), "timeZone": self.timezone},
+            "attendees": [{"email": a} for a in attendees if a],
+            "reminders": {"useDefault": True},
+        }
+        if not join_url:
+            body["conferenceData"] = {"createRequest": {
+                "requestId": key or f"mira-{start:%Y%m%d%H%M}",
+                "conferenceSolutionKey": {"type": "hangoutsMeet"},
+            }}
+        try:
+            with self._pool.client() as service:
+                event = service.events().insert(
+                    calendarId=self.calendar_id, body=body, conferenceDataVersion=1
+                ).execute()
+        except Exception as e:
+            raise CalendarError(f"Google Calendar: {e}") from e
+        return event["id"], join_url or event.get("hangoutLink") or event.get("htmlLink")
+
+    def cancel_event(self, external_id):
+        try:
+            with self._pool.client() as service:
+                service.events().delete(calendarId=self.calendar_id, eventId=external_id).execute()
+        except Exception as e:
+            raise CalendarError(f"Google Calendar: {e}") from e
+
+# --- SELECTION ---
+def _secrets(section):
+    try:
+        return dict(st.secrets.get(section, {}))
+    except Exception:   # no secrets.toml at all
+        return {}
+
+@st.cache_resource
+def get_calendar(name=None):
+    # MIRA_CALENDAR_PROVIDER or [calendar] provider in secrets picks the
+    # provider; otherwise Google when [gcal] credentials exist, else links only.
+    config = _secrets("calendar")
+    gcal = _secrets("gcal")
+    name = name or os.environ.get("MIRA_CALENDAR_PROVIDER") or config.get("provider") or ("google" if gcal else "link")
+    if name == "fake":
+        return FakeCalendarProvider()
+    if name == "link":
+        return LinkOnlyProvider()
+    if name == "google":
+        return GoogleCalendarProvider(
+            gcal, config.get("calendar_id", "primary"), config.get("timezone", DEFAULT_TIMEZONE),
+            int(config.get("pool_size", POOL_SIZE)),
+        )
+    raise ValueError(f"Unknown calendar provider: {name}")
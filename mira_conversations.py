@@ -0,0 +1,255 @@
+import re
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from mira_db import DB_FILE, execute, get_read_connection, insert_mira_log
+from mira_llm import DEFAULT_MODEL, SYSTEM_PROMPT, estimate_tokens, get_gateway
+from mira_llm_cache import lookup_cached, store_response
+from mira_retrieval import retrieval_context
+
+# Multi-turn Ask MIRA. Turns are stored in mira_logs under a session id and
+# each request is assembled under a token budget: referenced records, a
+# running summary of older turns, then as many recent turns as still fit.
+# Records are referenced by id (@resume:12, @jd:3) and stay attached to the
+# session, so follow-ups never need the text pasted again. Older turns are
+# folded into the summary by a background job once they outgrow the budget.
+
+CONTEXT_BUDGET = 3000        # tokens per request, excluding the system prompt
+REFERENCE_BUDGET = 1200      # of which at most this much for attached records
+REFERENCE_TOKENS = 400       # per record
+RETRIEVAL_BUDGET = 700       # database search results for the question
+MAX_REFERENCES = 4           # attached to a session at once; oldest drop off
+KEEP_RECENT_TURNS = 4        # never folded into the summary
+SUMMARIZE_AFTER = 1500       # unsummarized history tokens that trigger a summary
+SUMMARY_TOKENS = 250
+SHOWN_TURNS = 20
+
+REFERENCE_RE = re.compile(r"@(resume|jd):(\d+)")
+SUMMARY_SYSTEM = "You condense recruiting conversations into short factual notes for later turns."
+
+# --- SESSIONS ---
+def new_session():
+    return uuid.uuid4().hex
+
+def get_session(conn, session_id):
+    row = conn.execute(
+        "SELECT summary, summarized_through, refs FROM mira_sessions WHERE id = ?", (session_id,)
+    ).fetchone()
+    summary, through, refs = row or ("", 0, "")
+    return summary, through, [tuple(r.split(":")) for r in refs.split()]
+
+def list_sessions(conn, limit=20):
+    return conn.execute(
+        "SELECT id, title, updated_at FROM mira_sessions ORDER BY updated_at DESC LIMIT ?", (limit,)
+    ).fetchall()
+
+def session_turns(conn, session_id, after_id=0, limit=None):
+    # [(id, question, answer, prompt_tokens)] oldest first; `limit` keeps the newest.
+    rows = conn.execute(f"""
+        SELECT id, question, answer, prompt_tokens FROM mira_logs
+        WHERE session_id = ? AND id > ? ORDER BY id DESC {'LIMIT ?' if limit else ''}
+    """, (session_id, after_id, limit) if limit else (session_id, after_id)).fetchall()
+    return rows[::-1]
+
+def _touch(session_id, title, refs):
+    now = datetime.now().isoformat()
+    execute("""
+        INSERT INTO mira_sessions (id, title, refs, created_at, updated_at) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET refs = excluded.refs, updated_at = excluded.updated_at
+    """, (session_id, title[:80], " ".join(f"{kind}:{rid}" for kind, rid in refs), now, now))
+
+# --- REFERENCES ---
+def parse_references(text):
+    return [(kind, rid) for kind, rid in REFERENCE_RE.findall(text or "")]
+
+def merge_references(existing, new):
+    # Newest last; a re-mentioned record moves to the end.
+    refs = [r for r in existing if r not in new] + list(dict.fromkeys(new))
+    return refs[-MAX_REFERENCES:]
+
+def _clip(text, tokens):
+    # estimate_tokens is ~4 characters per token.
+    limit = tokens * 4
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + " …"
+
+def reference_text(conn, kind, rid):
+    if kind == "resume":
+        row = conn.execute(
+            "SELECT name, email, skills, experience, education, certifications, summary FROM resumes WHERE id = ?", (rid,)
+        ).fetchone()
+        if not row:
+            return None
+        name, email, *sections = row
+        labels = ("Skills", "Experience", "Education", "Certifications", "Summary")
+        body = "\n".join(f"{label}: {value}" for label, value in zip(labels, sections) if value)
+        return _clip(f"[resume:{rid}] {name} <{email}>\n{body}", REFERENCE_TOKENS)
+    row = conn.execute("SELECT content FROM job_descriptions WHERE id = ?", (rid,)).fetchone()
+    return _clip(f"[jd:{rid}] {row[0]}", REFERENCE_TOKENS) if row else None
+
+# --- CONTEXT ---
+def build_context(conn, session_id, message, budget=CONTEXT_BUDGET, retrieved=""):
+    # Returns (messages, refs, stats). Budget order: the new message, then
+    # attached records (newest first), retrieved search results, the
+    # summary, and recent turns (newest first) until the budget runs out.
+    summary, through, refs = get_session(conn, session_id)
+    refs = merge_references(refs, parse_references(message))
+    remaining = budget - estimate_tokens(message)
+    stats = {"reference_tokens": 0, "retrieval_tokens": 0, "summary_tokens": 0, "history_tokens": 0, "history_turns": 0, "dropped_turns": 0}
+
+    blocks = []
+    for kind, rid in reversed(refs):
+        text = reference_text(conn, kind, rid)
+        cost = estimate_tokens(text or "")
+        if text and stats["reference_tokens"] + cost <= min(REFERENCE_BUDGET, remaining):
+            blocks.append(text)
+            stats["reference_tokens"] += cost
+    remaining -= stats["reference_tokens"]
+
+    preamble = []
+    if blocks:
+        preamble.append({"role": "system", "content": "Records referenced in this conversation:\n\n" + "\n\n".join(blocks[::-1])})
+    if retrieved and estimate_tokens(retrieved) <= min(RETRIEVAL_BUDGET, remaining):
+        preamble.append({"role": "system", "content": retrieved})
+        stats["retrieval_tokens"] = estimate_tokens(retrieved)
+        remaining -= stats["retrieval_tokens"]
+    if summary and estimate_tokens(summary) <= remaining:
+        preamble.append({"role": "system", "content": f"Summary of the earlier conversation: {summary}"})
+        stats["summary_tokens"] = estimate_tokens(summary)
+        remaining -= stats["summary_tokens"]
+
+    history = []
+    turns = session_turns(conn, session_id, through)
+    for _, question, answer, _ in reversed(turns):
+        cost = estimate_tokens(question) + estimate_tokens(answer or "")
+        if cost > remaining:
+            break
+        history[:0] = [{"role": "user", "content": question}, {"role": "assistant", "content": answer or ""}]
+        remaining -= cost
+        stats["history_tokens"] += cost
+        stats["history_turns"] += 1
+    stats["dropped_turns"] = len(turns) - stats["history_turns"]
+    stats["context_tokens"] = stats["reference_tokens"] + stats["retrieval_tokens"] + stats["summary_tokens"] + stats["history_tokens"]
+
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}, *preamble, *history, {"role": "user", "content": message}]
+    stats["prompt_tokens"] = sum(estimate_tokens(m["content"]) for m in messages)
+    return messages, refs, stats
+
+# --- REPLIES ---
+def stream_reply(session_id, message, model=DEFAULT_MODEL, timings=None, search=True):
+    # Yields the answer for st.write_stream and records the turn. `timings`
+    # is filled with source, retrieval, ttft, total (seconds) and the
+    # context stats. Only context-free turns use the response cache: with
+    # history or records attached, the same words can need a different answer.
+    timings = {} if timings is None else timings
+    conn = get_read_connection()
+    start = time.perf_counter()
+    retrieved, result = retrieval_context(message) if search else ("", {"hits": []})
+    timings["retrieval"] = time.perf_counter() - start
+    timings["retrieved"] = len(result["hits"])
+    messages, refs, stats = build_context(conn, session_id, message, retrieved=retrieved)
+    timings.update(stats)
+
+    answer = source = None
+    if not stats["context_tokens"]:
+        answer, source = lookup_cached(model, SYSTEM_PROMPT, message)
+    if answer is not None:
+        timings.update(source=source, ttft=time.perf_counter() - start)
+        yield answer
+    else:
+        parts = []
+        for delta in get_gateway().stream_messages(messages, model):
+            if not parts:
+                timings["ttft"] = time.perf_counter() - start
+            parts.append(delta)
+            yield delta
+        answer = "".join(parts).strip()
+        timings["source"] = "llm"
+        timings.setdefault("ttft", time.perf_counter() - start)
+        if not stats["context_tokens"]:
+            store_response(model, SYSTEM_PROMPT, message, answer, time.perf_counter() - start)
+    timings["total"] = time.perf_counter() - start
+
+    _touch(session_id, message, refs)
+    insert_mira_log(
+        message, answer, timings["ttft"] * 1000, timings["total"] * 1000, session_id,
+        stats["prompt_tokens"], estimate_tokens(answer), stats["context_tokens"], timings["retrieval"] * 1000,
+    )
+    _maybe_summarize(conn, session_id)
+
+def _maybe_summarize(conn, session_id):
+    _, through, _ = get_session(conn, session_id)
+    turns = session_turns(conn, session_id, through)
+    older = turns[:-KEEP_RECENT_TURNS]
+    if older and sum(estimate_tokens(q) + estimate_tokens(a or "") for _, q, a, _ in older) > SUMMARIZE_AFTER:
+        from mira_jobs import enqueue
+        enqueue("summarize_session", {"session_id": session_id}, key=f"summarize_session:{session_id}:{older[-1][0]}")
+
+def summarize_session(session_id, db_file=DB_FILE, model=DEFAULT_MODEL):
+    # Job handler: folds every turn but the last KEEP_RECENT_TURNS into the
+    # session summary. Returns the number of turns folded.
+    conn = get_read_connection(db_file)
+    summary, through, _ = get_session(conn, session_id)
+    older = session_turns(conn, session_id, through)[:-KEEP_RECENT_TURNS]
+    if not older:
+        return 0
+    transcript = "\n".join(f"User: {_clip(q, 300)}\nMIRA: {_clip(a or '', 300)}" for _, q, a, _ in older)
+    prompt = (
+        f"Previous notes: {summary or '(none)'}\n\nNew conversation turns:\n{transcript}\n\n"
+        f"Rewrite the notes to cover everything above in at most {SUMMARY_TOKENS * 3 // 4} words. "
+        "Keep names, record ids like resume:12 or jd:3, decisions and open questions."
+    )
+    text = _clip(get_gateway().chat(prompt, SUMMARY_SYSTEM, model).text.strip(), SUMMARY_TOKENS)
+    # Guarded on the old watermark so two overlapping jobs cannot both apply.
+    execute(
+        "UPDATE mira_sessions SET summary = ?, summarized_through = ? WHERE id = ? AND summarized_through = ?",
+        (text, older[-1][0], session_id, through), db_file,
+    )
+    return len(older)
+
+# --- UI ---
+def render_conversation(model=DEFAULT_MODEL):
+    conn = get_read_connection()
+    if "mira_session" not in st.session_state:
+        st.session_state.mira_session = new_session()
+
+    sessions = list_sessions(conn)
+    col1, col2 = st.columns([4, 1])
+    options = [s[0] for s in sessions]
+    if st.session_state.mira_session not in options:
+        options.insert(0, st.session_state.mira_session)
+    titles = {sid: title for sid, title, _ in sessions}
+    col1.selectbox(
+        "Conversation", options, key="mira_session",
+        format_func=lambda sid: titles.get(sid) or "New conversation",
+    )
+    if col2.button("➕ New", help="Start a new conversation"):
+        st.session_state.pop("mira_session")
+        st.rerun()
+
+    session_id = st.session_state.mira_session
+    for _, question, answer, _ in session_turns(conn, session_id, limit=SHOWN_TURNS):
+        st.chat_message("user").markdown(question)
+        st.chat_message("assistant").markdown(answer or "")
+
+    _, _, refs = get_session(conn, session_id)
+    if refs:
+        st.caption("📎 Attached: " + " · ".join(f"{kind}:{rid}" for kind, rid in refs))
+
+    search = st.toggle("🔎 Search the MIRA database", value=True, key="mira_search_db",
+                       help="Look up matching resumes, job descriptions, feedback and coaching notes before answering.")
+    message = st.chat_input("Ask about recruiting, HR or branding. Mention @resume:12 or @jd:3 to bring in a record.", key="mira_chat")
+    if message:
+        st.chat_message("user").markdown(message)
+        timings = {}
+        with st.chat_message("assistant"):
+            st.write_stream(stream_reply(session_id, message, model, timings, search))
+        context = f"{timings['prompt_tokens']} prompt tokens ({timings['history_turns']} turns, {timings['reference_tokens'] + timings['retrieval_tokens']} from records)"
+        retrieval = f"🔎 Retrieval {timings['retrieval'] * 1000:.0f} ms ({timings['retrieved']} records)" if search else ""
+        if timings.get("source") == "llm":
+            generation = timings["total"] - timings["retrieval"]
+            st.caption(" · ".join(filter(None, [retrieval, f"⏱️ First token {timings['ttft']:.2f}s · generation {generation:.2f}s", context])))
+        else:
+            st.caption(" · ".join(filter(None, [retrieval, "⚡ Served from cache" if timings["source"] == "cache" else "⚡ Answered from a similar earlier question"])))
@@ -0,0 +1,293 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+
+from mira_metrics import connection_factory
+from mira_parsing import DETAIL_COLUMNS
+
+DB_FILE = os.environ.get("MIRA_DB_FILE", "mira_resumes.db")
+
+# Applied to every new connection. WAL lets readers proceed while a writer
+# commits; synchronous=NORMAL is durable across app crashes in WAL mode and
+# avoids an fsync per transaction.
+BUSY_TIMEOUT = 10.0
+PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",     # 64 MiB page cache
+    "PRAGMA mmap_size = 268435456",   # 256 MiB memory-mapped reads
+    "PRAGMA temp_store = MEMORY",
+    f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}",
+]
+# Read connections can't change the journal mode; query_only makes any
+# stray write fail loudly instead of taking the write lock.
+READ_PRAGMAS = [p for p in PRAGMAS if "journal_mode" not in p and "synchronous" not in p] + ["PRAGMA query_only = 1"]
+
+logger = logging.getLogger("mira.db")
+
+# --- CONNECTION POOL ---
+POOL_SIZE = 16            # connections per database file and mode
+_POOLS = []
+
+class ConnectionPool:
+    # A bounded set of connections shared by the whole process. A thread
+    # checks one out on first use and keeps it until release() - called at
+    # the end of every rerun - or until the thread exits; it then goes back
+    # on the idle list with its PRAGMAs and page cache intact, so the next
+    # rerun reuses it instead of opening a new one. read_only pools open the
+    # file with mode=ro, so reads never contend for the write lock.
+
+    def __init__(self, db_file, read_only=False, size=POOL_SIZE):
+        self.db_file = db_file
+        self.read_only = read_only
+        self.size = size
+        self.opened = 0
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self._idle = []
+        self._owners = {}
+        _POOLS.append(self)
+
+    def _open(self):
+        # check_same_thread=False because a connection moves between threads
+        # as it is checked out and returned; only one thread uses it at a time.
+        if self.read_only:
+            conn = sqlite3.connect(f"file:{os.path.abspath(self.db_file)}?mode=ro", uri=True, timeout=BUSY_TIMEOUT, check_same_thread=False, factory=connection_factory())
+        else:
+            conn = sqlite3.connect(self.db_file, timeout=BUSY_TIMEOUT, check_same_thread=False, factory=connection_factory())
+        for pragma in READ_PRAGMAS if self.read_only else PRAGMAS:
+            conn.execute(pragma)
+        self.opened += 1
+        return conn
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._checkout()
+            self._local.conn = conn
+        return conn
+
+    def _checkout(self):
+        deadline = time.monotonic() + BUSY_TIMEOUT
+        with self._cond:
+            while True:
+                self._reclaim()
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if len(self._owners) < self.size:
+                    conn = self._open()
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError(f"all {self.size} connections to {self.db_file} are in use")
+                # Short waits, so connections of threads that died are noticed.
+                self._cond.wait(min(remaining, 0.1))
+            self._owners[threading.current_thread()] = conn
+        return conn
+
+    def _give_back(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.append(conn)
+        self._cond.notify()
+
+    def _reclaim(self):
+        for thread in [t for t in self._owners if not t.is_alive()]:
+            self._give_back(self._owners.pop(thread))
+
+    def release(self):
+        # Returns the calling thread's connection, if it has one.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._cond:
+            self._owners.pop(threading.current_thread(), None)
+            self._give_back(conn)
+
+    def close_all(self):
+        with self._cond:
+            for conn in [*self._idle, *self._owners.values()]:
+                conn.close()
+            self._idle.clear()
+            self._owners.clear()
+        self._local = threading.local()
+
+@st.cache_resource
+def get_pool(db_file=DB_FILE, read_only=False):
+    return ConnectionPool(db_file, read_only)
+
+def get_connection(db_file=DB_FILE):
+    return get_pool(db_file).connection()
+
+def release_connections():
+    # End of a rerun: hand this thread's connections back for the next one.
+    for pool in list(_POOLS):
+        pool.release()
+
+def get_read_connection(db_file=DB_FILE):
+    # For pages and searches that only SELECT. Falls back to the read-write
+    # pool until the database file exists.
+    if not os.path.exists(db_file):
+        return get_connection(db_file)
+    return get_pool(db_file, read_only=True).connection()
+
+@contextmanager
+def transaction(db_file=DB_FILE):
+    conn = get_connection(db_file)
+    with conn:
+        yield conn
+
+# --- WRITER ---
+# With MIRA_WRITER set to a mira_writer socket, the writes below go to the
+# single-writer service instead of taking the SQLite write lock in every
+# replica. Work that used to read and then write in one transaction (job
+# claims, interview booking) is spelled as guarded statements - UPDATE ...
+# RETURNING, INSERT ... WHERE NOT EXISTS - sent together with run_writes.
+# Not routed: migrations (DDL, which the writer refuses; the writer migrates
+# the file when it starts), the --rebuild maintenance commands, meant for
+# when the app is stopped, and files other than DB_FILE, e.g. CLI --db runs.
+# The shared cache (mira_cache) is a separate file and writes it directly.
+@st.cache_resource
+def get_writer():
+    path = os.environ.get("MIRA_WRITER")
+    if not path:
+        return None
+    from mira_writer import WriterClient
+    return WriterClient(path)
+
+class WriteResult:
+    # The parts of a cursor callers of execute() use.
+
+    def __init__(self, result):
+        self.rowcount = result["rowcount"]
+        self.lastrowid = result["lastrowid"]
+        self.rows = result["rows"]
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+def _remote_write(ops, db_file):
+    # Returns one WriteResult per op, or None to write locally. An unreachable
+    # writer degrades to local writes rather than failing the request; a
+    # connection lost after the request was sent raises instead, since the
+    # writer may have committed it.
+    writer = get_writer() if db_file == DB_FILE else None
+    if writer is None:
+        return None
+    from mira_writer import WriterUnavailable
+    try:
+        return [WriteResult(r) for r in writer.run(ops)]
+    except WriterUnavailable as e:
+        logger.warning("writer at %s unavailable (%s); writing locally", writer.path, e)
+        return None
+
+def run_writes(ops, db_file=DB_FILE):
+    # Runs the ops in one transaction: [(sql, params)] or [(sql, rows, True)]
+    # for executemany, as for WriterClient.run. Returns a WriteResult per
+    # op; rows holds what a RETURNING clause produced.
+    remote = _remote_write(ops, db_file)
+    if remote:
+        return remote
+    results = []
+    with transaction(db_file) as conn:
+        for op in ops:
+            if len(op) > 2 and op[2]:
+                cur, rows = conn.executemany(op[0], op[1]), []
+            else:
+                cur = conn.execute(op[0], op[1])
+                rows = cur.fetchall()
+            results.append(WriteResult({"rowcount": cur.rowcount, "lastrowid": cur.lastrowid, "rows": rows}))
+    return results
+
+# --- QUERY HELPERS ---
+def query(sql, params=(), db_file=DB_FILE):
+    return get_read_connection(db_file).execute(sql, params).fetchall()
+
+def query_one(sql, params=(), db_file=DB_FILE):
+    return get_read_connection(db_file).execute(sql, params).fetchone()
+
+def execute(sql, params=(), db_file=DB_FILE):
+    remote = _remote_write([(sql, params)], db_file)
+    if remote:
+        return remote[0]
+    with transaction(db_file) as conn:
+        return conn.execute(sql, params)
+
+def executemany(sql, rows, db_file=DB_FILE):
+    remote = _remote_write([(sql, rows, True)], db_file)
+    if remote:
+        return remote[0]
+    with transaction(db_file) as conn:
+        return conn.executemany(sql, rows)
+
+def execute_returning(sql, rows, db_file=DB_FILE):
+    # Runs a `... RETURNING <col>` statement once per row in one transaction;
+    # returns the first column of each result, None where nothing came back.
+    remote = _remote_write([(sql, row) for row in rows], db_file)
+    if remote:
+        return [(r.fetchone() or (None,))[0] for r in remote]
+    with transaction(db_file) as conn:
+        return [(conn.execute(sql, row).fetchone() or (None,))[0] for row in rows]
+
+# --- REPOSITORY ---
+# Record inserts go through the configured storage backend (mira_storage);
+# with the default SQLite backend they end up in execute_returning above.
+ONBOARDING_COLUMNS = ["name", "email", "position", "start_date", "salary", "filepath", "document", "timestamp"]
+
+def _now():
+    return datetime.now().isoformat()
+
+def _storage():
+    # Imported here because mira_storage builds on this module.
+    from mira_storage import get_storage
+    return get_storage()
+
+def insert_resume(name, email, phone, skills, experience, filename, content_hash=None):
+    return _storage().insert("resumes", {
+        "name": name, "email": email, "phone": phone, "skills": skills, "experience": experience,
+        "filename": filename, "timestamp": _now(), "content_hash": content_hash,
+    }, ignore_conflicts=True) is not None
+
+def insert_parsed_resume(details, filename, content_hash=None):
+    values = dict(zip(DETAIL_COLUMNS, details.row()))
+    values.update(filename=filename, timestamp=_now(), content_hash=content_hash)
+    return _storage().insert("resumes", values, ignore_conflicts=True) is not None
+
+def insert_mira_log(question, answer, ttft_ms=None, latency_ms=None, session_id=None, prompt_tokens=None, completion_tokens=None, context_tokens=None, retrieval_ms=None):
+    return _storage().insert("mira_logs", {
+        "question": question, "answer": answer, "timestamp": _now(), "ttft_ms": ttft_ms, "latency_ms": latency_ms,
+        "session_id": session_id, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+        "context_tokens": context_tokens, "retrieval_ms": retrieval_ms,
+    })
+
+def insert_onboarding_log(name, email, position, start_date, salary, filepath, document=None):
+    return insert_onboarding_logs([(name, email, position, start_date, salary, filepath, document)])[0]
+
+def insert_onboarding_logs(rows):
+    # rows: (name, email, position, start_date, salary, filepath, document).
+    # One transaction for the whole batch; returns the new ids in order.
+    now = _now()
+    return _storage().insert_many("onboarding_logs", ONBOARDING_COLUMNS, [(*row, now) for row in rows])
+
+def insert_job_description(content):
+    _storage().insert("job_descriptions", {"content": content, "timestamp": _now()})
+
+def insert_branding_asset(name, content):
+    _storage().insert("branding_assets", {"name": name, "content": content, "timestamp": _now()})
+
+def insert_feedback(candidate_name, rating, comments):
+    _storage().insert("feedback_surveys", {"candidate_name": candidate_name, "rating": rating, "comments": comments, "timestamp": _now()})
+
+def insert_coaching_material(title, notes):
+    _storage().insert("coaching_materials", {"title": title, "notes": notes, "timestamp": _now()})
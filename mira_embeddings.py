@@ -0,0 +1,286 @@
+import argparse
+import fcntl
+import logging
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+import streamlit as st
+
+from mira_db import DB_FILE, get_connection
+
+# Local, CPU-only vector index for resumes. Vectors are appended to a
+# float32 file on disk and searched through a read-only memory map with one
+# NumPy mat-vec.
+#
+# Two embedders:
+#   - SentenceTransformerEmbedder runs a real embedding model on the CPU
+#     (MIRA_EMBEDDING_MODEL, default all-MiniLM-L6-v2). It needs the
+#     optional sentence-transformers package; the model is downloaded once
+#     and then loaded from the local cache.
+#   - HashingEmbedder is the fallback when that package is not installed,
+#     or with MIRA_EMBEDDING_MODEL=hashing. It is lexical, not semantic:
+#     hashed words, word pairs and character trigrams, plus the hand-written
+#     SYNONYMS below. It finds "machine learning" for "ML" because that pair
+#     is listed, not because it understands either.
+#
+# Each embedder has its own index files. Queries only read the index; new
+# resumes are embedded by bulk ingest, the embed_resumes job that
+# save_to_db enqueues (and the workers run periodically) and the CLI.
+
+DIM = 256
+SEARCH_LIMIT = 200
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+MODEL_BATCH_SIZE = 64
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+logger = logging.getLogger("mira.embeddings")
+
+# Abbreviations and phrases collapsed onto one concept feature, so
+# "ML engineer" and "machine learning" share a dimension.
+SYNONYMS = {
+    "ml": "machine_learning", "machine learning": "machine_learning",
+    "ai": "artificial_intelligence", "artificial intelligence": "artificial_intelligence",
+    "dl": "deep_learning", "deep learning": "deep_learning",
+    "nlp": "natural_language_processing", "natural language processing": "natural_language_processing",
+    "cv": "computer_vision", "computer vision": "computer_vision",
+    "k8s": "kubernetes", "kube": "kubernetes",
+    "js": "javascript", "ts": "typescript", "py": "python",
+    "golang": "go", "postgres": "postgresql", "psql": "postgresql",
+    "aws": "amazon_web_services", "amazon web services": "amazon_web_services",
+    "gcp": "google_cloud", "google cloud": "google_cloud",
+    "swe": "software_engineer", "software engineer": "software_engineer",
+    "sde": "software_engineer", "software developer": "software_engineer",
+    "devops": "devops", "sre": "site_reliability", "site reliability": "site_reliability",
+    "ux": "user_experience", "user experience": "user_experience",
+    "hr": "human_resources", "human resources": "human_resources",
+    "pm": "product_manager", "product manager": "product_manager",
+    "qa": "quality_assurance", "quality assurance": "quality_assurance",
+    "ci/cd": "ci_cd", "cicd": "ci_cd",
+}
+
+# --- EMBEDDER ---
+class HashingEmbedder:
+    # Lexical fallback (see the top of the file). Stateless, so it needs no
+    # training and gives identical vectors in every process. Each feature
+    # hashes to a dimension and a sign.
+    name = "hashing"
+
+    def __init__(self, dim=DIM):
+        self.dim = dim
+
+    def _features(self, text):
+        words = WORD_RE.findall((text or "").lower())
+        for i, word in enumerate(words):
+            concept = SYNONYMS.get(word)
+            yield concept or word, 1.0
+            if i + 1 < len(words):
+                bigram = f"{word} {words[i + 1]}"
+                concept = SYNONYMS.get(bigram)
+                yield concept or bigram, 1.0 if concept else 0.5
+            if len(word) > 4:
+                padded = f"<{word}>"
+                for j in range(len(padded) - 2):
+                    yield "#" + padded[j:j + 3], 0.15
+
+    def embed(self, text):
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in self._features(text):
+            h = zlib.crc32(feature.encode("utf-8"))
+            vec[h % self.dim] += weight if h & 0x80000000 else -weight
+        # Sub-linear term frequency, then unit length so a dot product is a cosine.
+        vec = np.sign(vec) * np.log1p(np.abs(vec))
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def embed_many(self, texts):
+        return np.vstack([self.embed(t) for t in texts]) if texts else np.zeros((0, self.dim), dtype=np.float32)
+
+class SentenceTransformerEmbedder:
+    # A local sentence-embedding model; vectors come back unit length, like
+    # HashingEmbedder's, so a dot product is a cosine.
+
+    def __init__(self, model_name=DEFAULT_MODEL):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = re.sub(r"[^a-z0-9]+", "-", model_name.lower()).strip("-")
+
+    def embed(self, text):
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts):
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self.model.encode(
+            list(texts), batch_size=MODEL_BATCH_SIZE, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
+
+@st.cache_resource
+def get_embedder():
+    model = os.environ.get("MIRA_EMBEDDING_MODEL", DEFAULT_MODEL)
+    if model != "hashing":
+        try:
+            return SentenceTransformerEmbedder(model)
+        except ImportError:
+            logger.warning("sentence-transformers is not installed; semantic search falls back to lexical hashing")
+    return HashingEmbedder()
+
+def resume_text(skills, experience, job_title=""):
+    return f"{job_title or ''}\n{skills or ''}\n{experience or ''}"
+
+# --- INDEX ---
+class EmbeddingIndex:
+    # Append-only pair of files: <prefix>.f32 (rows of DIM float32) and
+    # <prefix>.ids (int64 resume ids). Readers memory-map whatever complete
+    # rows exist, so appends from another process are picked up on refresh.
+    # Writers - threads and other replicas alike - serialise on an flock of
+    # <prefix>.lock, so two syncs never append the same resumes twice.
+
+    def __init__(self, prefix, embedder=None):
+        self.embedder = embedder or HashingEmbedder()
+        self.vec_path = prefix + ".f32"
+        self.ids_path = prefix + ".ids"
+        self.lock_path = prefix + ".lock"
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+
+    def _rows_on_disk(self):
+        if not os.path.exists(self.vec_path) or not os.path.exists(self.ids_path):
+            return 0
+        return min(os.path.getsize(self.vec_path) // (4 * self.embedder.dim), os.path.getsize(self.ids_path) // 8)
+
+    def refresh(self):
+        rows = self._rows_on_disk()
+        if rows != len(self._ids):
+            self._vectors = np.memmap(self.vec_path, dtype=np.float32, mode="r", shape=(rows, self.embedder.dim)) if rows else self._vectors[:0]
+            self._ids = np.fromfile(self.ids_path, dtype=np.int64, count=rows)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def max_id(self):
+        self.refresh()
+        return int(self._ids.max()) if len(self._ids) else 0
+
+    @contextmanager
+    def _locked(self):
+        with self._lock, open(self.lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _append(self, ids, texts):
+        vectors = self.embedder.embed_many(texts).astype(np.float32)
+        # Vectors first: a reader never sees an id without its vector.
+        with open(self.vec_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.ids_path, "ab") as f:
+            f.write(np.asarray(ids, dtype=np.int64).tobytes())
+        self.refresh()
+
+    def add(self, ids, texts):
+        if not len(ids):
+            return
+        with self._locked():
+            self._append(ids, texts)
+
+    def search(self, query, k=20):
+        self.refresh()
+        if not len(self._ids):
+            return []
+        scores = self._vectors @ self.embedder.embed(query)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        results, seen = [], set()
+        for i in top:
+            resume_id = int(self._ids[i])
+            if resume_id not in seen:
+                seen.add(resume_id)
+                results.append((resume_id, float(scores[i])))
+        return results
+
+    def sync(self, conn, batch_size=1000):
+        # Embeds resumes newer than the highest indexed id; doubles as the
+        # backfill for an empty index.
+        added = 0
+        while True:
+            with self._locked():
+                # Read the highest id under the lock: another process may
+                # have appended since the last batch.
+                rows = conn.execute("""
+                    SELECT id, skills, experience, job_title FROM resumes
+                    WHERE id > ? ORDER BY id LIMIT ?
+                """, (self.max_id(), batch_size)).fetchall()
+                if not rows:
+                    return added
+                self._append([r[0] for r in rows], [resume_text(*r[1:]) for r in rows])
+            added += len(rows)
+
+    def rebuild(self, conn):
+        with self._locked():
+            for path in (self.vec_path, self.ids_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._vectors = self._vectors[:0]
+            self._ids = self._ids[:0]
+        return self.sync(conn)
+
+def index_prefix(db_file=DB_FILE, embedder=None):
+    base = os.path.splitext(db_file)[0] + "_embeddings"
+    name = embedder.name if embedder else HashingEmbedder.name
+    return base if name == HashingEmbedder.name else f"{base}_{name}"
+
+@st.cache_resource
+def get_index(db_file=DB_FILE):
+    embedder = get_embedder()
+    return EmbeddingIndex(index_prefix(db_file, embedder), embedder)
+
+# --- SEARCH ---
+def sync_index(db_file=DB_FILE):
+    # The embed_resumes job handler.
+    return get_index(db_file).sync(get_connection(db_file))
+
+def semantic_search(conn, query, limit=50, offset=0):
+    # Returns full resumes rows (like search_resumes), best match first.
+    # Reads the index as it stands; resumes not embedded yet are not found.
+    hits = get_index().search(query, min(SEARCH_LIMIT, offset + limit))[offset:offset + limit]
+    if not hits:
+        return []
+    ids = [h[0] for h in hits]
+    rows = {r[0]: r for r in conn.execute(
+        f"SELECT * FROM resumes WHERE id IN ({','.join('?' * len(ids))})", ids
+    )}
+    return [rows[i] for i in ids if i in rows]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or update the local resume embedding index.")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database file")
+    parser.add_argument("--rebuild", action="store_true", help="Re-embed every resume from scratch")
+    parser.add_argument("--query", help="Run a test query and print the top matches")
+    args = parser.parse_args()
+
+    import sqlite3
+    import time
+
+    conn = sqlite3.connect(args.db)
+    embedder = get_embedder()
+    index = EmbeddingIndex(index_prefix(args.db, embedder), embedder)
+    added = index.rebuild(conn) if args.rebuild else index.sync(conn)
+    print(f"Embedded {added} resumes with {embedder.name} ({len(index)} vectors in {index.vec_path}).")
+    if args.query:
+        start = time.perf_counter()
+        hits = index.search(args.query, 10)
+        print(f"Query took {(time.perf_counter() - start) * 1000:.1f} ms")
+        for resume_id, score in hits:
+            name = conn.execute("SELECT name FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+            print(f"  {score:.3f}  #{resume_id} {name[0] if name else ''}")
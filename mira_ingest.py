@@ -0,0 +1,158 @@
+import argparse
+import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+from mira_db import DB_FILE, get_connection, run_writes
+from mira_parsing import DETAIL_COLUMNS, parse_resume
+from mira_migrations import migrate
+from mira_store import cached_parses_op, content_hash, known_hashes, get_cached_parse
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+BATCH_SIZE = 200
+
+# --- SOURCES ---
+# A source is a small picklable tuple so only paths (not file contents) cross
+# the process boundary when ingesting from disk:
+#   ("path", filename, path) | ("zip", filename, zip_path, member) | ("bytes", filename, data)
+
+def _is_resume(name):
+    base = os.path.basename(name)
+    return base.lower().endswith(SUPPORTED_EXTENSIONS) and not base.startswith((".", "~$"))
+
+def collect_sources(path):
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for f in sorted(files):
+                if _is_resume(f):
+                    yield ("path", f, os.path.join(root, f))
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for member in zf.namelist():
+                if _is_resume(member) and not member.startswith("__MACOSX/"):
+                    yield ("zip", os.path.basename(member), path, member)
+    elif _is_resume(path):
+        yield ("path", os.path.basename(path), path)
+    else:
+        raise ValueError(f"{path} is not a directory, zip archive or .pdf/.docx file")
+
+def uploaded_sources(uploaded_files):
+    return [("bytes", f.name, f.getvalue()) for f in uploaded_files]
+
+def _read_source(source):
+    kind = source[0]
+    if kind == "path":
+        with open(source[2], "rb") as f:
+            return f.read()
+    if kind == "zip":
+        with zipfile.ZipFile(source[2]) as zf:
+            return zf.read(source[3])
+    return source[2]
+
+# --- WORKER ---
+_known_hashes = frozenset()
+
+def _init_worker(hashes):
+    global _known_hashes
+    _known_hashes = hashes
+
+def parse_source(source):
+    # Runs in a worker process and returns (filename, digest, raw_text, details,
+    # error). Files whose hash is already in the parse cache come back with
+    # details=None and are resolved from the cache by the parent. Never raises:
+    # failures come back as an error string so one corrupt file cannot take
+    # down the batch.
+    filename, digest = source[1], None
+    try:
+        data = _read_source(source)
+        digest = content_hash(data)
+        if digest in _known_hashes:
+            return filename, digest, None, None, None
+        # Already one process per file here, so no page-level parallelism.
+        text, details = parse_resume(data, filename, parallel=False)
+        if not text or not text.strip():
+            return filename, digest, None, None, "no extractable text"
+        return filename, digest, text, details, None
+    except Exception as e:
+        return filename, digest, None, None, f"{type(e).__name__}: {e}"
+
+# --- PIPELINE ---
+def _insert_batch(rows, parsed, db_file):
+    # One transaction per batch, sent to the single writer when there is
+    # one. INSERT OR IGNORE drops rows whose content hash is already
+    # stored, so the return value counts only new candidates.
+    return run_writes([(f"""
+        INSERT OR IGNORE INTO resumes ({', '.join(DETAIL_COLUMNS)}, filename, timestamp, content_hash)
+        VALUES ({', '.join('?' * (len(DETAIL_COLUMNS) + 3))})
+    """, rows, True), cached_parses_op(parsed)], db_file)[0].rowcount
+
+def _parse_all(sources, workers, hashes):
+    # Keeps a bounded window of in-flight files so memory stays flat no matter
+    # how many sources there are; results are yielded as they complete.
+    sources = iter(sources)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(hashes,)) as pool:
+        pending = set()
+        while True:
+            while len(pending) < workers * 4:
+                source = next(sources, None)
+                if source is None:
+                    break
+                pending.add(pool.submit(parse_source, source))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def ingest(sources, db_file=DB_FILE, workers=None, batch_size=BATCH_SIZE, progress=None):
+    # Returns (saved, duplicates, failures) where failures is a list of
+    # (filename, error). `progress(done, filename, error)` is called after
+    # every file.
+    workers = workers or os.cpu_count() or 1
+    conn = get_connection(db_file)
+    migrate(conn)
+
+    saved, done, failures = 0, 0, []
+    rows, parsed = [], []
+    for filename, digest, text, details, error in _parse_all(sources, workers, frozenset(known_hashes(conn))):
+        done += 1
+        if error:
+            failures.append((filename, error))
+        else:
+            if details is None:
+                details = get_cached_parse(conn, digest)
+            else:
+                parsed.append((digest, filename, text, details))
+            rows.append((*details.row(), filename, datetime.now().isoformat(), digest))
+        if len(rows) >= batch_size:
+            saved += _insert_batch(rows, parsed, db_file)
+            rows, parsed = [], []
+        if progress:
+            progress(done, filename, error)
+    if rows:
+        saved += _insert_batch(rows, parsed, db_file)
+    from mira_embeddings import get_index
+    get_index(db_file).sync(conn)
+    return saved, done - saved - len(failures), failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory or zip of .pdf/.docx resumes.")
+    parser.add_argument("path", help="Directory, .zip archive or single resume file")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database file")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per insert transaction")
+    args = parser.parse_args()
+
+    sources = list(collect_sources(args.path))
+    total = len(sources)
+
+    def report(done, filename, error):
+        if error:
+            print(f"  ✗ {filename}: {error}", file=sys.stderr)
+        if done % 100 == 0 or done == total:
+            print(f"[{done}/{total}] parsed", file=sys.stderr)
+
+    saved, duplicates, failures = ingest(sources, args.db, args.workers, args.batch_size, report)
+    print(f"Saved {saved} resumes, skipped {duplicates} duplicates, {len(failures)} failed.")
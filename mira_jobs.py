@@ -0,0 +1,302 @@
+import argparse
+import hashlib
+import importlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+
+import streamlit as st
+
+from mira_db import DB_FILE, execute, get_connection, get_read_connection, run_writes
+
+# Persistent job queue for work too slow for a Streamlit rerun (LLM scoring,
+# document generation, calendar calls). Tabs enqueue a job and poll it; the
+# work runs on worker threads, either inside the web process or in separate
+# `python mira_jobs.py worker` processes sharing the same database.
+#
+# Every job has an idempotency key, so a rerun that submits the same request
+# again gets the existing job back instead of doing the work twice.
+
+POLL_INTERVAL = 0.5
+LEASE_SECONDS = 300      # a running job with no heartbeat for this long is requeued
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 5.0        # seconds, doubled per attempt
+KEEP_FINISHED_DAYS = 14
+
+# kind -> "module:function". Handlers take the job payload as keyword
+# arguments and return something JSON-serializable. Imported on first use so
+# workers only load what they run.
+HANDLERS = {
+    "score_jd": "mira_scoring:score_job_description",
+    "offer_letter": "mira_offers:generate_offer",
+    "offer_batch": "mira_offers:generate_offers",
+    "schedule_interview": "mira_scheduling:schedule_interview",
+    "schedule_batch": "mira_scheduling:bulk_schedule",
+    "calendar_retry": "mira_scheduling:retry_calendar_events",
+    "analytics_snapshot": "mira_analytics:take_snapshot",
+    "summarize_session": "mira_conversations:summarize_session",
+    "embed_resumes": "mira_embeddings:sync_index",
+}
+
+# kind -> seconds between runs. Workers enqueue these themselves, keyed on
+# the interval they fall in, so every worker process can try and the job
+# still runs once per interval.
+PERIODIC = {
+    "analytics_snapshot": 3600,
+    "embed_resumes": 300,     # resumes written by imports or other replicas
+}
+
+logger = logging.getLogger("mira.jobs")
+
+# --- PRODUCER SIDE ---
+def idempotency_key(kind, payload):
+    raw = kind + "\x1f" + json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def enqueue(kind, payload, key=None, max_attempts=MAX_ATTEMPTS, db_file=DB_FILE):
+    # Returns the job id. A job with the same key is reused unless it
+    # failed, in which case it is queued again.
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    key = key or idempotency_key(kind, payload)
+    now = time.time()
+    # One upsert, so it can go to the single writer: the DO UPDATE requeues
+    # a failed job and leaves any other untouched, and either way RETURNING
+    # gives the id.
+    return run_writes([("""
+        INSERT INTO jobs (kind, payload, idempotency_key, max_attempts, run_after, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (idempotency_key) DO UPDATE SET
+            attempts = CASE WHEN status = 'failed' THEN 0 ELSE attempts END,
+            error = CASE WHEN status = 'failed' THEN NULL ELSE error END,
+            run_after = CASE WHEN status = 'failed' THEN excluded.run_after ELSE run_after END,
+            status = CASE WHEN status = 'failed' THEN 'queued' ELSE status END
+        RETURNING id
+    """, (kind, json.dumps(payload, default=str), key, max_attempts, now, now))], db_file)[0].fetchone()[0]
+
+def get_job(job_id, db_file=DB_FILE):
+    row = get_read_connection(db_file).execute("""
+        SELECT id, kind, status, result, error, attempts, created_at, started_at, finished_at
+        FROM jobs WHERE id = ?
+    """, (job_id,)).fetchone()
+    if not row:
+        return None
+    job = dict(zip(("id", "kind", "status", "result", "error", "attempts", "created_at", "started_at", "finished_at"), row))
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+def queue_counts(db_file=DB_FILE):
+    return dict(get_read_connection(db_file).execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+# --- WORKER SIDE ---
+def _resolve(kind):
+    module, func = HANDLERS[kind].split(":")
+    return getattr(importlib.import_module(module), func)
+
+def claim(worker_id, db_file=DB_FILE):
+    # Atomically moves the oldest runnable job to 'running'. Jobs whose
+    # worker stopped heart-beating are put back in the queue first. Both
+    # are single UPDATE statements sent together, so the claim needs no
+    # read-then-write transaction and goes through the single writer.
+    now = time.time()
+    return run_writes([
+        # An expired lease counts as a failed attempt, so a job that keeps
+        # killing its worker stops once it has used up max_attempts.
+        ("""
+            UPDATE jobs SET locked_by = NULL, error = 'worker stopped responding',
+                status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                finished_at = CASE WHEN attempts < max_attempts THEN finished_at ELSE ? END
+            WHERE status = 'running' AND heartbeat_at < ?
+        """, (now, now - LEASE_SECONDS)),
+        ("""
+            UPDATE jobs SET status = 'running', locked_by = ?, started_at = ?, heartbeat_at = ?, attempts = attempts + 1
+            WHERE id = (
+                SELECT id FROM jobs WHERE status = 'queued' AND run_after <= ?
+                ORDER BY run_after, id LIMIT 1
+            )
+            RETURNING id, kind, payload, attempts, max_attempts
+        """, (worker_id, now, now, now)),
+    ], db_file)[1].fetchone()
+
+def _heartbeat(job_id, worker_id, db_file=DB_FILE):
+    execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND locked_by = ?", (time.time(), job_id, worker_id), db_file)
+
+def _finish(job_id, worker_id, result=None, error=None, retry_at=None, db_file=DB_FILE):
+    # The locked_by check stops a worker whose lease expired from
+    # overwriting the outcome of the worker that took the job over.
+    if error is None:
+        execute("""
+            UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ?, locked_by = NULL
+            WHERE id = ? AND locked_by = ?
+        """, (json.dumps(result, default=str), time.time(), job_id, worker_id), db_file)
+    elif retry_at is not None:
+        execute("""
+            UPDATE jobs SET status = 'queued', error = ?, run_after = ?, locked_by = NULL
+            WHERE id = ? AND locked_by = ?
+        """, (error, retry_at, job_id, worker_id), db_file)
+    else:
+        execute("""
+            UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, locked_by = NULL
+            WHERE id = ? AND locked_by = ?
+        """, (error, time.time(), job_id, worker_id), db_file)
+
+def run_one(worker_id, db_file=DB_FILE):
+    # Claims and runs a single job. Returns False when the queue is empty.
+    job = claim(worker_id, db_file)
+    if job is None:
+        return False
+    job_id, kind, payload, attempts, max_attempts = job
+
+    stop = threading.Event()
+    def beat():
+        while not stop.wait(LEASE_SECONDS / 3):
+            _heartbeat(job_id, worker_id, db_file)
+    threading.Thread(target=beat, daemon=True).start()
+
+    start = time.perf_counter()
+    try:
+        result = _resolve(kind)(**json.loads(payload))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        logger.warning("job %s (%s) attempt %s failed: %s\n%s", job_id, kind, attempts, error, traceback.format_exc())
+        retry_at = time.time() + RETRY_DELAY * 2 ** (attempts - 1) if attempts < max_attempts else None
+        _finish(job_id, worker_id, error=error, retry_at=retry_at, db_file=db_file)
+    else:
+        logger.info("job %s (%s) done in %.2fs", job_id, kind, time.perf_counter() - start)
+        _finish(job_id, worker_id, result=result, db_file=db_file)
+    finally:
+        stop.set()
+    return True
+
+def purge_finished(days=KEEP_FINISHED_DAYS, db_file=DB_FILE):
+    return execute(
+        "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (time.time() - days * 86400,), db_file
+    ).rowcount
+
+class WorkerPool:
+    # N threads polling the queue. Handlers are I/O bound (LLM, calendar,
+    # disk), so threads are enough; run more worker processes to scale out.
+
+    def __init__(self, db_file=DB_FILE, concurrency=2, poll_interval=POLL_INTERVAL, name=None):
+        self.db_file = db_file
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._next_periodic = {}
+
+    def _schedule_periodic(self):
+        now = time.time()
+        due = []
+        with self._lock:
+            for kind, interval in PERIODIC.items():
+                if now >= self._next_periodic.get(kind, 0):
+                    bucket = int(now // interval)
+                    self._next_periodic[kind] = (bucket + 1) * interval
+                    due.append(f"{kind}:{bucket}")
+        for key in due:
+            enqueue(key.split(":")[0], {}, key=key, db_file=self.db_file)
+
+    def _loop(self, worker_id):
+        while not self._stop.is_set():
+            try:
+                self._schedule_periodic()
+                busy = run_one(worker_id, self.db_file)
+            except Exception:
+                logger.exception("worker %s: error while polling", worker_id)
+                busy = False
+            if not busy:
+                self._stop.wait(self.poll_interval)
+
+    def start(self):
+        for i in range(self.concurrency):
+            t = threading.Thread(target=self._loop, args=(f"{self.name}/{i}",), name=f"mira-job-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout)
+
+    def run_forever(self):
+        self.start()
+        try:
+            while any(t.is_alive() for t in self._threads):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.stop()
+
+@st.cache_resource
+def start_background_workers(db_file=DB_FILE):
+    # In-process workers for single-process deployments. Set
+    # MIRA_JOB_WORKERS=0 when dedicated `mira_jobs.py worker` processes run.
+    concurrency = int(os.environ.get("MIRA_JOB_WORKERS", "2"))
+    return WorkerPool(db_file, concurrency).start() if concurrency > 0 else None
+
+# --- UI ---
+def job_panel(key, render_done, running_message="Working on it..."):
+    # Shows the job whose id is in st.session_state[key], refreshing every
+    # second while it is queued or running. `render_done(result)` draws the
+    # finished result.
+    job_id = st.session_state.get(key)
+    job = get_job(job_id) if job_id else None
+    active = job is not None and job["status"] in ("queued", "running")
+
+    # Only an unfinished job gets a timer; idle panels cost nothing per rerun.
+    @st.fragment(run_every=1.0 if active else None)
+    def poll():
+        job = get_job(job_id) if job_id else None
+        if job is None:
+            return
+        if job["status"] in ("queued", "running"):
+            retry = f" (attempt {job['attempts'] + 1})" if job["error"] else ""
+            st.info(f"⏳ {running_message}{retry}")
+        elif job["status"] == "done":
+            render_done(job["result"])
+        else:
+            st.error(f"Job failed after {job['attempts']} attempts: {job['error']}")
+        if active and job["status"] in ("done", "failed"):
+            # One full rerun so widgets outside the fragment see the result
+            # and the timer is dropped.
+            st.rerun()
+    poll()
+
+def submit_job(key, kind, payload, idempotency=None):
+    st.session_state[key] = enqueue(kind, payload, idempotency)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MIRA background job worker.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    worker = sub.add_parser("worker", help="Run queued jobs until interrupted")
+    worker.add_argument("--db", default=DB_FILE, help="SQLite database holding the queue")
+    worker.add_argument("--concurrency", type=int, default=4, help="Worker threads in this process")
+    worker.add_argument("--poll-interval", type=float, default=POLL_INTERVAL)
+    status = sub.add_parser("status", help="Print job counts by status")
+    status.add_argument("--db", default=DB_FILE)
+    purge = sub.add_parser("purge", help="Delete finished jobs older than --days")
+    purge.add_argument("--db", default=DB_FILE)
+    purge.add_argument("--days", type=float, default=KEEP_FINISHED_DAYS)
+    args = parser.parse_args()
+
+    from mira_migrations import migrate
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    conn = get_connection(args.db)
+    migrate(conn)
+    if args.command == "worker":
+        pool = WorkerPool(args.db, args.concurrency, args.poll_interval)
+        logger.info("worker %s running %d threads on %s", pool.name, args.concurrency, args.db)
+        pool.run_forever()
+    elif args.command == "status":
+        for state, count in sorted(queue_counts(args.db).items()):
+            print(f"{state:<8} {count}")
+    else:
+        print(f"Deleted {purge_finished(args.days, args.db)} finished jobs.")
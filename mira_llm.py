@@ -0,0 +1,421 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import statistics
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+
+from mira_metrics import METRICS
+
+# LLM gateway: one shared client per process, bounded concurrency, retries
+# with exponential backoff on rate limits / server errors, per-call timeouts
+# and token accounting. Backends are pluggable; StubBackend and the stub HTTP
+# server give deterministic answers for offline load tests.
+
+DEFAULT_MODEL = "gpt-4"
+SYSTEM_PROMPT = "You are MIRA, an intelligent, helpful, and friendly AI recruiting assistant."
+TIMEOUT = 60.0
+MAX_RETRIES = 4
+MAX_CONCURRENCY = 8
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 20.0
+
+class LLMError(Exception):
+    pass
+
+class RetryableLLMError(LLMError):
+    # Rate limits, timeouts, connection failures and 5xx responses.
+    pass
+
+@dataclass
+class Completion:
+    text: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+
+def estimate_tokens(text):
+    # Rough OpenAI-style estimate (~4 characters per token) for backends
+    # that do not report usage.
+    return max(1, len(text or "") // 4)
+
+def build_messages(prompt, system_prompt=SYSTEM_PROMPT):
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt}
+    ]
+
+# --- BACKENDS ---
+class LLMBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    def complete(self, messages, model, timeout):
+        ...
+
+    @abstractmethod
+    def stream(self, messages, model, timeout):
+        ...
+
+    @abstractmethod
+    async def acomplete(self, messages, model, timeout):
+        ...
+
+class OpenAIBackend(LLMBackend):
+    name = "openai"
+
+    def __init__(self, api_key, base_url=None):
+        import openai
+
+        self._openai = openai
+        # Retries are handled by the gateway so they are counted and bounded
+        # together with the concurrency limit.
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=TIMEOUT)
+        self.async_client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=TIMEOUT)
+
+    def _translate(self, e):
+        openai = self._openai
+        retryable = isinstance(e, (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError))
+        if isinstance(e, openai.APIStatusError) and e.status_code >= 500:
+            retryable = True
+        return RetryableLLMError(str(e)) if retryable else LLMError(str(e))
+
+    def _completion(self, response, model):
+        usage = response.usage
+        text = (response.choices[0].message.content or "").strip()
+        return Completion(
+            text=text,
+            model=model,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else estimate_tokens(text),
+        )
+
+    def complete(self, messages, model, timeout):
+        try:
+            response = self.client.chat.completions.create(model=model, messages=messages, timeout=timeout)
+        except self._openai.OpenAIError as e:
+            raise self._translate(e) from e
+        return self._completion(response, model)
+
+    def stream(self, messages, model, timeout):
+        try:
+            stream = self.client.chat.completions.create(model=model, messages=messages, timeout=timeout, stream=True)
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except self._openai.OpenAIError as e:
+            raise self._translate(e) from e
+
+    async def acomplete(self, messages, model, timeout):
+        try:
+            response = await self.async_client.chat.completions.create(model=model, messages=messages, timeout=timeout)
+        except self._openai.OpenAIError as e:
+            raise self._translate(e) from e
+        return self._completion(response, model)
+
+def stub_answer(messages, model):
+    prompt = messages[-1]["content"]
+    digest = hashlib.sha256(f"{model}\x1f{prompt}".encode("utf-8")).hexdigest()[:12]
+    return f"[{model} stub {digest}] You asked: {prompt.strip()[:200]}"
+
+class StubBackend(LLMBackend):
+    # Deterministic in-process backend. `latency` simulates generation time
+    # and every `fail_every`-th call raises a retryable error (0 = never).
+    name = "stub"
+
+    def __init__(self, latency=0.05, fail_every=0):
+        self.latency = latency
+        self.fail_every = fail_every
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def _maybe_fail(self):
+        with self._lock:
+            self._calls += 1
+            calls = self._calls
+        if self.fail_every and calls % self.fail_every == 0:
+            raise RetryableLLMError("stub: simulated 429 Too Many Requests")
+
+    def _completion(self, messages, model):
+        text = stub_answer(messages, model)
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        return Completion(text, model, prompt_tokens, estimate_tokens(text))
+
+    def complete(self, messages, model, timeout):
+        self._maybe_fail()
+        time.sleep(min(self.latency, timeout))
+        return self._completion(messages, model)
+
+    def stream(self, messages, model, timeout):
+        self._maybe_fail()
+        words = stub_answer(messages, model).split(" ")
+        for i, word in enumerate(words):
+            time.sleep(self.latency / len(words))
+            yield word if i == 0 else " " + word
+
+    async def acomplete(self, messages, model, timeout):
+        self._maybe_fail()
+        await asyncio.sleep(min(self.latency, timeout))
+        return self._completion(messages, model)
+
+# --- GATEWAY ---
+class LLMGateway:
+    def __init__(self, backend, max_concurrency=MAX_CONCURRENCY, max_retries=MAX_RETRIES, timeout=TIMEOUT):
+        self.backend = backend
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._usage = {
+            "calls": 0, "errors": 0, "retries": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "latency_seconds": 0.0,
+        }
+
+    def _async_semaphore(self):
+        # asyncio primitives are bound to one event loop.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._async_semaphores:
+                self._async_semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return self._async_semaphores[loop]
+
+    def _backoff(self, attempt):
+        return min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) * (0.5 + random.random() / 2)
+
+    def _account(self, completion=None, error=False, retries=0):
+        if error:
+            METRICS.count("llm.errors")
+        else:
+            METRICS.observe("llm", completion.model, completion.latency)
+        if retries:
+            METRICS.count("llm.retries", retries)
+        with self._lock:
+            self._usage["retries"] += retries
+            if error:
+                self._usage["errors"] += 1
+                return
+            self._usage["calls"] += 1
+            self._usage["prompt_tokens"] += completion.prompt_tokens
+            self._usage["completion_tokens"] += completion.completion_tokens
+            self._usage["latency_seconds"] += completion.latency
+
+    def chat(self, prompt, system_prompt=SYSTEM_PROMPT, model=DEFAULT_MODEL, timeout=None):
+        return self.chat_messages(build_messages(prompt, system_prompt), model, timeout)
+
+    def chat_messages(self, messages, model=DEFAULT_MODEL, timeout=None):
+        timeout = timeout or self.timeout
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                with self._semaphore:
+                    completion = self.backend.complete(messages, model, timeout)
+            except RetryableLLMError:
+                if attempt == self.max_retries:
+                    self._account(error=True, retries=attempt)
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            except Exception:
+                self._account(error=True, retries=attempt)
+                raise
+            completion.latency = time.perf_counter() - start
+            self._account(completion, retries=attempt)
+            return completion
+
+    async def achat(self, prompt, system_prompt=SYSTEM_PROMPT, model=DEFAULT_MODEL, timeout=None):
+        return await self.achat_messages(build_messages(prompt, system_prompt), model, timeout)
+
+    async def achat_messages(self, messages, model=DEFAULT_MODEL, timeout=None):
+        timeout = timeout or self.timeout
+        semaphore = self._async_semaphore()
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                async with semaphore:
+                    completion = await asyncio.wait_for(self.backend.acomplete(messages, model, timeout), timeout)
+            except (RetryableLLMError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    self._account(error=True, retries=attempt)
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            except Exception:
+                self._account(error=True, retries=attempt)
+                raise
+            completion.latency = time.perf_counter() - start
+            self._account(completion, retries=attempt)
+            return completion
+
+    def stream(self, prompt, system_prompt=SYSTEM_PROMPT, model=DEFAULT_MODEL, timeout=None):
+        return self.stream_messages(build_messages(prompt, system_prompt), model, timeout)
+
+    def stream_messages(self, messages, model=DEFAULT_MODEL, timeout=None):
+        # Yields text deltas. Retries only happen before the first delta; once
+        # text has been shown to the user a failure is raised as-is. The
+        # concurrency slot is held for the life of the stream - an open
+        # stream is an open request to the API - and released when it ends
+        # or the caller closes the generator, but not during backoff.
+        timeout = timeout or self.timeout
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            parts = []
+            self._semaphore.acquire()
+            try:
+                chunks = self.backend.stream(messages, model, timeout)
+                try:
+                    for delta in chunks:
+                        parts.append(delta)
+                        yield delta
+                finally:
+                    chunks.close()
+            except RetryableLLMError:
+                if parts or attempt == self.max_retries:
+                    self._account(error=True, retries=attempt)
+                    raise
+            except Exception:
+                self._account(error=True, retries=attempt)
+                raise
+            else:
+                text = "".join(parts)
+                prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+                completion = Completion(text, model, prompt_tokens, estimate_tokens(text), time.perf_counter() - start)
+                self._account(completion, retries=attempt)
+                return
+            finally:
+                self._semaphore.release()
+            time.sleep(self._backoff(attempt))
+
+    def usage(self):
+        with self._lock:
+            usage = dict(self._usage)
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        usage["avg_latency_seconds"] = usage["latency_seconds"] / usage["calls"] if usage["calls"] else 0.0
+        return usage
+
+@st.cache_resource
+def get_gateway():
+    # Backend selection: MIRA_LLM_BACKEND=stub (or [llm] backend = "stub" in
+    # secrets) for offline use; otherwise OpenAI, optionally at [llm] base_url.
+    backend = os.environ.get("MIRA_LLM_BACKEND")
+    llm_config = {} if backend == "stub" else st.secrets.get("llm", {})
+    backend = backend or llm_config.get("backend", "openai")
+    if backend == "stub":
+        return LLMGateway(StubBackend())
+    return LLMGateway(
+        OpenAIBackend(st.secrets["openai"]["api_key"], base_url=llm_config.get("base_url")),
+        max_concurrency=int(llm_config.get("max_concurrency", MAX_CONCURRENCY)),
+    )
+
+# --- STUB SERVER ---
+class _StubHandler(BaseHTTPRequestHandler):
+    # Minimal OpenAI-compatible /v1/chat/completions endpoint.
+    latency = 0.05
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        model = body.get("model", DEFAULT_MODEL)
+        messages = body.get("messages", [])
+        text = stub_answer(messages, model)
+        time.sleep(self.latency)
+
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for i, word in enumerate(text.split(" ")):
+                chunk = {
+                    "id": "stub", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+
+        prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in messages)
+        payload = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": estimate_tokens(text),
+                "total_tokens": prompt_tokens + estimate_tokens(text),
+            },
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+def serve_stub(host="127.0.0.1", port=8765, latency=0.05):
+    _StubHandler.latency = latency
+    server = ThreadingHTTPServer((host, port), _StubHandler)
+    print(f"Stub LLM server on http://{host}:{port}/v1 (latency {latency}s)")
+    server.serve_forever()
+
+# --- LOAD TEST ---
+async def load_test(gateway, requests, model=DEFAULT_MODEL):
+    async def one(i):
+        return await gateway.achat(f"Load test question #{i}: summarize a backend engineer resume.", model=model)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(requests)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    latencies = sorted(r.latency for r in results if isinstance(r, Completion))
+    failures = sum(1 for r in results if not isinstance(r, Completion))
+    report = {
+        "requests": requests,
+        "failures": failures,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1) if latencies else None,
+    }
+    report.update(gateway.usage())
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MIRA LLM gateway tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve-stub", help="Run a local OpenAI-compatible stub server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.05, help="Seconds per response")
+
+    load = sub.add_parser("load-test", help="Fire concurrent requests through the gateway")
+    load.add_argument("--requests", type=int, default=200)
+    load.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY)
+    load.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint (e.g. the stub server); in-process stub if omitted")
+    load.add_argument("--latency", type=float, default=0.05, help="In-process stub latency")
+    load.add_argument("--fail-every", type=int, default=0, help="In-process stub: fail every Nth call with a 429")
+    args = parser.parse_args()
+
+    if args.command == "serve-stub":
+        serve_stub(args.host, args.port, args.latency)
+    else:
+        if args.base_url:
+            backend = OpenAIBackend(api_key=os.environ.get("OPENAI_API_KEY", "stub"), base_url=args.base_url)
+        else:
+            backend = StubBackend(latency=args.latency, fail_every=args.fail_every)
+        gateway = LLMGateway(backend, max_concurrency=args.concurrency)
+        print(json.dumps(asyncio.run(load_test(gateway, args.requests)), indent=2))
@@ -0,0 +1,146 @@
+import difflib
+import hashlib
+import re
+import threading
+import time
+
+from mira_db import execute, get_read_connection, run_writes
+
+# Persistent LLM response cache. Exact tier: keyed on (model, system prompt,
+# normalized prompt) in llm_cache, with TTL expiry and LRU eviction by
+# last_used_at. Similarity tier (optional): serves the answer of a
+# near-identical question from the recent mira_logs history.
+
+TTL_SECONDS = 7 * 24 * 3600
+MAX_ENTRIES = 5000
+SIMILARITY_THRESHOLD = 0.92
+SIMILARITY_WINDOW = 500   # most recent mira_logs rows compared against
+
+WORD_RE = re.compile(r"\w+")
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "similar_hits": 0, "misses": 0, "miss_seconds": 0.0}
+
+# --- KEYS ---
+def normalize_prompt(prompt):
+    return " ".join(WORD_RE.findall((prompt or "").lower()))
+
+def cache_key(model, system_prompt, prompt):
+    raw = "\x1f".join([model, system_prompt, normalize_prompt(prompt)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+# --- LOOKUP ---
+def _lookup(conn, key, ttl):
+    row = conn.execute(
+        "SELECT response, created_at FROM llm_cache WHERE cache_key = ?", (key,)
+    ).fetchone()
+    if not row:
+        return None
+    response, created_at = row
+    now = time.time()
+    if now - created_at > ttl:
+        execute("DELETE FROM llm_cache WHERE cache_key = ? AND created_at = ?", (key, created_at))
+        return None
+    execute("UPDATE llm_cache SET last_used_at = ?, hits = hits + 1 WHERE cache_key = ?", (now, key))
+    return response
+
+def _similar_answer(conn, prompt):
+    target = normalize_prompt(prompt)
+    target_words = set(target.split())
+    if not target_words:
+        return None
+    # Follow-ups asked with conversation context are not standalone answers.
+    rows = conn.execute(
+        "SELECT question, answer FROM mira_logs WHERE COALESCE(context_tokens, 0) = 0 ORDER BY timestamp DESC, id DESC LIMIT ?",
+        (SIMILARITY_WINDOW,)
+    ).fetchall()
+    matcher = difflib.SequenceMatcher(b=target, autojunk=False)
+    best, best_ratio = None, SIMILARITY_THRESHOLD
+    for question, answer in rows:
+        candidate = normalize_prompt(question)
+        words = set(candidate.split())
+        # Cheap set-overlap filter before the character-level comparison.
+        if not answer or len(words & target_words) / len(words | target_words) < 0.7:
+            continue
+        matcher.set_seq1(candidate)
+        if matcher.quick_ratio() < best_ratio:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= best_ratio:
+            best, best_ratio = answer, ratio
+    return best
+
+def _store(key, model, system_prompt, prompt, response):
+    # Insert, expire and evict in one transaction; the eviction counts the
+    # excess itself so the three go to the writer as one request.
+    now = time.time()
+    run_writes([
+        ("""
+            INSERT OR REPLACE INTO llm_cache
+                (cache_key, model, system_prompt, prompt, response, created_at, last_used_at, hits)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+        """, (key, model, system_prompt, prompt, response, now, now)),
+        ("DELETE FROM llm_cache WHERE created_at < ?", (now - TTL_SECONDS,)),
+        ("""
+            DELETE FROM llm_cache WHERE cache_key IN (
+                SELECT cache_key FROM llm_cache ORDER BY last_used_at ASC
+                LIMIT max(0, (SELECT COUNT(*) FROM llm_cache) - ?)
+            )
+        """, (MAX_ENTRIES,)),
+    ])
+
+def lookup_cached(model, system_prompt, prompt, ttl=TTL_SECONDS, similarity=True):
+    # Returns (response, source) with source "cache" or "similar", or
+    # (None, None) on a miss.
+    conn = get_read_connection()
+    key = cache_key(model, system_prompt, prompt)
+
+    response = _lookup(conn, key, ttl)
+    if response is not None:
+        _record("hits")
+        return response, "cache"
+
+    if similarity:
+        response = _similar_answer(conn, prompt)
+        if response is not None:
+            _record("similar_hits")
+            _store(key, model, system_prompt, prompt, response)
+            return response, "similar"
+
+    return None, None
+
+def store_response(model, system_prompt, prompt, response, seconds):
+    # Records a miss that took `seconds` to answer and caches the result.
+    _record("misses", seconds)
+    _store(cache_key(model, system_prompt, prompt), model, system_prompt, prompt, response)
+
+def cached_completion(model, system_prompt, prompt, compute, ttl=TTL_SECONDS, similarity=True):
+    # Returns (response, source) where source is "cache", "similar" or "llm".
+    # `compute(prompt)` is only called on a miss.
+    response, source = lookup_cached(model, system_prompt, prompt, ttl, similarity)
+    if response is not None:
+        return response, source
+
+    start = time.perf_counter()
+    response = compute(prompt)
+    store_response(model, system_prompt, prompt, response, time.perf_counter() - start)
+    return response, "llm"
+
+# --- STATS ---
+def _record(counter, seconds=0.0):
+    with _stats_lock:
+        _stats[counter] += 1
+        _stats["miss_seconds"] += seconds
+
+def cache_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    served = stats["hits"] + stats["similar_hits"]
+    lookups = served + stats["misses"]
+    avg_miss = stats["miss_seconds"] / stats["misses"] if stats["misses"] else 0.0
+    stats["hit_rate"] = served / lookups if lookups else 0.0
+    stats["avg_miss_seconds"] = avg_miss
+    # Every cache-served answer is one LLM round-trip not made.
+    stats["saved_calls"] = served
+    stats["saved_seconds_estimate"] = served * avg_miss
+    return stats
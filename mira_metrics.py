@@ -0,0 +1,273 @@
+import functools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# In-process timers and counters for the hot paths: every SQLite statement
+# (through InstrumentedConnection), resume parsing, LLM calls and per-tab
+# render time, plus per-rerun totals. Samples are kept in bounded windows so
+# percentiles reflect recent traffic. Streamlit is only imported by the
+# panel, so parse workers and CLIs can record without loading it.
+#
+# Each process has its own registry; the ingest pool's worker processes
+# and standalone job workers are not visible in the app's panel.
+
+ENABLED = os.environ.get("MIRA_METRICS", "1") != "0"
+WINDOW = 1000            # samples kept per series
+MAX_STATEMENTS = 500     # distinct SQL statements tracked
+EXPORT_DIR = "metrics"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# --- REGISTRY ---
+class Series:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=WINDOW)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.samples.append(value)
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.series = {}        # (kind, name) -> Series of seconds
+        self.counters = {}      # name -> int
+        self.statements = {}    # normalized SQL -> Series
+        self.started = time.time()
+
+    def observe(self, kind, name, seconds):
+        with self._lock:
+            series = self.series.get((kind, name))
+            if series is None:
+                series = self.series[(kind, name)] = Series()
+            series.add(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe_sql(self, sql, seconds):
+        key = _WHITESPACE_RE.sub(" ", sql).strip()[:300]
+        with self._lock:
+            series = self.statements.get(key)
+            if series is None:
+                if len(self.statements) >= MAX_STATEMENTS:
+                    self.counters["db.untracked_statements"] = self.counters.get("db.untracked_statements", 0) + 1
+                    return
+                series = self.statements[key] = Series()
+            series.add(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.series.clear()
+            self.counters.clear()
+            self.statements.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        # Plain dicts (seconds), safe to serialize.
+        with self._lock:
+            series = [(k, s.count, s.total, s.max, sorted(s.samples)) for k, s in self.series.items()]
+            statements = [(sql, s.count, s.total, s.max, sorted(s.samples)) for sql, s in self.statements.items()]
+            counters = dict(self.counters)
+
+        def summarize(count, total, max_, ordered):
+            pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+            return {"count": count, "total": total, "max": max_, "p50": pick(0.5), "p95": pick(0.95)}
+
+        return {
+            "since": self.started,
+            "series": [{"kind": kind, "name": name, **summarize(*rest)} for (kind, name), *rest in series],
+            "statements": [{"sql": sql, **summarize(*rest)} for sql, *rest in statements],
+            "counters": counters,
+        }
+
+METRICS = Metrics()
+
+# --- TIMERS ---
+_rerun = threading.local()
+
+@contextmanager
+def timer(kind, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.observe(kind, name, time.perf_counter() - start)
+
+def timed(kind, name=None):
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                METRICS.observe(kind, label, time.perf_counter() - start)
+        return wrapper if ENABLED else fn
+    return decorate
+
+# --- RERUNS ---
+# Streamlit runs each rerun on its own script thread, so per-rerun query
+# counts are kept thread-locally and folded into the registry at the end.
+def begin_rerun():
+    _rerun.queries = 0
+    _rerun.db_seconds = 0.0
+
+def end_rerun(seconds):
+    queries = getattr(_rerun, "queries", None)
+    if queries is None:
+        return
+    METRICS.observe("rerun", "total", seconds)
+    METRICS.observe("rerun", "db", _rerun.db_seconds)
+    METRICS.observe("rerun", "queries", queries)   # a count, not seconds
+    METRICS.count("rerun.count")
+    _rerun.queries = None
+
+# --- SQLITE ---
+class InstrumentedConnection(sqlite3.Connection):
+    # Times statement execution (the first step of a query; rows fetched
+    # later by iterating the cursor are not included).
+
+    def _record(self, sql, start):
+        elapsed = time.perf_counter() - start
+        METRICS.observe_sql(sql, elapsed)
+        if getattr(_rerun, "queries", None) is not None:
+            _rerun.queries += 1
+            _rerun.db_seconds += elapsed
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record(sql, start)
+
+    def executemany(self, sql, parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, parameters)
+        finally:
+            self._record(sql, start)
+
+    def executescript(self, script):
+        start = time.perf_counter()
+        try:
+            return super().executescript(script)
+        finally:
+            self._record(script, start)
+
+def connection_factory():
+    return InstrumentedConnection if ENABLED else sqlite3.Connection
+
+# --- EXPORT ---
+def prometheus_text(snapshot=None):
+    snapshot = snapshot or METRICS.snapshot()
+    lines = [
+        "# HELP mira_latency_seconds Latency of instrumented MIRA operations.",
+        "# TYPE mira_latency_seconds summary",
+    ]
+    for s in snapshot["series"]:
+        if (s["kind"], s["name"]) == ("rerun", "queries"):
+            continue
+        labels = f'kind="{s["kind"]}",name="{s["name"]}"'
+        lines.append(f'mira_latency_seconds{{{labels},quantile="0.5"}} {s["p50"]:.6f}')
+        lines.append(f'mira_latency_seconds{{{labels},quantile="0.95"}} {s["p95"]:.6f}')
+        lines.append(f"mira_latency_seconds_sum{{{labels}}} {s['total']:.6f}")
+        lines.append(f"mira_latency_seconds_count{{{labels}}} {s['count']}")
+    lines += [
+        "# HELP mira_db_statements_total SQLite statements executed.",
+        "# TYPE mira_db_statements_total counter",
+        f"mira_db_statements_total {sum(s['count'] for s in snapshot['statements'])}",
+        "# HELP mira_db_seconds_total Time spent executing SQLite statements.",
+        "# TYPE mira_db_seconds_total counter",
+        f"mira_db_seconds_total {sum(s['total'] for s in snapshot['statements']):.6f}",
+    ]
+    lines += ["# HELP mira_events_total Counted MIRA events.", "# TYPE mira_events_total counter"]
+    for name, value in sorted(snapshot["counters"].items()):
+        lines.append(f'mira_events_total{{name="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+def export_metrics(fmt="prom", path=None):
+    # Written atomically, so a node_exporter textfile collector (or anything
+    # else polling the file) never reads half a file.
+    path = path or os.path.join(EXPORT_DIR, f"mira_metrics.{fmt}")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    body = prometheus_text() if fmt == "prom" else json.dumps(METRICS.snapshot(), indent=2)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp, path)
+    return path
+
+# --- PANEL ---
+def is_admin():
+    # MIRA_ADMIN=1, or ?admin=<token> matching [admin] token in secrets.
+    import streamlit as st
+
+    if os.environ.get("MIRA_ADMIN") == "1":
+        return True
+    try:
+        token = st.secrets.get("admin", {}).get("token")
+    except Exception:   # no secrets.toml at all
+        return False
+    return bool(token) and st.query_params.get("admin") == token
+
+def render_performance_tab():
+    import streamlit as st
+
+    snapshot = METRICS.snapshot()
+    series = {(s["kind"], s["name"]): s for s in snapshot["series"]}
+    reruns = series.get(("rerun", "total"))
+    queries = series.get(("rerun", "queries"))
+
+    cols = st.columns(4)
+    cols[0].metric("Reruns", reruns["count"] if reruns else 0)
+    cols[1].metric("Rerun p50 / p95", f"{reruns['p50'] * 1000:.0f} / {reruns['p95'] * 1000:.0f} ms" if reruns else "—")
+    cols[2].metric("Queries per rerun p50 / p95", f"{queries['p50']:.0f} / {queries['p95']:.0f}" if queries else "—")
+    db = series.get(("rerun", "db"))
+    cols[3].metric("DB time per rerun p95", f"{db['p95'] * 1000:.0f} ms" if db else "—")
+
+    for kind, title in (("render", "Tabs"), ("db", "Database"), ("parser", "Parsing"), ("llm", "LLM calls")):
+        if kind == "db":
+            rows = [{"name": s["sql"], **s} for s in snapshot["statements"]]
+        else:
+            rows = [s for s in snapshot["series"] if s["kind"] == kind]
+        if not rows:
+            continue
+        st.markdown(f"**{title}**")
+        if kind == "db":
+            st.caption(f"{sum(r['count'] for r in rows)} statements · slowest first")
+            rows.sort(key=lambda r: r["max"], reverse=True)
+            rows = rows[:25]
+        else:
+            rows.sort(key=lambda r: r["total"], reverse=True)
+        st.dataframe([
+            {"Name": r["name"], "Calls": r["count"], "p50 ms": round(r["p50"] * 1000, 2),
+             "p95 ms": round(r["p95"] * 1000, 2), "Max ms": round(r["max"] * 1000, 2), "Total s": round(r["total"], 3)}
+            for r in rows
+        ], hide_index=True)
+
+    col1, col2, col3 = st.columns(3)
+    if col1.button("📤 Export Prometheus"):
+        st.success(f"Wrote {export_metrics('prom')}")
+    if col2.button("📤 Export JSON"):
+        st.success(f"Wrote {export_metrics('json')}")
+    if col3.button("♻️ Reset"):
+        METRICS.reset()
+        st.rerun()
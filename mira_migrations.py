@@ -0,0 +1,664 @@
+from datetime import datetime
+
+import streamlit as st
+
+from mira_db import DB_FILE, get_connection
+
+# Ordered schema migrations. Each step runs once per database inside its own
+# write transaction and is recorded in schema_version; never edit a step that
+# has shipped - append a new one instead. Steps spell out their DDL here
+# rather than calling into feature modules, so changing a feature later can
+# never change what an old step did.
+
+TIMESTAMPED_TABLES = [
+    "resumes", "mira_logs", "onboarding_logs", "job_descriptions",
+    "branding_assets", "feedback_surveys", "coaching_materials",
+]
+
+# --- HELPERS ---
+def _columns(conn, table):
+    return {row[1]: row[2].upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+
+def _add_column(conn, table, column, decl):
+    if column not in _columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+# --- SHARED SQL ---
+# The backfills of steps 13 and 16 are also how mira_analytics and
+# mira_retrieval rebuild those tables, so there is one copy of the SQL.
+# They are part of the steps and frozen with them: a schema change gets a
+# new step and, if the rebuild has to follow it, a new helper here.
+
+# table -> metric name in analytics_daily
+ANALYTICS_DAILY = {
+    "resumes": "resumes", "feedback_surveys": "feedback", "onboarding_logs": "offers",
+    "mira_logs": "questions", "job_descriptions": "job_descriptions",
+}
+# knowledge_fts sources: (kind, code, table, title, body); rowid = source id
+# * 4 + code, so the triggers delete by rowid instead of scanning the index.
+KNOWLEDGE_SOURCES = [
+    ("jd", 1, "job_descriptions", "substr({t}.content, 1, instr({t}.content || char(10), char(10)) - 1)", "{t}.content"),
+    ("feedback", 2, "feedback_surveys", "{t}.candidate_name", "'Rated ' || {t}.rating || '/10. ' || COALESCE({t}.comments, '')"),
+    ("coaching", 3, "coaching_materials", "{t}.title", "{t}.notes"),
+]
+RATINGS_FILL = "INSERT INTO analytics_ratings (rating, count) SELECT rating, COUNT(*) FROM feedback_surveys WHERE rating IS NOT NULL GROUP BY rating"
+
+def fill_rollups(conn):
+    # Counts the source tables into the (empty) rollup tables.
+    for table, metric in ANALYTICS_DAILY.items():
+        conn.execute(f"""
+            INSERT INTO analytics_daily (metric, day, count)
+            SELECT '{metric}', COALESCE(substr(timestamp, 1, 10), ''), COUNT(*) FROM {table} GROUP BY 2
+        """)
+    conn.execute(RATINGS_FILL)
+    conn.execute("INSERT INTO analytics_funnel SELECT COALESCE(status, 'New'), COUNT(*) FROM resumes GROUP BY 1")
+    conn.execute("""
+        INSERT INTO analytics_time_to_offer (day, offers, total_days)
+        SELECT COALESCE(substr(o.timestamp, 1, 10), ''), COUNT(*), SUM(julianday(o.timestamp) - julianday(r.first_seen))
+        FROM onboarding_logs o
+        JOIN (SELECT email, MIN(timestamp) AS first_seen FROM resumes WHERE email != '' GROUP BY email) r
+          ON r.email = o.email
+        GROUP BY 1
+    """)
+
+def fill_knowledge_index(conn):
+    # Replaces the contents of knowledge_fts with every source row.
+    conn.execute("DELETE FROM knowledge_fts")
+    for kind, code, table, title, body in KNOWLEDGE_SOURCES:
+        conn.execute(f"""
+            INSERT INTO knowledge_fts (rowid, title, body, kind, timestamp)
+            SELECT id * 4 + {code}, {title.format(t=table)}, {body.format(t=table)}, '{kind}', {table}.timestamp FROM {table}
+        """)
+    conn.execute("INSERT INTO knowledge_fts (knowledge_fts) VALUES ('optimize')")
+
+# --- STEPS ---
+def _base_tables(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS resumes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        email TEXT,
+        phone TEXT,
+        skills TEXT,
+        experience TEXT,
+        filename TEXT,
+        timestamp TEXT,
+        job_title TEXT DEFAULT '',
+        status TEXT DEFAULT 'New',
+        score INTEGER DEFAULT 0
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS mira_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        question TEXT,
+        answer TEXT,
+        timestamp TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS onboarding_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        email TEXT,
+        position TEXT,
+        start_date TEXT,
+        salary REAL,
+        filepath TEXT,
+        timestamp TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS job_descriptions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        content TEXT,
+        timestamp TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS branding_assets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        content TEXT,
+        timestamp TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS feedback_surveys (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        candidate_name TEXT,
+        rating INTEGER,
+        comments TEXT,
+        timestamp TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS coaching_materials (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        notes TEXT,
+        timestamp TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS analytics_snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        metric TEXT,
+        value INTEGER,
+        timestamp TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS voice_assistant_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        transcript TEXT,
+        timestamp TEXT
+    )
+    """)
+
+def _resume_pipeline_columns(conn):
+    # Databases created by init_db.py / mira_app.py never had these.
+    _add_column(conn, "resumes", "job_title", "TEXT DEFAULT ''")
+    _add_column(conn, "resumes", "status", "TEXT DEFAULT 'New'")
+    _add_column(conn, "resumes", "score", "INTEGER DEFAULT 0")
+
+def _onboarding_salary_real(conn):
+    # mira_app.py used to create salary as TEXT. SQLite cannot change a column
+    # type in place, so rebuild the table and cast existing values.
+    if _columns(conn, "onboarding_logs").get("salary") == "REAL":
+        return
+    conn.execute("ALTER TABLE onboarding_logs RENAME TO onboarding_logs_old")
+    conn.execute("""
+    CREATE TABLE onboarding_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        email TEXT,
+        position TEXT,
+        start_date TEXT,
+        salary REAL,
+        filepath TEXT,
+        timestamp TEXT
+    )
+    """)
+    conn.execute("""
+        INSERT INTO onboarding_logs (id, name, email, position, start_date, salary, filepath, timestamp)
+        SELECT id, name, email, position, start_date, CAST(salary AS REAL), filepath, timestamp
+        FROM onboarding_logs_old
+    """)
+    conn.execute("DROP TABLE onboarding_logs_old")
+
+def _mira_log_latency_columns(conn):
+    _add_column(conn, "mira_logs", "ttft_ms", "REAL")
+    _add_column(conn, "mira_logs", "latency_ms", "REAL")
+
+def _resume_detail_columns(conn):
+    # Sections and contact lists from the section tokenizer. Parse-cache
+    # entries from the old extractor are dropped so they are re-parsed.
+    for table in ("resumes", "resume_parse_cache"):
+        for column in ("education", "certifications", "summary", "emails", "phones", "links"):
+            _add_column(conn, table, column, "TEXT DEFAULT ''")
+    conn.execute("DELETE FROM resume_parse_cache")
+
+def _onboarding_documents(conn):
+    # Offer letters are kept in the database and streamed from memory.
+    _add_column(conn, "onboarding_logs", "document", "BLOB")
+
+def _hot_query_indexes(conn):
+    # Newest-first listings (keyset pagination on timestamp, id).
+    for table in TIMESTAMPED_TABLES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_timestamp ON {table} (timestamp DESC, id DESC)")
+    # Candidate lookups and pipeline filtering.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_email ON resumes (email)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_status_score ON resumes (status, score DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_onboarding_logs_email ON onboarding_logs (email)")
+
+def _resume_fts(conn):
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'resumes_fts'").fetchone()
+    conn.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(
+        name, email, phone, skills, experience,
+        content='resumes',
+        content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2 tokenchars '+#'"
+    )
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_ai AFTER INSERT ON resumes BEGIN
+        INSERT INTO resumes_fts (rowid, name, email, phone, skills, experience)
+        VALUES (new.id, new.name, new.email, new.phone, new.skills, new.experience);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_ad AFTER DELETE ON resumes BEGIN
+        INSERT INTO resumes_fts (resumes_fts, rowid, name, email, phone, skills, experience)
+        VALUES ('delete', old.id, old.name, old.email, old.phone, old.skills, old.experience);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_au AFTER UPDATE OF name, email, phone, skills, experience ON resumes BEGIN
+        INSERT INTO resumes_fts (resumes_fts, rowid, name, email, phone, skills, experience)
+        VALUES ('delete', old.id, old.name, old.email, old.phone, old.skills, old.experience);
+        INSERT INTO resumes_fts (rowid, name, email, phone, skills, experience)
+        VALUES (new.id, new.name, new.email, new.phone, new.skills, new.experience);
+    END
+    """)
+    # Backfill for databases that had resumes before the index existed.
+    if not exists:
+        conn.execute("INSERT INTO resumes_fts (resumes_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO resumes_fts (resumes_fts) VALUES ('optimize')")
+
+def _resume_store(conn):
+    _add_column(conn, "resumes", "content_hash", "TEXT")
+    # Legacy rows keep a NULL hash; NULLs never collide in a UNIQUE index.
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_resumes_content_hash ON resumes (content_hash)")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS resume_parse_cache (
+        content_hash TEXT PRIMARY KEY,
+        filename TEXT,
+        raw_text TEXT,
+        name TEXT,
+        email TEXT,
+        phone TEXT,
+        skills TEXT,
+        experience TEXT,
+        timestamp TEXT
+    )
+    """)
+
+def _llm_cache(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        cache_key TEXT PRIMARY KEY,
+        model TEXT,
+        system_prompt TEXT,
+        prompt TEXT,
+        response TEXT,
+        created_at REAL,
+        last_used_at REAL,
+        hits INTEGER DEFAULT 0
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used_at)")
+
+def _resume_scores(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS resume_scores (
+        jd_id INTEGER,
+        resume_id INTEGER,
+        prefilter REAL,
+        score INTEGER,
+        rationale TEXT,
+        scored_at TEXT,
+        PRIMARY KEY (jd_id, resume_id)
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resume_scores_rank ON resume_scores (jd_id, score DESC, prefilter DESC)")
+
+def _job_queue(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        idempotency_key TEXT NOT NULL UNIQUE,
+        status TEXT NOT NULL DEFAULT 'queued',
+        result TEXT,
+        error TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL DEFAULT 3,
+        run_after REAL NOT NULL,
+        created_at REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL,
+        heartbeat_at REAL,
+        locked_by TEXT
+    )
+    """)
+    # Claiming scans queued jobs in order; the partial index stays small.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queued ON jobs (run_after, id) WHERE status = 'queued'")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_running ON jobs (heartbeat_at) WHERE status = 'running'")
+
+def _analytics_rollups(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS analytics_daily (
+        metric TEXT,
+        day TEXT,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (metric, day)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS analytics_ratings (
+        rating INTEGER PRIMARY KEY,
+        count INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS analytics_funnel (
+        status TEXT PRIMARY KEY,
+        count INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    # Days from a candidate's first resume to their offer, per offer day.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS analytics_time_to_offer (
+        day TEXT PRIMARY KEY,
+        offers INTEGER NOT NULL DEFAULT 0,
+        total_days REAL NOT NULL DEFAULT 0
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_analytics_snapshots_metric ON analytics_snapshots (metric, timestamp DESC)")
+    for table, metric in ANALYTICS_DAILY.items():
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_analytics_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO analytics_daily (metric, day, count) VALUES ('{metric}', COALESCE(substr(new.timestamp, 1, 10), ''), 1)
+            ON CONFLICT (metric, day) DO UPDATE SET count = count + 1;
+        END
+        """)
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_analytics_ad AFTER DELETE ON {table} BEGIN
+            UPDATE analytics_daily SET count = count - 1 WHERE metric = '{metric}' AND day = COALESCE(substr(old.timestamp, 1, 10), '');
+        END
+        """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS feedback_ratings_ai AFTER INSERT ON feedback_surveys BEGIN
+        INSERT INTO analytics_ratings (rating, count) VALUES (new.rating, 1)
+        ON CONFLICT (rating) DO UPDATE SET count = count + 1;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS feedback_ratings_ad AFTER DELETE ON feedback_surveys BEGIN
+        UPDATE analytics_ratings SET count = count - 1 WHERE rating = old.rating;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS resumes_funnel_ai AFTER INSERT ON resumes BEGIN
+        INSERT INTO analytics_funnel (status, count) VALUES (COALESCE(new.status, 'New'), 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS resumes_funnel_ad AFTER DELETE ON resumes BEGIN
+        UPDATE analytics_funnel SET count = count - 1 WHERE status = COALESCE(old.status, 'New');
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS resumes_funnel_au AFTER UPDATE OF status ON resumes
+    WHEN COALESCE(old.status, 'New') IS NOT COALESCE(new.status, 'New') BEGIN
+        UPDATE analytics_funnel SET count = count - 1 WHERE status = COALESCE(old.status, 'New');
+        INSERT INTO analytics_funnel (status, count) VALUES (COALESCE(new.status, 'New'), 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """)
+    # One indexed lookup (idx_resumes_email) per offer.
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS onboarding_time_to_offer_ai AFTER INSERT ON onboarding_logs
+    WHEN (SELECT MIN(timestamp) FROM resumes WHERE email = new.email AND new.email != '') IS NOT NULL BEGIN
+        INSERT INTO analytics_time_to_offer (day, offers, total_days)
+        VALUES (COALESCE(substr(new.timestamp, 1, 10), ''), 1, julianday(new.timestamp) - julianday((SELECT MIN(timestamp) FROM resumes WHERE email = new.email)))
+        ON CONFLICT (day) DO UPDATE SET offers = offers + 1, total_days = total_days + excluded.total_days;
+    END
+    """)
+    # Backfill from the rows already there.
+    fill_rollups(conn)
+
+def _scheduling(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS interviewers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+        email TEXT
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS interviews (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        candidate_name TEXT,
+        candidate_email TEXT,
+        position TEXT,
+        interviewer_id INTEGER REFERENCES interviewers (id),
+        start_min INTEGER NOT NULL,
+        end_min INTEGER NOT NULL,
+        status TEXT NOT NULL DEFAULT 'scheduled',
+        provider TEXT,
+        external_id TEXT,
+        join_url TEXT,
+        timestamp TEXT
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_interviews_candidate ON interviews (candidate_email, start_min)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_interviews_timestamp ON interviews (timestamp DESC, id DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_interviews_start ON interviews (start_min)")
+    # 32-bit integer coordinates: exact for minute timestamps until 6053.
+    conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS interviews_rtree USING rtree_i32 (id, start_min, end_min, interviewer_lo, interviewer_hi)")
+    # Only scheduled interviews live in the R*Tree.
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS interviews_rtree_ai AFTER INSERT ON interviews WHEN new.status = 'scheduled' BEGIN
+        INSERT INTO interviews_rtree VALUES (new.id, new.start_min, new.end_min, new.interviewer_id, new.interviewer_id);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS interviews_rtree_ad AFTER DELETE ON interviews BEGIN
+        DELETE FROM interviews_rtree WHERE id = old.id;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS interviews_rtree_au AFTER UPDATE OF start_min, end_min, interviewer_id, status ON interviews BEGIN
+        DELETE FROM interviews_rtree WHERE id = old.id;
+        INSERT INTO interviews_rtree SELECT new.id, new.start_min, new.end_min, new.interviewer_id, new.interviewer_id
+        WHERE new.status = 'scheduled';
+    END
+    """)
+
+def _conversation_sessions(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS mira_sessions (
+        id TEXT PRIMARY KEY,
+        title TEXT,
+        summary TEXT NOT NULL DEFAULT '',
+        summarized_through INTEGER NOT NULL DEFAULT 0,
+        refs TEXT NOT NULL DEFAULT '',
+        created_at TEXT,
+        updated_at TEXT
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_mira_sessions_updated ON mira_sessions (updated_at DESC)")
+    for column, decl in (("session_id", "TEXT"), ("prompt_tokens", "INTEGER"), ("completion_tokens", "INTEGER"), ("context_tokens", "INTEGER")):
+        _add_column(conn, "mira_logs", column, decl)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_mira_logs_session ON mira_logs (session_id, id) WHERE session_id IS NOT NULL")
+
+def _knowledge_index(conn):
+    _add_column(conn, "mira_logs", "retrieval_ms", "REAL")
+    conn.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
+        title, body, kind UNINDEXED, timestamp UNINDEXED,
+        tokenize="unicode61 remove_diacritics 2 tokenchars '+#'"
+    )
+    """)
+    for kind, code, table, title, body in KNOWLEDGE_SOURCES:
+        new_title, new_body = title.format(t="new"), body.format(t="new")
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_knowledge_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO knowledge_fts (rowid, title, body, kind, timestamp) VALUES (new.id * 4 + {code}, {new_title}, {new_body}, '{kind}', new.timestamp);
+        END
+        """)
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_knowledge_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM knowledge_fts WHERE rowid = old.id * 4 + {code};
+        END
+        """)
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_knowledge_au AFTER UPDATE ON {table} BEGIN
+            DELETE FROM knowledge_fts WHERE rowid = old.id * 4 + {code};
+            INSERT INTO knowledge_fts (rowid, title, body, kind, timestamp) VALUES (new.id * 4 + {code}, {new_title}, {new_body}, '{kind}', new.timestamp);
+        END
+        """)
+    fill_knowledge_index(conn)
+
+def _required_timestamps(conn):
+    # Keyset pagination seeks on (timestamp, id); a NULL timestamp never
+    # compares, so those rows could not be paged past. Old rows without one
+    # sort as the oldest, and new ones must carry a timestamp.
+    for table in TIMESTAMPED_TABLES:
+        conn.execute(f"UPDATE {table} SET timestamp = '' WHERE timestamp IS NULL")
+        for event in ("INSERT", "UPDATE OF timestamp"):
+            name = f"{table}_timestamp_{event.split()[0].lower()}"
+            conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name} BEFORE {event} ON {table}
+            WHEN new.timestamp IS NULL BEGIN
+                SELECT RAISE(ABORT, '{table}.timestamp may not be NULL');
+            END
+            """)
+
+def _analytics_ratings_unique(conn):
+    # analytics_ratings.rating was an INTEGER PRIMARY KEY, i.e. the rowid, so
+    # a survey without a rating got a bucket under a made-up number. It is
+    # now an ordinary column, and unrated surveys are not counted.
+    conn.execute("DROP TRIGGER IF EXISTS feedback_ratings_ai")
+    conn.execute("DROP TRIGGER IF EXISTS feedback_ratings_ad")
+    conn.execute("DROP TABLE IF EXISTS analytics_ratings")
+    conn.execute("""
+    CREATE TABLE analytics_ratings (
+        rating INTEGER NOT NULL UNIQUE,
+        count INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    conn.execute("""
+    CREATE TRIGGER feedback_ratings_ai AFTER INSERT ON feedback_surveys
+    WHEN new.rating IS NOT NULL BEGIN
+        INSERT INTO analytics_ratings (rating, count) VALUES (new.rating, 1)
+        ON CONFLICT (rating) DO UPDATE SET count = count + 1;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER feedback_ratings_ad AFTER DELETE ON feedback_surveys
+    WHEN old.rating IS NOT NULL BEGIN
+        UPDATE analytics_ratings SET count = count - 1 WHERE rating = old.rating;
+    END
+    """)
+    conn.execute(RATINGS_FILL)
+
+def _interview_calendar_errors(conn):
+    # Why the calendar event for an interview could not be created, if it
+    # could not; the booking itself stands.
+    _add_column(conn, "interviews", "calendar_error", "TEXT")
+
+def _snapshot_values_real(conn):
+    # analytics_snapshots.value holds averages (avg_rating, avg_days_to_offer)
+    # as well as counts. Rebuilt like step 3, since SQLite cannot change a
+    # column type in place.
+    if _columns(conn, "analytics_snapshots").get("value") == "REAL":
+        return
+    conn.execute("ALTER TABLE analytics_snapshots RENAME TO analytics_snapshots_old")
+    conn.execute("""
+    CREATE TABLE analytics_snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        metric TEXT,
+        value REAL,
+        timestamp TEXT
+    )
+    """)
+    conn.execute("""
+        INSERT INTO analytics_snapshots (id, metric, value, timestamp)
+        SELECT id, metric, value, timestamp FROM analytics_snapshots_old
+    """)
+    conn.execute("DROP TABLE analytics_snapshots_old")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_analytics_snapshots_metric ON analytics_snapshots (metric, timestamp DESC)")
+
+def _scoring_terms(conn):
+    # Term counts per resume and document frequencies for the scoring
+    # pre-filter, so a run only tokenizes resumes it has not seen before. A
+    # deleted or edited resume takes its terms back out; an edited one is
+    # re-tokenized on the next run.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS scoring_docs (
+        resume_id INTEGER PRIMARY KEY,
+        terms TEXT NOT NULL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS scoring_terms (
+        term TEXT PRIMARY KEY,
+        df INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    """)
+    forget = """
+        UPDATE scoring_terms SET df = df - 1
+        WHERE term IN (SELECT key FROM json_each((SELECT terms FROM scoring_docs WHERE resume_id = old.id)));
+        DELETE FROM scoring_docs WHERE resume_id = old.id;
+    """
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS resumes_scoring_ad AFTER DELETE ON resumes BEGIN {forget} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS resumes_scoring_au AFTER UPDATE OF skills, experience ON resumes BEGIN {forget} END")
+
+MIGRATIONS = [
+    (1, "base tables", _base_tables),
+    (2, "resume pipeline columns", _resume_pipeline_columns),
+    (3, "onboarding_logs.salary as REAL", _onboarding_salary_real),
+    (4, "hot query indexes", _hot_query_indexes),
+    (5, "resume full-text index", _resume_fts),
+    (6, "resume content hash and parse cache", _resume_store),
+    (7, "LLM response cache", _llm_cache),
+    (8, "mira_logs latency columns", _mira_log_latency_columns),
+    (9, "resume scores per job description", _resume_scores),
+    (10, "resume sections and contact lists", _resume_detail_columns),
+    (11, "background job queue", _job_queue),
+    (12, "offer letter documents", _onboarding_documents),
+    (13, "analytics rollups", _analytics_rollups),
+    (14, "interviews and interviewer time index", _scheduling),
+    (15, "conversation sessions", _conversation_sessions),
+    (16, "Ask MIRA retrieval index", _knowledge_index),
+    (17, "required timestamps for keyset pagination", _required_timestamps),
+    (18, "analytics_ratings keyed by a plain rating column", _analytics_ratings_unique),
+    (19, "interview calendar errors", _interview_calendar_errors),
+    (20, "analytics_snapshots.value as REAL", _snapshot_values_real),
+    (21, "scoring term index", _scoring_terms),
+]
+
+# --- ENGINE ---
+def schema_version(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT,
+        applied_at TEXT
+    )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def migrate(conn):
+    # Returns the list of versions applied. BEGIN IMMEDIATE takes the write
+    # lock before re-reading the version, so two processes starting at the
+    # same time cannot apply the same step twice.
+    if conn.in_transaction:
+        conn.commit()
+    applied = []
+    for version, description, step in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version > schema_version(conn):
+                step(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                    (version, description, datetime.now().isoformat())
+                )
+                applied.append(version)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return applied
+
+@st.cache_resource
+def ensure_schema(db_file=DB_FILE):
+    # Cached so migrations are checked once per process, not on every rerun.
+    return migrate(get_connection(db_file))
@@ -0,0 +1,158 @@
+import csv
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from mira_db import insert_onboarding_logs
+from mira_storage import get_storage
+
+# Offer letters rendered from a .docx template. The template is unpacked and
+# styled once; each letter is a placeholder substitution on the cached
+# document.xml plus a re-zip, all in memory. Finished letters are stored in
+# onboarding_logs.document so downloads never touch the filesystem.
+
+TEMPLATE_PATH = "templates/offer_letter.docx"   # optional; a built-in layout is used if missing
+FIELDS = ("name", "email", "position", "start_date", "salary")
+REQUIRED_FIELDS = ("name", "position", "start_date", "salary")
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+MAX_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# --- TEMPLATE ---
+def _builtin_template():
+    # The original letter layout with {{placeholders}}. Font size is set on
+    # the Normal style once instead of on every run of every letter.
+    from docx import Document
+    from docx.shared import Pt
+
+    doc = Document()
+    doc.styles["Normal"].font.size = Pt(11)
+    doc.add_heading("Offer Letter", 0)
+    doc.add_paragraph("Dear {{name}},")
+    doc.add_paragraph("We are excited to offer you the position of {{position}}. Your start date will be {{start_date}}, with a starting salary of ${{salary}}.")
+    doc.add_paragraph("Please let us know if you have any questions.")
+    doc.add_paragraph("Sincerely,\nHR Team")
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+@lru_cache(maxsize=4)
+def _load_template(path, mtime):
+    # `mtime` is only part of the cache key, so editing the template on disk
+    # is picked up on the next render.
+    if path:
+        with open(path, "rb") as f:
+            data = f.read()
+    else:
+        data = _builtin_template()
+    # Everything but document.xml is compressed once into a base archive;
+    # each letter copies it and appends its own document.xml.
+    base = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(base, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            if info.filename == "word/document.xml":
+                xml = src.read(info).decode("utf-8")
+            else:
+                dst.writestr(info, src.read(info), zipfile.ZIP_DEFLATED)
+    missing = set(REQUIRED_FIELDS) - set(PLACEHOLDER_RE.findall(xml))
+    if missing:
+        # Word splits text into runs wherever formatting or spell-check
+        # state changes; a placeholder cut in half cannot be filled.
+        raise ValueError(f"Offer template is missing placeholders (or they are split across runs): {sorted(missing)}")
+    return base.getvalue(), xml
+
+def load_template(path=TEMPLATE_PATH):
+    if path and os.path.exists(path):
+        return _load_template(path, os.path.getmtime(path))
+    return _load_template(None, None)
+
+# --- RENDERING ---
+def _format_salary(salary):
+    try:
+        return f"{float(salary):,.0f}"
+    except (TypeError, ValueError):
+        return str(salary)
+
+def render_offer(fields, template=None):
+    # Returns the .docx bytes for one letter.
+    base, xml = template or load_template()
+    values = {**{k: str(fields.get(k, "")) for k in FIELDS}, "salary": _format_salary(fields.get("salary"))}
+    filled = PLACEHOLDER_RE.sub(lambda m: escape(values.get(m.group(1), m.group(0))), xml)
+    buf = io.BytesIO(base)
+    with zipfile.ZipFile(buf, "a", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("word/document.xml", filled)
+    return buf.getvalue()
+
+def offer_filename(name):
+    return f"{(name or 'candidate').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d%H%M%S')}.docx"
+
+def generate_offers(hires, workers=MAX_WORKERS):
+    # Renders every letter on a thread pool (zlib releases the GIL while
+    # compressing) and records them all in one transaction. Returns the new
+    # onboarding_logs ids in input order.
+    template = load_template()
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(hires)))) as pool:
+        documents = list(pool.map(lambda h: render_offer(h, template), hires))
+    return insert_onboarding_logs([
+        (h["name"], h.get("email", ""), h["position"], str(h["start_date"]), h["salary"], offer_filename(h["name"]), doc)
+        for h, doc in zip(hires, documents)
+    ])
+
+def generate_offer(name, email, position, start_date, salary):
+    return generate_offers([{"name": name, "email": email, "position": position, "start_date": start_date, "salary": salary}])[0]
+
+# --- CSV OF HIRES ---
+def read_hires_csv(file):
+    # Returns (hires, errors). Columns match FIELDS; header case and
+    # surrounding spaces are ignored.
+    text = file.read()
+    if isinstance(text, bytes):
+        text = text.decode("utf-8-sig")
+    reader = csv.DictReader(io.StringIO(text))
+    headers = {h: (h or "").strip().lower() for h in reader.fieldnames or []}
+    missing = set(REQUIRED_FIELDS) - set(headers.values())
+    if missing:
+        return [], [f"Missing columns: {', '.join(sorted(missing))}"]
+
+    hires, errors = [], []
+    for line, row in enumerate(reader, start=2):
+        hire = {headers[k]: (v or "").strip() for k, v in row.items() if k in headers}
+        try:
+            hire["salary"] = float(hire["salary"].replace(",", "").lstrip("$"))
+        except ValueError:
+            errors.append(f"Line {line}: salary '{hire['salary']}' is not a number")
+            continue
+        if not hire["name"] or not hire["position"]:
+            errors.append(f"Line {line}: name and position are required")
+            continue
+        hires.append({k: hire.get(k, "") for k in FIELDS})
+    return hires, errors
+
+# --- DOWNLOADS ---
+def offer_document(log_id):
+    # Returns (filename, document), or (None, None) if there is no letter.
+    # Letters generated before documents were stored in the table only have
+    # the path of the .docx saved under onboarding_docs/.
+    row = get_storage().execute("SELECT filepath, document FROM onboarding_logs WHERE id = ?", (log_id,)).fetchone()
+    if not row or not row[0] and not row[1]:
+        return None, None
+    filepath, document = row
+    if document is None and filepath and os.path.isfile(filepath):
+        with open(filepath, "rb") as f:
+            document = f.read()
+    return (os.path.basename(filepath or ""), document) if document else (None, None)
+
+def offers_zip(log_ids):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as z:   # .docx is already compressed
+        for log_id in log_ids:
+            filename, document = offer_document(log_id)
+            if document:
+                z.writestr(f"{log_id}_{filename}", document)
+    return buf.getvalue()
@@ -0,0 +1,87 @@
+import streamlit as st
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+# --- QUERIES ---
+def fetch_page(conn, table, columns, limit, cursor=None):
+    # Keyset pagination on (timestamp, id), newest first. The cursor is the
+    # (timestamp, id) of the last row on the previous page, so every page costs
+    # the same no matter how deep into the table it is. Timestamps are
+    # never NULL (migration 17); a cursor from an older page may still be.
+    sql = f"SELECT {', '.join(columns)}, timestamp, id FROM {table}"
+    params = []
+    if cursor:
+        sql += " WHERE (timestamp, id) < (?, ?)"
+        params.extend((cursor[0] or "", cursor[1]))
+    sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+    params.append(limit + 1)
+
+    rows = conn.execute(sql, params).fetchall()
+    next_cursor = (rows[limit - 1][-2], rows[limit - 1][-1]) if len(rows) > limit else None
+    return [r[:-2] for r in rows[:limit]], next_cursor
+
+def estimate_count(conn, table):
+    # MAX(id) is an O(1) lookup on the rowid b-tree; it only over-counts by the
+    # number of deleted rows, which is fine for a "≈ N rows" label.
+    return conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+
+def table_fetcher(conn, table, columns):
+    return lambda cursor, limit: fetch_page(conn, table, columns, limit, cursor)
+
+def offset_fetcher(query):
+    # For ranked results (e.g. full-text search) there is no stable sort key to
+    # seek on, so the cursor is a plain offset. `query(limit, offset)` returns rows.
+    def fetch(cursor, limit):
+        offset = cursor or 0
+        rows = query(limit + 1, offset)
+        return rows[:limit], (offset + limit if len(rows) > limit else None)
+    return fetch
+
+# --- COMPONENT ---
+def _reset(key):
+    st.session_state[f"{key}_cursors"] = [None]
+
+def paginated_list(key, fetch, render_row, total=None, empty_message="Nothing here yet.", reset_on=None):
+    # `fetch(cursor, limit)` returns (rows, next_cursor). Only the current page
+    # is fetched and rendered; the cursor stack in session_state lets the user
+    # step back to newer pages without re-reading the ones in between.
+    # Changing `reset_on` (e.g. the search text) starts again from page one.
+    if st.session_state.get(f"{key}_reset_on") != reset_on:
+        st.session_state[f"{key}_reset_on"] = reset_on
+        _reset(key)
+    cursors = st.session_state.setdefault(f"{key}_cursors", [None])
+
+    limit = st.selectbox(
+        "Rows per page", PAGE_SIZES, key=f"{key}_page_size",
+        on_change=_reset, args=(key,)
+    )
+    rows, next_cursor = fetch(cursors[-1], limit)
+
+    if not rows:
+        if len(cursors) > 1:
+            _reset(key)
+            st.rerun()
+        st.info(empty_message)
+        return
+
+    label = f"Page {len(cursors)} · showing {len(rows)}"
+    if total is not None:
+        label += f" of ≈{total}"
+    st.caption(label)
+
+    for row in rows:
+        render_row(row)
+
+    col1, col2, _ = st.columns([1, 1, 4])
+    if len(cursors) > 1 and col1.button("⬅️ Newer", key=f"{key}_prev"):
+        cursors.pop()
+        st.rerun()
+    if next_cursor is not None and col2.button("Load more ➡️", key=f"{key}_next"):
+        cursors.append(next_cursor)
+        st.rerun()
+
+def paginate_table(key, conn, table, columns, render_row, empty_message="Nothing here yet."):
+    paginated_list(
+        key, table_fetcher(conn, table, columns), render_row,
+        total=estimate_count(conn, table), empty_message=empty_message
+    )
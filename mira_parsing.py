@@ -0,0 +1,271 @@
+import functools
+import io
+import re
+from dataclasses import dataclass
+
+from mira_metrics import timed
+
+# --- TEXT EXTRACTION ---
+# Extractors yield text in chunks (a page at a time for PDFs) so parsing can
+# stop once it has what it needs. python-docx and the PDF backends are
+# imported on first use; they are only needed when a resume is uploaded.
+def iter_text_from_pdf(file, parallel=True):
+    from mira_pdf import iter_pdf_pages
+    return iter_pdf_pages(file, parallel=parallel)
+
+def iter_text_from_docx(file):
+    from docx import Document
+
+    yield "\n".join([para.text for para in Document(file).paragraphs])
+
+def iter_text(file, filename, parallel=True):
+    ext = filename.split(".")[-1].lower()
+    return iter_text_from_pdf(file, parallel) if ext == "pdf" else iter_text_from_docx(file)
+
+@timed("parser")
+def extract_text_from_pdf(file):
+    return "\n".join(iter_text_from_pdf(file))
+
+@timed("parser")
+def extract_text_from_docx(file):
+    return "\n".join(iter_text_from_docx(file))
+
+def extract_text(file, filename):
+    return "\n".join(iter_text(file, filename))
+
+# --- RESUME PARSING ---
+# Section headers are whole lines in any case ("Skills", "WORK EXPERIENCE",
+# "Skills & Tools"), optionally followed by content after a colon or dash
+# ("Summary: ...", "Experience - 5 years"). Keys are the section names on
+# ResumeDetails; values are the header spellings that open them.
+SECTION_HEADERS = {
+    "skills": ("skills", "technical skills", "core skills", "key skills", "core competencies"),
+    "experience": ("experience", "work experience", "professional experience", "employment history", "work history"),
+    "education": ("education", "academic background"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses & certifications", "licenses and certifications"),
+    "summary": ("summary", "professional summary", "profile", "objective", "about me"),
+}
+# Parsing stops early once contact fields are known and these are closed.
+REQUIRED_SECTIONS = ("skills", "experience")
+MAX_SECTION_CHARS = 4000
+
+# Python's re retries a pattern at every offset unless it starts with a
+# literal, and even a character class is only scanned at ~100 MB/s, so the
+# scans below use str.find where they can: "@" for emails, the URL prefixes
+# for links and a translated copy of the text for the characters that can
+# start a phone number. Section headers are anchored on a newline.
+EMAIL_DOMAIN_RE = re.compile(r"@[\w-]+(?:\.[\w-]+)+")
+EMAIL_LOCAL_RE = re.compile(r"[\w.+-]{1,64}\Z")
+PHONE_CANDIDATE_RE = re.compile(r"[+(0-9][0-9()+.\s-]{8,18}[0-9]")
+PHONE_RUN_RE = re.compile(r"[0-9()+.\s-]*")
+PHONE_START = str.maketrans(dict.fromkeys("0123456789+(", "0"))
+PHONE_RE = re.compile(r"(?:\+\d{1,2}\s)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+# Link prefixes grouped by a substring they share, so the text is searched
+# once per group rather than once per prefix. A single-character search is
+# a memchr and several times faster than any longer one.
+LINK_ANCHORS = {
+    "/": ("http://", "https://", "linkedin.com/", "github.com/", "gitlab.com/"),
+    "www.": ("www.",),
+}
+LINK_TAIL_RE = re.compile(r"[^\s<>()]+")
+# A line that may be a section header: a short run of words, then the end of
+# the line or a separator (":", "-", "|", en/em dash) with content after it.
+# Which section it opens, if any, is a dict lookup in _header_lookup.
+HEADER_LINE_RE = re.compile(r"\n[ \t]*([A-Za-z][A-Za-z &/]{0,40}?)[ \t]*(?:[:|\-\u2013\u2014]|$)", re.M)
+HEADER_JOIN_RE = re.compile(r"\s*(?:&|/|\band\b)\s*")
+HEADER_MAX_WORDS = 4
+NAME_RE = re.compile(r"^[ \t]*(\S[^\n]*?)[ \t]*$", re.M)
+
+# Stored in resumes and resume_parse_cache in this order.
+DETAIL_COLUMNS = (
+    "name", "email", "phone", "skills", "experience",
+    "education", "certifications", "summary", "emails", "phones", "links",
+)
+
+@dataclass(slots=True)
+class ResumeDetails:
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    skills: str = ""
+    experience: str = ""
+    education: str = ""
+    certifications: str = ""
+    summary: str = ""
+    emails: tuple = ()
+    phones: tuple = ()
+    links: tuple = ()
+
+    def row(self):
+        # Values for DETAIL_COLUMNS; multi-valued fields are newline-joined.
+        return (
+            self.name, self.email, self.phone, self.skills, self.experience,
+            self.education, self.certifications, self.summary,
+            "\n".join(self.emails), "\n".join(self.phones), "\n".join(self.links),
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        row = [v or "" for v in row]
+        return cls(*row[:8], *(tuple(v.split("\n")) if v else () for v in row[8:11]))
+
+@functools.lru_cache(maxsize=8)
+def _header_lookup(sections):
+    # Lower-cased, single-spaced spelling -> section name.
+    return {" ".join(n.lower().split()): section for section, names in sections for n in names}
+
+def header_section(phrase, lookup):
+    # Case and spacing are ignored. "SKILLS & TOOLS" and "Skills/Technologies"
+    # fall back to the words before the "&", "/" or "and"; longer phrases
+    # are sentences, not headers.
+    phrase = phrase.lower()
+    section = lookup.get(phrase)
+    if section is None:
+        phrase = " ".join(phrase.split())
+        section = lookup.get(phrase)
+    if section is None and phrase.count(" ") < HEADER_MAX_WORDS:
+        section = lookup.get(HEADER_JOIN_RE.split(phrase, 1)[0])
+    return section
+
+def find_emails(text):
+    found = []
+    pos = text.find("@")
+    while pos != -1:
+        m = EMAIL_DOMAIN_RE.match(text, pos)
+        if m:
+            local = EMAIL_LOCAL_RE.search(text, max(0, pos - 64), pos)
+            if local:
+                found.append(local.group() + m.group())
+        pos = text.find("@", m.end() if m else pos + 1)
+    return found
+
+def find_links(text):
+    # "https://www.linkedin.com/in/x" matches three prefixes; keep the
+    # outermost match only.
+    spans = []
+    for anchor, prefixes in LINK_ANCHORS.items():
+        pos = text.find(anchor)
+        while pos != -1:
+            for prefix in prefixes:
+                start = pos - prefix.index(anchor)
+                if start >= 0 and text.startswith(prefix, start):
+                    m = LINK_TAIL_RE.match(text, start + len(prefix))
+                    if m:
+                        spans.append((start, -m.end(), text[start:m.end()]))
+            pos = text.find(anchor, pos + len(anchor))
+    spans.sort()
+    found, last_end = [], -1
+    for start, neg_end, link in spans:
+        if start >= last_end:
+            found.append(link.rstrip(".,;:"))
+            last_end = -neg_end
+    return found
+
+def find_phones(text):
+    # str.find over a copy with every possible first character mapped to
+    # "0" jumps straight to the next candidate. When none starts there, no
+    # later offset in the same run of phone characters can match either.
+    marked = text.translate(PHONE_START)
+    found = []
+    pos = marked.find("0")
+    while pos != -1:
+        m = PHONE_CANDIDATE_RE.match(text, pos)
+        if m:
+            found.extend(PHONE_RE.findall(m.group()))
+            end = m.end()
+        else:
+            end = PHONE_RUN_RE.match(text, pos + 1).end()
+        pos = marked.find("0", end)
+    return found
+
+class SectionTokenizer:
+    # Single pass over the text, fed one chunk (page) at a time: every chunk
+    # is scanned once by each precompiled regex and its section bodies are
+    # appended to per-section buffers.
+
+    def __init__(self, sections=SECTION_HEADERS, required=REQUIRED_SECTIONS):
+        self.sections = sections
+        self.required = required
+        self._headers = _header_lookup(tuple((k, tuple(v)) for k, v in sections.items()))
+        self._parts = {key: [] for key in sections}
+        self._sizes = dict.fromkeys(sections, 0)
+        self._current = None
+        self._closed = set()
+        self._emails, self._phones, self._links = {}, {}, {}
+        self.name = ""
+
+    def _append(self, text):
+        if self._current is None or self._sizes[self._current] >= MAX_SECTION_CHARS:
+            return
+        text = text.strip()
+        if text:
+            self._parts[self._current].append(text)
+            self._sizes[self._current] += len(text)
+
+    def feed(self, chunk):
+        if not self.name:
+            m = NAME_RE.search(chunk)
+            self.name = m.group(1) if m else ""
+        # dicts keep first-seen order and drop repeats
+        self._emails.update(dict.fromkeys(find_emails(chunk)))
+        self._phones.update(dict.fromkeys(find_phones(chunk)))
+        self._links.update(dict.fromkeys(find_links(chunk)))
+
+        # Headers match from the preceding newline; the leading one lets a
+        # header on the chunk's first line match too.
+        chunk = "\n" + chunk
+        pos = 0
+        for m in HEADER_LINE_RE.finditer(chunk):
+            section = header_section(m.group(1), self._headers)
+            if section is None:
+                continue
+            self._append(chunk[pos:m.start()])
+            if self._current is not None:
+                self._closed.add(self._current)
+            self._current = section
+            pos = m.end()
+        self._append(chunk[pos:])
+
+    def complete(self):
+        return bool(self.name and self._emails and self._phones
+                    and all(s in self._closed for s in self.required))
+
+    def result(self):
+        sections = {key: "\n".join(parts)[:MAX_SECTION_CHARS] for key, parts in self._parts.items()}
+        emails, phones = tuple(self._emails), tuple(self._phones)
+        return ResumeDetails(
+            name=self.name,
+            email=emails[0] if emails else "",
+            phone=phones[0] if phones else "",
+            emails=emails,
+            phones=phones,
+            links=tuple(self._links),
+            **{k: v for k, v in sections.items() if k in ResumeDetails.__slots__},
+        )
+
+def extract_details(text, sections=SECTION_HEADERS):
+    tokenizer = SectionTokenizer(sections)
+    tokenizer.feed(text or "")
+    return tokenizer.result()
+
+def extract_details_from_chunks(chunks, sections=SECTION_HEADERS):
+    # Returns (text_read, details), stopping at the first chunk after which
+    # the contact fields are known and the required sections have ended.
+    # Closing the generator stops extraction.
+    tokenizer = SectionTokenizer(sections)
+    read = []
+    try:
+        for chunk in chunks:
+            read.append(chunk)
+            tokenizer.feed(chunk)
+            if tokenizer.complete():
+                break
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+    return "\n".join(read), tokenizer.result()
+
+@timed("parser")
+def parse_resume(data, filename, parallel=True):
+    return extract_details_from_chunks(iter_text(io.BytesIO(data), filename, parallel))
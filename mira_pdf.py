@@ -0,0 +1,171 @@
+import io
+import itertools
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+
+# PDF text extraction engine. Pages come out of a generator one at a time so
+# callers can stop reading as soon as they have what they need. pypdfium2 is
+# the fast path; pdfplumber is the fallback when pdfium cannot open a file or
+# finds no text layer where pdfplumber might. Nothing here does OCR.
+
+MAX_BYTES = 20 * 1024 * 1024   # larger uploads are rejected outright
+MAX_PAGES = 40                 # pages past this are never read
+MAX_CHARS = 200_000            # total text returned per document
+PARALLEL_MIN_PAGES = 12        # smaller documents are read inline
+PAGES_PER_CHUNK = 4
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+class PDFTooLarge(ValueError):
+    pass
+
+# --- BACKENDS ---
+class PDFBackend(ABC):
+    name = None
+
+    @abstractmethod
+    def page_count(self, data):
+        ...
+
+    @abstractmethod
+    def pages(self, data, start, stop):
+        # Yields the text of pages [start, stop), each extracted exactly once.
+        ...
+
+class PdfiumBackend(PDFBackend):
+    name = "pdfium"
+
+    def page_count(self, data):
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(data)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def pages(self, data, start, stop):
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(data)
+        try:
+            for i in range(start, stop):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n")
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+
+class PdfplumberBackend(PDFBackend):
+    name = "pdfplumber"
+
+    def page_count(self, data):
+        import pdfplumber
+
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            return len(pdf.pages)
+
+    def pages(self, data, start, stop):
+        import pdfplumber
+
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for page in pdf.pages[start:stop]:
+                yield page.extract_text() or ""
+                page.flush_cache()
+
+# Tried in insertion order; register_backend() adds or replaces one.
+BACKENDS = {b.name: b for b in (PdfiumBackend(), PdfplumberBackend())}
+
+def register_backend(backend):
+    BACKENDS[backend.name] = backend
+
+def _open(data, backend=None):
+    # Returns (backend, page_count, first_page_text) for the first backend
+    # that can read the file and finds a text layer on page one, else for the
+    # first backend that could open it at all. Page one is not read again.
+    names = [backend] if backend else list(BACKENDS)
+    opened, last_error = None, None
+    for name in names:
+        impl = BACKENDS[name]
+        try:
+            count = impl.page_count(data)
+            first = "\n".join(impl.pages(data, 0, 1)) if count else ""
+        except Exception as e:
+            last_error = e
+            continue
+        if first.strip():
+            return impl, count, first
+        opened = opened or (impl, count, first)
+    if opened:
+        return opened
+    raise ValueError(f"Could not read PDF: {last_error}")
+
+# --- PAGE-PARALLEL READING ---
+_pool = None
+_pool_lock = threading.Lock()
+
+def _page_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+        return _pool
+
+def _extract_chunk(name, data, start, stop):
+    return list(BACKENDS[name].pages(data, start, stop))
+
+def _parallel_pages(impl, data, start, count):
+    # Keeps MAX_WORKERS chunks in flight and yields pages in order. Closing
+    # the generator early cancels chunks that have not started yet.
+    pool = _page_pool()
+    chunks = iter(range(start, count, PAGES_PER_CHUNK))
+    pending = []
+    try:
+        while True:
+            while len(pending) < MAX_WORKERS:
+                start = next(chunks, None)
+                if start is None:
+                    break
+                pending.append(pool.submit(_extract_chunk, impl.name, data, start, min(start + PAGES_PER_CHUNK, count)))
+            if not pending:
+                return
+            yield from pending.pop(0).result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+# --- PUBLIC API ---
+def iter_pdf_pages(data, backend=None, parallel=True, max_pages=MAX_PAGES, max_chars=MAX_CHARS):
+    # Yields page texts. `data` is bytes or a binary file object.
+    if not isinstance(data, (bytes, bytearray)):
+        data = data.read()
+    if len(data) > MAX_BYTES:
+        raise PDFTooLarge(f"PDF is {len(data) // (1024 * 1024)} MiB; the limit is {MAX_BYTES // (1024 * 1024)} MiB")
+    data = bytes(data)
+
+    impl, count, first = _open(data, backend)
+    count = min(count, max_pages)
+    if parallel and MAX_WORKERS > 1 and count >= PARALLEL_MIN_PAGES:
+        pages = _parallel_pages(impl, data, 1, count)
+    else:
+        pages = impl.pages(data, 1, count)
+
+    remaining = max_chars
+    try:
+        for text in itertools.chain([first], pages):
+            if not text.strip():
+                continue
+            yield text[:remaining]
+            remaining -= len(text)
+            if remaining <= 0:
+                return
+    finally:
+        pages.close()
+
+def extract_pdf_text(data, **kwargs):
+    return "\n".join(iter_pdf_pages(data, **kwargs))
@@ -0,0 +1,181 @@
+import argparse
+import re
+import time
+from datetime import datetime, timedelta
+
+from mira_cache import shared_cache
+from mira_db import DB_FILE, get_connection, get_read_connection
+from mira_migrations import KNOWLEDGE_SOURCES, fill_knowledge_index, migrate
+from mira_search import _quote
+
+# Retrieval for Ask MIRA. Before a question reaches the model, it is run as
+# indexed local searches - resumes_fts for candidates, knowledge_fts for job
+# descriptions, feedback and coaching notes - and only the top few matches
+# go into the prompt, as one-line snippets with record ids. Time phrases
+# ("this month", "last 7 days") become timestamp filters and words like
+# "candidates" or "feedback" pick which tables are searched.
+
+TOP_K = 6                 # snippets sent to the model
+SNIPPET_TOKENS = 14       # words around the match in each snippet
+CACHE_TTL = 300           # seconds
+# Sources in knowledge_fts: kind -> (code, table); see migration 16.
+SOURCES = {kind: (code, table) for kind, code, table, _, _ in KNOWLEDGE_SOURCES}
+INTENTS = {
+    "resume": {"candidate", "candidates", "resume", "resumes", "applicant", "applicants", "applied", "hire", "hires", "people"},
+    "jd": {"job", "jobs", "role", "roles", "position", "positions", "jd", "jds", "opening", "openings", "description", "descriptions"},
+    "feedback": {"feedback", "rating", "ratings", "rated", "survey", "surveys", "review", "reviews"},
+    "coaching": {"coaching", "training", "upskilling", "course", "courses", "learning"},
+}
+STOPWORDS = set("""
+a an the and or of to in on for with who whom which what whose when where why how many much is are was were be been
+being do does did have has had i me my we our you your they them their it its this that these those there here any all
+some please show list find tell give about from at by as can could would should will may might know knows knew
+knowing someone anyone anybody get got most more than into over under since ever
+""".split())
+
+WORD_RE = re.compile(r"[\w+#]+")
+TIME_RES = [
+    (re.compile(r"\btoday\b", re.I), lambda now, m: now.replace(hour=0, minute=0, second=0, microsecond=0)),
+    (re.compile(r"\byesterday\b", re.I), lambda now, m: (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)),
+    (re.compile(r"\bthis week\b", re.I), lambda now, m: (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)),
+    (re.compile(r"\bthis month\b", re.I), lambda now, m: now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)),
+    (re.compile(r"\bthis year\b", re.I), lambda now, m: now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)),
+    (re.compile(r"\b(?:last|past) (\d{1,3}) days?\b", re.I), lambda now, m: now - timedelta(days=int(m.group(1)))),
+    (re.compile(r"\b(?:last|past) week\b", re.I), lambda now, m: now - timedelta(days=7)),
+    (re.compile(r"\b(?:last|past) month\b", re.I), lambda now, m: now - timedelta(days=30)),
+]
+
+# --- INDEX ---
+def rebuild_knowledge_index(conn):
+    # Same SQL as migration 16's backfill.
+    fill_knowledge_index(conn)
+
+# --- QUERY UNDERSTANDING ---
+def parse_question(text, now=None):
+    # Returns (terms, kinds, since): content words for MATCH, the sources
+    # the question is about (empty = all) and an ISO timestamp lower bound.
+    now = now or datetime.now()
+    since = None
+    for pattern, start in TIME_RES:
+        m = pattern.search(text)
+        if m:
+            since = start(now, m).isoformat()
+            text = text[:m.start()] + " " + text[m.end():]
+    kinds, terms = set(), []
+    for word in WORD_RE.findall(text.lower()):
+        intent = next((kind for kind, words in INTENTS.items() if word in words), None)
+        if intent:
+            kinds.add(intent)
+        elif word not in STOPWORDS and len(word) > 1 and word not in terms:
+            terms.append(word)
+    return terms, kinds, since
+
+def _match(terms, op="AND"):
+    return f" {op} ".join(_quote(t) + "*" for t in terms)
+
+# --- SEARCH ---
+def _resume_hits(conn, match, since, limit):
+    where = "resumes_fts MATCH ?" + (" AND r.timestamp >= ?" if since else "")
+    params = (match, since) if since else (match,)
+    total = conn.execute(f"SELECT COUNT(*) FROM resumes_fts JOIN resumes r ON r.id = resumes_fts.rowid WHERE {where}", params).fetchone()[0]
+    rows = conn.execute(f"""
+        SELECT r.id, r.name, COALESCE(r.status, 'New'), substr(r.timestamp, 1, 10),
+               replace(snippet(resumes_fts, -1, '', '', '…', {SNIPPET_TOKENS}), char(10), ' ')
+        FROM resumes_fts JOIN resumes r ON r.id = resumes_fts.rowid
+        WHERE {where} ORDER BY bm25(resumes_fts) LIMIT ?
+    """, (*params, limit)).fetchall()
+    return total, [("resume", rid, f"[resume:{rid}] {name} · {status} · applied {day}: {snip}") for rid, name, status, day, snip in rows]
+
+def _knowledge_hits(conn, match, kinds, since, limit):
+    where = "knowledge_fts MATCH ?"
+    params = [match]
+    if kinds:
+        where += f" AND kind IN ({','.join('?' * len(kinds))})"
+        params += sorted(kinds)
+    if since:
+        where += " AND timestamp >= ?"
+        params.append(since)
+    counts = dict(conn.execute(f"SELECT kind, COUNT(*) FROM knowledge_fts WHERE {where} GROUP BY kind", params).fetchall())
+    rows = conn.execute(f"""
+        SELECT rowid / 4, kind, title, substr(timestamp, 1, 10), replace(snippet(knowledge_fts, 1, '', '', '…', {SNIPPET_TOKENS}), char(10), ' ')
+        FROM knowledge_fts WHERE {where} ORDER BY bm25(knowledge_fts, 5.0, 1.0) LIMIT ?
+    """, (*params, limit)).fetchall()
+    return counts, [(kind, rid, f"[{kind}:{rid}] {title} ({day}): {snip}") for rid, kind, title, day, snip in rows]
+
+def _versions(conn):
+    # Part of the cache key: a new row in any source invalidates cached results.
+    return conn.execute(
+        "SELECT (SELECT MAX(id) FROM resumes), " + ", ".join(f"(SELECT MAX(id) FROM {t})" for _, t in SOURCES.values())
+    ).fetchone()
+
+# Shared across replicas; versions in the key keep it consistent after writes.
+@shared_cache("retrieve", ttl=CACHE_TTL)
+def _retrieve(terms, kinds, since, limit, versions, db_file, op):
+    conn = get_read_connection(db_file)
+    match = _match(terms, op)
+    want_resumes = not kinds or "resume" in kinds
+    others = set(kinds) - {"resume"}
+    counts, hits = {}, []
+    if want_resumes:
+        counts["resume"], hits = _resume_hits(conn, match, since, limit if kinds == ("resume",) else (limit + 1) // 2)
+    if not kinds or others:
+        more_counts, more = _knowledge_hits(conn, match, others, since, limit - len(hits))
+        counts.update(more_counts)
+        hits += more
+    return counts, hits
+
+def retrieve(question, limit=TOP_K, db_file=DB_FILE):
+    # Returns {"terms", "kinds", "since", "match", "counts", "hits"}; hits
+    # are (kind, id, snippet line). Records must contain every term
+    # (match="all"); only when none do is any one term enough (match="any").
+    # Nothing is searched without content words.
+    terms, kinds, since = parse_question(question)
+    if not terms:
+        return {"terms": [], "kinds": sorted(kinds), "since": since, "match": "all", "counts": {}, "hits": []}
+    # Day granularity keeps relative time filters cacheable.
+    since_key = since[:10] if since else None
+    args = (tuple(terms), tuple(sorted(kinds)), since_key, limit, _versions(get_read_connection(db_file)), db_file)
+    match = "all"
+    counts, hits = _retrieve(*args, "AND")
+    if not hits and len(terms) > 1:
+        match = "any"
+        counts, hits = _retrieve(*args, "OR")
+    return {"terms": terms, "kinds": sorted(kinds), "since": since_key, "match": match, "counts": counts, "hits": hits}
+
+def retrieval_context(question, limit=TOP_K, db_file=DB_FILE):
+    # Returns (text for the prompt or "", result). Match counts are included
+    # so "how many" questions can be answered without listing every row;
+    # they are labelled with whether records matched all terms or any.
+    result = retrieve(question, limit, db_file)
+    if not result["hits"]:
+        return "", result
+    totals = ", ".join(f"{n} {kind}" for kind, n in sorted(result["counts"].items()) if n)
+    scope = f" since {result['since']}" if result["since"] else ""
+    terms = ", ".join(result["terms"])
+    if len(result["terms"]) > 1:
+        terms = f"{result['match']} of {terms}"
+    text = (
+        f"Records from the MIRA database matching {terms}{scope} "
+        f"(matching records: {totals}; top {len(result['hits'])} shown):\n"
+        + "\n".join(line for _, _, line in result["hits"])
+        + "\nAnswer from these records where relevant and cite ids like [resume:12]. "
+        "If they do not cover the question, say so rather than guessing."
+    )
+    return text, result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Try Ask MIRA retrieval against a database.")
+    parser.add_argument("question")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database file")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild knowledge_fts from the source tables first")
+    args = parser.parse_args()
+
+    conn = get_connection(args.db)
+    migrate(conn)
+    if args.rebuild:
+        with conn:
+            rebuild_knowledge_index(conn)
+    start = time.perf_counter()
+    text, result = retrieval_context(args.question, db_file=args.db)
+    print(f"terms={result['terms']} kinds={result['kinds']} since={result['since']} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+    print(text or "No matching records.")
@@ -0,0 +1,270 @@
+import bisect
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from mira_calendar import POOL_SIZE, CalendarError, get_calendar
+from mira_db import executemany, execute, get_read_connection, run_writes
+
+# Interview scheduling. Times are stored as whole minutes since 1970-01-01
+# in the recruiting timezone (naive wall-clock time, like the rest of the
+# app). Scheduled interviews are mirrored into a 2-D R*Tree over
+# (time, interviewer) so conflict and free-slot checks are index lookups
+# rather than scans of every interview.
+
+DURATION = 60          # minutes
+SLOT_STEP = 30         # candidate start times are on this grid
+WORK_HOURS = (9, 17)
+WORKDAYS = range(5)    # Monday-Friday
+EPOCH = datetime(1970, 1, 1)
+
+class SchedulingConflict(ValueError):
+    pass
+
+# --- TIME ---
+def to_minutes(dt):
+    return (dt - EPOCH) // timedelta(minutes=1)
+
+def from_minutes(minutes):
+    return EPOCH + timedelta(minutes=minutes)
+
+# --- QUERIES ---
+def find_interviewer(conn, name):
+    # Read-only lookup; None for someone who has never been booked.
+    row = conn.execute("SELECT id FROM interviewers WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+def conflicts(conn, interviewer, start, end, candidate_email=None):
+    # Scheduled interviews overlapping [start, end) for the interviewer (an
+    # R*Tree box query) or for the candidate (indexed on email).
+    lo, hi = to_minutes(start), to_minutes(end)
+    iid = conn.execute("SELECT id FROM interviewers WHERE name = ?", (interviewer,)).fetchone() if interviewer else None
+    ids = set()
+    if iid:
+        ids.update(r[0] for r in conn.execute("""
+            SELECT id FROM interviews_rtree
+            WHERE start_min < ? AND end_min > ? AND interviewer_lo <= ? AND interviewer_hi >= ?
+        """, (hi, lo, iid[0], iid[0])))
+    if candidate_email:
+        ids.update(r[0] for r in conn.execute("""
+            SELECT id FROM interviews
+            WHERE candidate_email = ? AND status = 'scheduled' AND start_min < ? AND end_min > ?
+        """, (candidate_email, hi, lo)))
+    if not ids:
+        return []
+    return conn.execute(f"""
+        SELECT i.id, i.candidate_name, v.name, i.start_min, i.end_min FROM interviews i
+        LEFT JOIN interviewers v ON v.id = i.interviewer_id
+        WHERE i.id IN ({','.join('?' * len(ids))}) ORDER BY i.start_min
+    """, list(ids)).fetchall()
+
+def busy_intervals(conn, interviewer_ids, start, end):
+    # {interviewer_id: sorted [(start_min, end_min)]} for one time window,
+    # read with a single R*Tree range query.
+    busy = {iid: [] for iid in interviewer_ids}
+    for iid, s, e in conn.execute("""
+        SELECT interviewer_lo, start_min, end_min FROM interviews_rtree WHERE start_min < ? AND end_min > ?
+    """, (to_minutes(end), to_minutes(start))):
+        if iid in busy:
+            busy[iid].append((s, e))
+    for intervals in busy.values():
+        intervals.sort()
+    return busy
+
+def _is_free(intervals, lo, hi):
+    # `intervals` is sorted and non-overlapping per interviewer, so only the
+    # neighbours of the insertion point can collide.
+    i = bisect.bisect_left(intervals, (hi,))
+    return i == 0 or intervals[i - 1][1] <= lo
+
+def _slot_grid(day_from, days, duration, step, work_hours, now=None):
+    now = now or datetime.now()
+    for d in range(days):
+        day = datetime.combine(day_from + timedelta(days=d), datetime.min.time())
+        if day.weekday() not in WORKDAYS:
+            continue
+        start = day + timedelta(hours=work_hours[0])
+        last = day + timedelta(hours=work_hours[1], minutes=-duration)
+        while start <= last:
+            if start >= now:
+                yield start
+            start += timedelta(minutes=step)
+
+def free_slots(conn, interviewers, day_from, days=5, duration=DURATION, step=SLOT_STEP, work_hours=WORK_HOURS, limit=50):
+    # [(start datetime, interviewer name)] in time order. Read-only, so it
+    # can run on every rerun; interviewers who have never been booked are
+    # free throughout.
+    ids = {name: find_interviewer(conn, name) for name in interviewers}
+    window_start = datetime.combine(day_from, datetime.min.time())
+    busy = busy_intervals(conn, [iid for iid in ids.values() if iid is not None], window_start, window_start + timedelta(days=days))
+    slots = []
+    for start in _slot_grid(day_from, days, duration, step, work_hours):
+        lo = to_minutes(start)
+        for name, iid in ids.items():
+            if _is_free(busy.get(iid, []), lo, lo + duration):
+                slots.append((start, name))
+                if len(slots) >= limit:
+                    return slots
+    return slots
+
+def upcoming_interviews(conn, limit=50):
+    return conn.execute("""
+        SELECT i.id, i.candidate_name, i.candidate_email, i.position, v.name, i.start_min, i.end_min, i.join_url, i.calendar_error
+        FROM interviews i LEFT JOIN interviewers v ON v.id = i.interviewer_id
+        WHERE i.status = 'scheduled' AND i.start_min >= ?
+        ORDER BY i.start_min LIMIT ?
+    """, (to_minutes(datetime.now()), limit)).fetchall()
+
+# --- BOOKING ---
+# Bookings are written as INSERT ... WHERE NOT EXISTS over the same R*Tree
+# and email checks as conflicts(), so the check and the insert are one
+# statement and can be sent to the single writer; no read-then-write
+# transaction has to hold the lock.
+ADD_INTERVIEWER = "INSERT OR IGNORE INTO interviewers (name, email) VALUES (?, ?)"
+
+def _insert_if_free(candidate_name, candidate_email, position, interviewer, lo, hi, timestamp):
+    # An op for run_writes; its RETURNING row is empty if the slot was taken.
+    return ("""
+        INSERT INTO interviews (candidate_name, candidate_email, position, interviewer_id, start_min, end_min, timestamp)
+        SELECT ?, ?, ?, v.id, ?, ?, ? FROM (SELECT (SELECT id FROM interviewers WHERE name = ?) AS id) v
+        WHERE NOT EXISTS (
+            SELECT 1 FROM interviews_rtree
+            WHERE start_min < ? AND end_min > ? AND interviewer_lo <= v.id AND interviewer_hi >= v.id
+        ) AND NOT EXISTS (
+            SELECT 1 FROM interviews
+            WHERE candidate_email = ? AND ? <> '' AND status = 'scheduled' AND start_min < ? AND end_min > ?
+        )
+        RETURNING id
+    """, (candidate_name, candidate_email, position, lo, hi, timestamp, interviewer, hi, lo, candidate_email, candidate_email, hi, lo))
+
+def _create_events(rows, join_url=None):
+    # rows: (id, candidate_name, candidate_email, position, interviewer, start, end).
+    # Calendar calls run on the provider's pool outside the DB transaction.
+    # A failed call leaves the booking in place with calendar_error set.
+    # Returns {id: (join_url, error)}.
+    calendar = get_calendar()
+
+    def create(row):
+        interview_id, name, email, position, interviewer, start, end = row
+        try:
+            external_id, url = calendar.create_event(
+                f"Interview with {name} - {position}",
+                f"Scheduled interview for {position} with {name}" + (f" (interviewer: {interviewer})" if interviewer else "") + ".",
+                start, end, [email], join_url, key=f"mira-interview-{interview_id}",
+            )
+        except CalendarError as e:
+            return interview_id, None, None, str(e)
+        return interview_id, external_id, url, None
+
+    with ThreadPoolExecutor(max_workers=min(POOL_SIZE, max(1, len(rows)))) as pool:
+        results = list(pool.map(create, rows))
+    executemany(
+        "UPDATE interviews SET provider = ?, external_id = ?, join_url = ?, calendar_error = ? WHERE id = ?",
+        [(calendar.name, external_id, url, error, interview_id) for interview_id, external_id, url, error in results],
+    )
+    return {interview_id: (url, error) for interview_id, _, url, error in results}
+
+def retry_calendar_events(limit=50):
+    # Job handler: tries again to create the calendar events that failed
+    # for upcoming interviews. Returns how many were retried and still failed.
+    rows = get_read_connection().execute("""
+        SELECT i.id, i.candidate_name, i.candidate_email, i.position, v.name, i.start_min, i.end_min
+        FROM interviews i LEFT JOIN interviewers v ON v.id = i.interviewer_id
+        WHERE i.status = 'scheduled' AND i.calendar_error IS NOT NULL AND i.start_min >= ?
+        ORDER BY i.start_min LIMIT ?
+    """, (to_minutes(datetime.now()), limit)).fetchall()
+    if not rows:
+        return {"retried": 0, "failed": 0}
+    results = _create_events([(*r[:5], from_minutes(r[5]), from_minutes(r[6])) for r in rows])
+    return {"retried": len(rows), "failed": sum(1 for _, error in results.values() if error)}
+
+def book_interview(candidate_name, candidate_email, position, start, interviewer=None, duration=DURATION, join_url=None):
+    # Returns {"id", "join_url"}; raises SchedulingConflict if the
+    # interviewer or the candidate is already booked at that time.
+    end = start + timedelta(minutes=duration)
+    ops = [(ADD_INTERVIEWER, (interviewer, None))] if interviewer else []
+    ops.append(_insert_if_free(candidate_name, candidate_email, position, interviewer, to_minutes(start), to_minutes(end), datetime.now().isoformat()))
+    row = run_writes(ops)[-1].fetchone()
+    if row is None:
+        clash = conflicts(get_read_connection(), interviewer, start, end, candidate_email)
+        if not clash:
+            raise SchedulingConflict("Conflicts with an interview booked at the same time")
+        _, who, with_, s, _ = clash[0]
+        raise SchedulingConflict(f"Conflicts with {who}'s interview{f' with {with_}' if with_ else ''} at {from_minutes(s):%Y-%m-%d %H:%M}")
+    interview_id = row[0]
+    url, error = _create_events([(interview_id, candidate_name, candidate_email, position, interviewer, start, end)], join_url)[interview_id]
+    return {"id": interview_id, "join_url": url, "calendar_error": error}
+
+def schedule_interview(candidate_name, candidate_email, interview_date, interview_time, position_title, teams_link=None, interviewer=None, duration=DURATION):
+    # Job handler for the single-interview form. A conflict is an answer,
+    # not a failure, so it is returned instead of raised (and not retried).
+    start = datetime.strptime(f"{interview_date} {interview_time}", "%Y-%m-%d %H:%M")
+    try:
+        return book_interview(candidate_name, candidate_email, position_title, start, interviewer or None, int(duration), teams_link or None)
+    except SchedulingConflict as e:
+        return {"conflict": str(e)}
+
+def bulk_schedule(candidates, interviewers, day_from, days=5, duration=DURATION, step=SLOT_STEP, work_hours=WORK_HOURS):
+    # Assigns each candidate (dicts with name, email, position) the earliest
+    # free slot, spreading load across interviewers on ties. Slots are planned
+    # from a read connection and booked in one write request; a candidate
+    # whose slot someone else booked in between is reported unassigned.
+    # Returns {"booked": [...], "unassigned": [...]}.
+    if isinstance(day_from, str):
+        day_from = datetime.strptime(day_from, "%Y-%m-%d").date()
+    if interviewers:
+        executemany(ADD_INTERVIEWER, [(name, None) for name in interviewers])
+    conn = get_read_connection()
+    ids = {find_interviewer(conn, name): name for name in interviewers}
+    window_start = datetime.combine(day_from, datetime.min.time())
+    busy = busy_intervals(conn, ids, window_start, window_start + timedelta(days=days))
+    load = dict.fromkeys(ids, 0)
+    grid = [to_minutes(s) for s in _slot_grid(day_from, days, duration, step, work_hours)]
+
+    booked, unassigned, planned = [], [], []
+    now = datetime.now().isoformat()
+    for c in candidates:
+        email = c.get("email", "")
+        # Existing interviews of this candidate count as busy time too.
+        mine = sorted((s, e) for _, _, _, s, e in conflicts(conn, None, window_start, window_start + timedelta(days=days), email)) if email else []
+        choice = None
+        for lo in grid:
+            if not _is_free(mine, lo, lo + duration):
+                continue
+            free = [iid for iid in ids if _is_free(busy[iid], lo, lo + duration)]
+            if free:
+                choice = (lo, min(free, key=lambda iid: load[iid]))
+                break
+        if choice is None:
+            unassigned.append(c.get("name", email))
+            continue
+        lo, iid = choice
+        bisect.insort(busy[iid], (lo, lo + duration))
+        load[iid] += 1
+        planned.append((c, ids[iid], lo))
+
+    results = run_writes([
+        _insert_if_free(c.get("name", ""), c.get("email", ""), c.get("position", ""), interviewer, lo, lo + duration, now)
+        for c, interviewer, lo in planned
+    ]) if planned else []
+    rows = []
+    for (c, interviewer, lo), result in zip(planned, results):
+        row = result.fetchone()
+        if row is None:
+            unassigned.append(c.get("name", c.get("email", "")))
+            continue
+        rows.append((row[0], c.get("name", ""), c.get("email", ""), c.get("position", ""), interviewer, from_minutes(lo), from_minutes(lo + duration)))
+
+    events = _create_events(rows) if rows else {}
+    for interview_id, name, _, _, interviewer, start, _ in rows:
+        url, error = events[interview_id]
+        booked.append({"id": interview_id, "candidate": name, "interviewer": interviewer, "start": start.isoformat(), "join_url": url, "calendar_error": error})
+    return {"booked": booked, "unassigned": unassigned}
+
+def cancel_interview(interview_id):
+    row = get_read_connection().execute("SELECT external_id FROM interviews WHERE id = ?", (interview_id,)).fetchone()
+    if not row:
+        return False
+    execute("UPDATE interviews SET status = 'cancelled' WHERE id = ?", (interview_id,))
+    if row[0]:
+        get_calendar().cancel_event(row[0])
+    return True
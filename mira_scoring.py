@@ -0,0 +1,239 @@
+import asyncio
+import json
+import math
+import re
+from collections import Counter
+from datetime import datetime
+
+from mira_db import DB_FILE, executemany, get_read_connection, run_writes
+from mira_llm import get_gateway
+
+# Ranks the resume pool against a job description in two stages:
+#   1. a local TF-IDF cosine pre-filter, computed as one sparse
+#      matrix-vector product with NumPy (no LLM cost), then
+#   2. batched LLM scoring of only the top-K unscored candidates.
+# Each resume is tokenized once: its term counts go to scoring_docs and its
+# terms into the document frequencies in scoring_terms. Every resume gets a
+# resume_scores row for the JD once it has been pre-filtered, so later runs
+# only vectorize resumes added since. Scores live in resume_scores, one row
+# per (JD, resume), so scoring against one JD never overwrites another's.
+
+TOP_K = 50
+BATCH_SIZE = 10
+MIN_SIMILARITY = 0.02
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it of on or our the to we with will you your
+this that their they about who what when where which into over per can able must should
+""".split())
+
+SCORING_PROMPT = """You are screening candidates for the job description below.
+Score each candidate from 0 (no fit) to 100 (ideal fit) based only on the information given.
+Reply with JSON only: a list of objects {{"id": <candidate id>, "score": <0-100>, "reason": "<one short sentence>"}}.
+
+JOB DESCRIPTION:
+{jd}
+
+CANDIDATES:
+{candidates}"""
+
+# --- TF-IDF PRE-FILTER ---
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+def _resume_text(skills, experience):
+    # Skills are repeated so they weigh more than free-form experience text.
+    return f"{skills or ''}\n{skills or ''}\n{experience or ''}"
+
+def tfidf_similarity(doc_counts, query_text, df, n_docs):
+    # doc_counts: one {term: count} per document; df: {term: document
+    # frequency} over the whole pool of n_docs. Builds the document-term
+    # matrix in COO form (doc index, term index, weight) and scores the
+    # documents against the query with one np.bincount, i.e. a sparse
+    # mat-vec without materialising the matrix.
+    import numpy as np
+
+    vocab = {}
+    doc_idx, term_idx, counts = [], [], []
+    for i, terms in enumerate(doc_counts):
+        for term, count in terms.items():
+            doc_idx.append(i)
+            term_idx.append(vocab.setdefault(term, len(vocab)))
+            counts.append(count)
+    # Query terms found elsewhere in the pool still count towards its norm.
+    query_counts = {t: c for t, c in Counter(tokenize(query_text)).items() if df.get(t)}
+    for term in query_counts:
+        vocab.setdefault(term, len(vocab))
+
+    if not doc_counts or not vocab:
+        return np.zeros(len(doc_counts), dtype=np.float32)
+
+    doc_idx = np.asarray(doc_idx, dtype=np.int32)
+    term_idx = np.asarray(term_idx, dtype=np.int32)
+    tf = 1.0 + np.log(np.asarray(counts, dtype=np.float32))
+
+    term_df = np.asarray([df.get(term, 0) for term in vocab], dtype=np.float32)
+    idf = np.log((1.0 + n_docs) / (1.0 + term_df)).astype(np.float32) + 1.0
+    weights = tf * idf[term_idx]
+    doc_norms = np.sqrt(np.bincount(doc_idx, weights=weights * weights, minlength=len(doc_counts)))
+
+    query = np.zeros(len(vocab), dtype=np.float32)
+    for term, count in query_counts.items():
+        query[vocab[term]] = (1.0 + math.log(count)) * idf[vocab[term]]
+    query_norm = np.linalg.norm(query)
+    if not query_norm:
+        return np.zeros(len(doc_counts), dtype=np.float32)
+
+    dots = np.bincount(doc_idx, weights=weights * query[term_idx], minlength=len(doc_counts))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sims = np.where(doc_norms > 0, dots / (doc_norms * query_norm), 0.0)
+    return sims.astype(np.float32)
+
+def index_new_resumes(conn, db_file=DB_FILE):
+    # Tokenizes resumes missing from scoring_docs and adds their terms to
+    # the document frequencies; returns how many were added. Reads go to
+    # `conn`, writes to db_file through mira_db. The frequencies are counted
+    # in SQL over the docs not stored yet, in the same request that stores
+    # them, so a resume another run indexed first is never counted twice.
+    rows = conn.execute("""
+        SELECT r.id, r.skills, r.experience FROM resumes r
+        WHERE NOT EXISTS (SELECT 1 FROM scoring_docs d WHERE d.resume_id = r.id)
+    """).fetchall()
+    if not rows:
+        return 0
+    docs = {r[0]: Counter(tokenize(_resume_text(*r[1:]))) for r in rows}
+    return run_writes([
+        ("""
+            INSERT INTO scoring_terms (term, df)
+            SELECT t.key, COUNT(*) FROM json_each(?) d, json_each(d.value) t
+            WHERE NOT EXISTS (SELECT 1 FROM scoring_docs s WHERE s.resume_id = CAST(d.key AS INTEGER))
+            GROUP BY t.key
+            ON CONFLICT (term) DO UPDATE SET df = df + excluded.df
+        """, (json.dumps(docs),)),
+        ("INSERT OR IGNORE INTO scoring_docs (resume_id, terms) VALUES (?, ?)",
+         [(resume_id, json.dumps(counts)) for resume_id, counts in docs.items()], True),
+    ], db_file)[1].rowcount
+
+def document_frequencies(conn, terms, chunk=500):
+    terms = list(terms)
+    df = {}
+    for i in range(0, len(terms), chunk):
+        part = terms[i:i + chunk]
+        df.update(conn.execute(f"SELECT term, df FROM scoring_terms WHERE term IN ({','.join('?' * len(part))})", part))
+    return df
+
+def prefilter_new_resumes(conn, jd_id, jd_text, db_file=DB_FILE):
+    # Vectorizes only the resumes without a resume_scores row for this JD,
+    # against the document frequencies of the whole pool.
+    index_new_resumes(conn, db_file)
+    rows = conn.execute("""
+        SELECT d.resume_id, d.terms FROM scoring_docs d
+        WHERE NOT EXISTS (SELECT 1 FROM resume_scores s WHERE s.jd_id = ? AND s.resume_id = d.resume_id)
+    """, (jd_id,)).fetchall()
+    if not rows:
+        return 0
+    docs = [json.loads(r[1]) for r in rows]
+    df = document_frequencies(conn, {t for d in docs for t in d} | set(tokenize(jd_text)))
+    n_docs = conn.execute("SELECT COUNT(*) FROM scoring_docs").fetchone()[0]
+    sims = tfidf_similarity(docs, jd_text, df, n_docs)
+    executemany(
+        "INSERT OR IGNORE INTO resume_scores (jd_id, resume_id, prefilter) VALUES (?, ?, ?)",
+        [(jd_id, r[0], float(s)) for r, s in zip(rows, sims)], db_file,
+    )
+    return len(rows)
+
+# --- LLM SCORING ---
+def _candidate_block(resume_id, name, skills, experience):
+    return (
+        f"- id: {resume_id}\n  name: {name or ''}\n"
+        f"  skills: {' '.join((skills or '').split())[:400]}\n"
+        f"  experience: {' '.join((experience or '').split())[:600]}"
+    )
+
+def parse_scores(text):
+    # The model is asked for a JSON list; tolerate prose or code fences around it.
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        items = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    scores = {}
+    for item in items:
+        try:
+            scores[int(item["id"])] = (max(0, min(100, int(item["score"]))), str(item.get("reason", ""))[:300])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return scores
+
+async def _score_batches(gateway, jd_text, batches):
+    # Returns (scores, errors). Scores are only kept for ids that were in the
+    # batch sent, so an id the model made up can't score another resume.
+    async def one(batch):
+        prompt = SCORING_PROMPT.format(jd=jd_text[:4000], candidates="\n".join(_candidate_block(*c) for c in batch))
+        completion = await gateway.achat(prompt, system_prompt="You are a precise technical recruiter. Reply with JSON only.")
+        ids = {c[0] for c in batch}
+        return {i: v for i, v in parse_scores(completion.text).items() if i in ids}
+
+    results = await asyncio.gather(*(one(b) for b in batches), return_exceptions=True)
+    merged, errors = {}, []
+    for r in results:
+        if isinstance(r, BaseException):
+            errors.append(r)
+        else:
+            merged.update(r)
+    return merged, errors
+
+def job_title(jd_text):
+    for line in (jd_text or "").splitlines():
+        if line.strip():
+            return line.strip()[:80]
+    return ""
+
+def score_job_description(jd_id, top_k=TOP_K, batch_size=BATCH_SIZE, gateway=None):
+    conn = get_read_connection()
+    row = conn.execute("SELECT content FROM job_descriptions WHERE id = ?", (jd_id,)).fetchone()
+    if not row:
+        raise ValueError(f"Job description {jd_id} not found")
+    jd_text = row[0]
+
+    prefiltered = prefilter_new_resumes(conn, jd_id, jd_text)
+    candidates = conn.execute("""
+        SELECT r.id, r.name, r.skills, r.experience, s.prefilter
+        FROM resume_scores s JOIN resumes r ON r.id = s.resume_id
+        WHERE s.jd_id = ? AND s.score IS NULL AND s.prefilter >= ?
+        ORDER BY s.prefilter DESC
+        LIMIT ?
+    """, (jd_id, MIN_SIMILARITY, top_k)).fetchall()
+
+    batches = [[c[:4] for c in candidates[i:i + batch_size]] for i in range(0, len(candidates), batch_size)]
+    scores, errors = asyncio.run(_score_batches(gateway or get_gateway(), jd_text, batches)) if batches else ({}, [])
+
+    # Candidates the model skipped or whose batch failed keep a NULL score,
+    # so the next run (or the job queue's retry) picks them up again.
+    now = datetime.now().isoformat()
+    updates = [(score, reason, now, jd_id, resume_id) for resume_id, (score, reason) in scores.items()]
+
+    if updates:
+        run_writes([
+            ("""
+                UPDATE resume_scores SET score = ?, rationale = ?, scored_at = ?
+                WHERE jd_id = ? AND resume_id = ?
+            """, updates, True),
+            ("UPDATE resumes SET status = 'Scored' WHERE id = ? AND (status IS NULL OR status = 'New')", [(u[4],) for u in updates], True),
+        ])
+
+    if errors:
+        raise errors[0]
+    return {"prefiltered": prefiltered, "scored": len(updates), "unscored": len(candidates) - len(updates)}
+
+def ranked_candidates(jd_id, limit=25):
+    return get_read_connection().execute("""
+        SELECT r.id, r.name, r.email, s.score, s.prefilter, s.rationale
+        FROM resume_scores s JOIN resumes r ON r.id = s.resume_id
+        WHERE s.jd_id = ? AND s.score IS NOT NULL
+        ORDER BY s.score DESC, s.prefilter DESC
+        LIMIT ?
+    """, (jd_id, limit)).fetchall()
@@ -0,0 +1,100 @@
+import argparse
+import re
+import sqlite3
+
+from mira_db import DB_FILE
+
+# Columns indexed by resumes_fts (migration 5), in table order. Weights feed
+# bm25(): a hit in the name or email is worth more than one buried in the
+# experience section.
+FTS_COLUMNS = ["name", "email", "phone", "skills", "experience"]
+FTS_WEIGHTS = [10.0, 6.0, 4.0, 3.0, 1.0]
+
+FIELD_ALIASES = {
+    "name": "name",
+    "email": "email",
+    "mail": "email",
+    "phone": "phone",
+    "skill": "skills",
+    "skills": "skills",
+    "exp": "experience",
+    "experience": "experience",
+}
+
+TOKEN_RE = re.compile(r'(?:(\w+):)?("[^"]*"|\S+)')
+TERM_RE = re.compile(r"[\w+#]+")
+
+# --- INDEX SETUP ---
+def rebuild_resume_index(conn):
+    conn.execute("INSERT INTO resumes_fts (resumes_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO resumes_fts (resumes_fts) VALUES ('optimize')")
+
+# --- QUERY PARSING ---
+def _quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+def build_fts_query(text):
+    # Turns free text like `skills:python "machine learning" aws` into an FTS5
+    # MATCH expression. Bare words become prefix queries, quoted text stays an
+    # exact phrase and `field:` scopes a term to one column.
+    parts = []
+    for field, raw in TOKEN_RE.findall(text or ""):
+        column = FIELD_ALIASES.get(field.lower()) if field else None
+        if field and not column:
+            # Unknown prefix (e.g. a URL scheme) - search it as plain text.
+            raw = f"{field}:{raw}"
+
+        if raw.upper() in ("OR", "AND", "NOT") and not column:
+            if parts and parts[-1] not in ("OR", "AND", "NOT"):
+                parts.append(raw.upper())
+            continue
+
+        if raw.startswith('"') and raw.endswith('"') and len(raw) > 1:
+            words = TERM_RE.findall(raw[1:-1])
+            if not words:
+                continue
+            expr = _quote(" ".join(words))
+        else:
+            words = TERM_RE.findall(raw)
+            if not words:
+                continue
+            expr = " ".join(_quote(w) + "*" for w in words)
+            if len(words) > 1:
+                expr = f"({expr})"
+
+        parts.append(f"{column} : {expr}" if column else expr)
+
+    while parts and parts[-1] in ("OR", "AND", "NOT"):
+        parts.pop()
+    return " ".join(parts)
+
+# --- SEARCH ---
+def search_resumes(conn, query, limit=50, offset=0):
+    match = build_fts_query(query)
+    if not match:
+        return []
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    return conn.execute(f"""
+        SELECT r.* FROM resumes_fts
+        JOIN resumes r ON r.id = resumes_fts.rowid
+        WHERE resumes_fts MATCH ?
+        ORDER BY bm25(resumes_fts, {weights})
+        LIMIT ? OFFSET ?
+    """, (match, limit, offset)).fetchall()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or rebuild the resume full-text index.")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database file")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index even if it already exists")
+    args = parser.parse_args()
+
+    from mira_migrations import migrate
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    if args.rebuild:
+        rebuild_resume_index(conn)
+    conn.commit()
+    count = conn.execute("SELECT count(*) FROM resumes").fetchone()[0]
+    conn.close()
+    print(f"Resume search index ready ({count} resumes).")
@@ -0,0 +1,44 @@
+import logging
+import time
+from collections import deque
+
+import streamlit as st
+
+from mira_metrics import begin_rerun, end_rerun
+
+# Imported first by the entry scripts, so this is (close to) the moment the
+# app's own code started loading in this process.
+PROCESS_START = time.perf_counter()
+
+logger = logging.getLogger("mira.startup")
+
+# --- TIMINGS ---
+@st.cache_resource
+def _timings():
+    return {"cold_start": None, "reruns": deque(maxlen=200)}
+
+def rerun_started():
+    begin_rerun()
+    return time.perf_counter()
+
+def rerun_finished(started):
+    # The first completed run in a process is the cold start (imports, schema
+    # check, caches warming up); every later one is a plain rerun.
+    timings = _timings()
+    now = time.perf_counter()
+    if timings["cold_start"] is None:
+        timings["cold_start"] = now - PROCESS_START
+        logger.info("MIRA cold start: %.0f ms", timings["cold_start"] * 1000)
+    else:
+        timings["reruns"].append(now - started)
+    end_rerun(now - started)
+    from mira_db import release_connections
+    release_connections()
+    return timings
+
+def show_startup_timings(timings):
+    reruns = sorted(timings["reruns"])
+    label = f"⏱️ Cold start {timings['cold_start'] * 1000:.0f} ms"
+    if reruns:
+        label += f" · rerun p50 {reruns[len(reruns) // 2] * 1000:.0f} ms over {len(reruns)} runs"
+    st.sidebar.caption(label)
@@ -0,0 +1,47 @@
+import hashlib
+from datetime import datetime
+
+from mira_db import DB_FILE, run_writes
+from mira_parsing import DETAIL_COLUMNS, ResumeDetails
+
+# Content-addressed resume store: uploads are keyed by the SHA-256 of their
+# bytes, so re-uploading (or a Streamlit rerun re-submitting) the same file
+# neither re-runs the parser nor creates a second candidate row.
+
+# --- CACHE ---
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+def get_cached_parse(conn, digest):
+    row = conn.execute(
+        f"SELECT {', '.join(DETAIL_COLUMNS)} FROM resume_parse_cache WHERE content_hash = ?", (digest,)
+    ).fetchone()
+    return ResumeDetails.from_row(row) if row else None
+
+def cached_parses_op(entries):
+    # An executemany op for mira_db.run_writes.
+    # entries: iterable of (content_hash, filename, raw_text, ResumeDetails)
+    cols = ", ".join(DETAIL_COLUMNS)
+    marks = ", ".join("?" * (len(DETAIL_COLUMNS) + 4))
+    return (f"""
+        INSERT OR IGNORE INTO resume_parse_cache (content_hash, filename, raw_text, {cols}, timestamp)
+        VALUES ({marks})
+    """, [(h, f, text, *details.row(), datetime.now().isoformat()) for h, f, text, details in entries], True)
+
+def known_hashes(conn):
+    return {row[0] for row in conn.execute("SELECT content_hash FROM resume_parse_cache")}
+
+def resume_exists(conn, digest):
+    return conn.execute("SELECT 1 FROM resumes WHERE content_hash = ?", (digest,)).fetchone() is not None
+
+def parse_with_cache(conn, data, filename, parse, db_file=DB_FILE):
+    # Returns (digest, details, cached). `parse(data, filename)` returns
+    # (raw_text, details) and only runs on a cache miss, whose result is
+    # written through mira_db to db_file.
+    digest = content_hash(data)
+    details = get_cached_parse(conn, digest)
+    if details is not None:
+        return digest, details, True
+    raw_text, details = parse(data, filename)
+    run_writes([cached_parses_op([(digest, filename, raw_text, details)])], db_file)
+    return digest, details, False
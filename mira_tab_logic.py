@@ -1,241 +1,125 @@
-import streamlit as st
-import openai
-from datetime import datetime, timedelta
-import sqlite3
 import os
-import base64
-import dateparser
-import re
-import csv
-from io import StringIO
-import pdfplumber
-from docx import Document
-from docx.shared import Pt
-
-DB_FILE = "mira_resumes.db"
+import streamlit as st
+from datetime import datetime
+from mira_db import (
+    DB_FILE, get_read_connection, insert_parsed_resume, insert_job_description,
+    insert_branding_asset, insert_feedback, insert_coaching_material,
+)
+from mira_parsing import parse_resume
+from mira_llm_cache import cached_completion, cache_stats
+from mira_llm import DEFAULT_MODEL, SYSTEM_PROMPT, get_gateway
+from mira_migrations import ensure_schema
+from mira_analytics import render_dashboard
+from mira_conversations import render_conversation
+from mira_transfer import render_transfer_panel
+from mira_metrics import render_performance_tab, timer
+from mira_jobs import enqueue, job_panel, start_background_workers, submit_job
+from mira_offers import DOCX_MIME, offer_document, offers_zip, read_hires_csv
+from mira_scheduling import free_slots, from_minutes, upcoming_interviews
+from mira_scoring import TOP_K, job_title, ranked_candidates
+from mira_search import search_resumes
+from mira_pagination import paginate_table, paginated_list, offset_fetcher
+from mira_storage import get_storage
+from mira_ingest import ingest, uploaded_sources
+from mira_store import parse_with_cache
 
 # --- HELPER FUNCTIONS ---
-import openai
+MODEL = DEFAULT_MODEL
+
+def _complete(prompt):
+    return get_gateway().chat(prompt, SYSTEM_PROMPT, MODEL).text
+
+def ask_gpt_cached(prompt):
+    # Returns (answer, source); source is "cache", "similar" or "llm".
+    return cached_completion(MODEL, SYSTEM_PROMPT, prompt, _complete)
 
 def ask_gpt(prompt):
-    client = openai.OpenAI(api_key=st.secrets["openai"]["api_key"])
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are MIRA, an intelligent, helpful, and friendly AI recruiting assistant."},
-            {"role": "user", "content": prompt}
-        ]
-    )
-    return response.choices[0].message.content.strip()
-
-def extract_text_from_pdf(file):
-    with pdfplumber.open(file) as pdf:
-        return "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
-
-def extract_text_from_docx(file):
-    doc = Document(file)
-    return "\n".join([para.text for para in doc.paragraphs])
-
-def extract_details(text):
-    name = text.split("\n")[0].strip() if text else ""
-    email_match = re.search(r"[\w\.-]+@[\w\.-]+", text)
-    phone_match = re.search(r"(\+\d{1,2}\s)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text)
-    email = email_match.group() if email_match else ""
-    phone = phone_match.group() if phone_match else ""
-    skills = experience = ""
-    lines = text.split("\n")
-    for i, line in enumerate(lines):
-        if "skills" in line.lower():
-            skills = "\n".join(lines[i+1:i+6])
-        if "experience" in line.lower():
-            experience = "\n".join(lines[i+1:i+10])
-    return name, email, phone, skills, experience
-
-def save_to_db(name, email, phone, skills, experience, filename):
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO resumes (name, email, phone, skills, experience, filename, timestamp)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (name, email, phone, skills, experience, filename, datetime.now().isoformat()))
-    conn.commit()
-    conn.close()
-
-def schedule_google_event(candidate_name, candidate_email, interview_date, interview_time, position_title, teams_link="https://teams.microsoft.com/l/meetup-join/abc123"):
-    return teams_link or "https://teams.microsoft.com/l/meetup-join/abc123"
-
-def generate_onboarding_doc(name, email, position, start_date, salary):
-    doc = Document()
-    doc.add_heading('Offer Letter', 0)
-    doc.add_paragraph(f"Dear {name},")
-    doc.add_paragraph(f"We are excited to offer you the position of {position}. Your start date will be {start_date}, with a starting salary of ${salary}.")
-    doc.add_paragraph("Please let us know if you have any questions.")
-    doc.add_paragraph("Sincerely,\nHR Team")
-
-    for para in doc.paragraphs:
-        for run in para.runs:
-            run.font.size = Pt(11)
-
-    filepath = f"onboarding_docs/{name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d%H%M%S')}.docx"
-    os.makedirs("onboarding_docs", exist_ok=True)
-    doc.save(filepath)
-
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO onboarding_logs (name, email, position, start_date, salary, filepath, timestamp)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (name, email, position, start_date, salary, filepath, datetime.now().isoformat()))
-    conn.commit()
-    conn.close()
-
-    return filepath
+    return ask_gpt_cached(prompt)[0]
+
+def save_to_db(details, filename, content_hash=None):
+    inserted = insert_parsed_resume(details, filename, content_hash)
+    if inserted:
+        # Embedded by a job worker. Keyed on the newest id, so a job that
+        # has already run is not reused and one run covers a burst of saves.
+        newest = get_read_connection().execute("SELECT MAX(id) FROM resumes").fetchone()[0]
+        enqueue("embed_resumes", {}, key=f"embed_resumes:{newest}")
+    return inserted
 
 # --- DB SETUP ---
 def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS resumes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        email TEXT,
-        phone TEXT,
-        skills TEXT,
-        experience TEXT,
-        filename TEXT,
-        timestamp TEXT,
-        job_title TEXT DEFAULT '',
-        status TEXT DEFAULT 'New',
-        score INTEGER DEFAULT 0
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS mira_logs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        question TEXT,
-        answer TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS onboarding_logs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        email TEXT,
-        position TEXT,
-        start_date TEXT,
-        salary TEXT,
-        filepath TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS job_descriptions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        content TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS branding_assets (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        content TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS feedback_surveys (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        candidate_name TEXT,
-        rating INTEGER,
-        comments TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS coaching_materials (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT,
-        notes TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS analytics_snapshots (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        metric TEXT,
-        value INTEGER,
-        timestamp TEXT
-    )
-    """)
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS voice_assistant_logs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        transcript TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    conn.commit()
-    conn.close()
+    ensure_schema()
+    start_background_workers()
 
 # --- RENDER TABS ---
-def render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8):
-    with tab1:
+def render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, perf_tab=None):
+    render_transfer_panel()
+
+    with tab1, timer("render", "ask_mira"):
         st.subheader("🧠 Ask MIRA")
 
         if st.button("🎤 Start Listening"):
             st.info("Voice input activated (simulated)")
 
-        user_input = st.text_input("Ask me anything related to recruiting, HR, or employer branding:")
-        if user_input:
-            response = ask_gpt(user_input)
-            st.markdown(f"**MIRA says:** {response}")
+        render_conversation(MODEL)
 
-    with tab2:
-        st.subheader("📄 Resume Viewer")
+        with st.expander("📊 Response cache"):
+            stats = cache_stats()
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Hits", stats["hits"] + stats["similar_hits"])
+            col2.metric("Misses", stats["misses"])
+            col3.metric("Hit rate", f"{stats['hit_rate']:.0%}")
+            col4.metric("Time saved", f"{stats['saved_seconds_estimate']:.1f}s")
+            usage = get_gateway().usage()
+            st.caption(f"LLM calls: {usage['calls']} · retries: {usage['retries']} · errors: {usage['errors']} · tokens: {usage['total_tokens']}")
 
-        filter = st.text_input("Search resumes by name, email, skills, or experience")
+    with tab2, timer("render", "resumes"):
+        st.subheader("📄 Resume Viewer")
 
-        conn = sqlite3.connect(DB_FILE)
-        cur = conn.cursor()
-        if filter:
-            cur.execute("""
-                SELECT * FROM resumes
-                WHERE name LIKE ? OR email LIKE ? OR skills LIKE ? OR experience LIKE ?
-            """, (f"%{filter}%",)*4)
-        else:
-            cur.execute("SELECT * FROM resumes")
-        rows = cur.fetchall()
-        conn.close()
+        filter = st.text_input("Search resumes by name, email, skills, or experience (e.g. skills:python)")
+        search_mode = st.radio("Search mode", ["Keyword", "Semantic"], horizontal=True, help="Ranks resumes with a local embedding model. Without one installed it falls back to word and synonym matching, e.g. 'ML engineer' finds 'machine learning'. Newly saved resumes appear once a worker has embedded them.")
 
-        for r in rows:
+        def render_resume(r):
             st.markdown(f"**{r[1]}** | {r[2]} | {r[3]}")
             st.markdown(f"**Skills:** {r[4][:150]}...")
             st.markdown(f"**Experience:** {r[5][:200]}...")
             st.markdown("---")
 
+        conn = get_read_connection()
+        if filter:
+            if search_mode == "Semantic":
+                from mira_embeddings import semantic_search as search_fn
+            else:
+                search_fn = search_resumes
+            search = offset_fetcher(lambda limit, offset: search_fn(conn, filter, limit, offset))
+            paginated_list("resumes", search, render_resume, empty_message="No matching resumes.", reset_on=(filter, search_mode))
+        else:
+            paginate_table("resumes", get_storage(), "resumes", ["id", "name", "email", "phone", "skills", "experience"], render_resume)
+
         st.subheader("📤 Upload Resume")
         uploaded_file = st.file_uploader("Upload a resume (.pdf or .docx)", type=["pdf", "docx"])
         if uploaded_file:
-            ext = uploaded_file.name.split(".")[-1].lower()
-            raw_text = extract_text_from_pdf(uploaded_file) if ext == "pdf" else extract_text_from_docx(uploaded_file)
-            name, email, phone, skills, experience = extract_details(raw_text)
-            save_to_db(name, email, phone, skills, experience, uploaded_file.name)
-            st.success(f"Saved resume for: {name}")
+            digest, details, _ = parse_with_cache(get_read_connection(), uploaded_file.getvalue(), uploaded_file.name, parse_resume)
+            if save_to_db(details, uploaded_file.name, content_hash=digest):
+                st.success(f"Saved resume for: {details.name}")
+            else:
+                st.info(f"Resume for {details.name} is already saved.")
 
-    with tab3:
+        st.subheader("📦 Bulk Upload")
+        bulk_files = st.file_uploader("Upload a batch of resumes (.pdf or .docx)", type=["pdf", "docx"], accept_multiple_files=True, key="bulk_upload")
+        if bulk_files and st.button(f"📥 Ingest {len(bulk_files)} resumes"):
+            progress = st.progress(0.0)
+
+            def report(done, filename, error):
+                progress.progress(done / len(bulk_files), text=f"{done}/{len(bulk_files)} · {filename}")
+
+            saved, duplicates, failures = ingest(uploaded_sources(bulk_files), DB_FILE, progress=report)
+            st.success(f"Saved {saved} resumes ({duplicates} already on file).")
+            if failures:
+                with st.expander(f"⚠️ {len(failures)} files could not be parsed"):
+                    for filename, error in failures:
+                        st.markdown(f"**{filename}** — {error}")
+
+    with tab3, timer("render", "calendar"):
         st.subheader("📅 Calendar & Interview Scheduling")
 
         with st.form("calendar_form"):
@@ -244,24 +128,86 @@ def render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8):
             position_title = st.text_input("Position Title")
             interview_date = st.date_input("Interview Date")
             interview_time = st.time_input("Interview Time")
+            interviewer = st.text_input("Interviewer")
+            duration = st.selectbox("Duration (minutes)", [30, 45, 60, 90], index=2)
             teams_link = st.text_input("Microsoft Teams Link (Paste here)")
             submitted = st.form_submit_button("📅 Schedule Interview")
 
             if submitted:
-                try:
-                    link = schedule_google_event(
-                        candidate_name,
-                        candidate_email,
-                        interview_date.strftime("%Y-%m-%d"),
-                        interview_time.strftime("%H:%M"),
-                        position_title,
-                        teams_link
-                    )
-                    st.success(f"Interview scheduled! Join via [Teams]({link})")
-                except Exception as e:
-                    st.error(f"Error: {e}")
-
-    with tab4:
+                submit_job("calendar_job", "schedule_interview", {
+                    "candidate_name": candidate_name,
+                    "candidate_email": candidate_email,
+                    "interview_date": interview_date.strftime("%Y-%m-%d"),
+                    "interview_time": interview_time.strftime("%H:%M"),
+                    "position_title": position_title,
+                    "teams_link": teams_link,
+                    "interviewer": interviewer.strip(),
+                    "duration": duration,
+                })
+
+        def render_scheduled(result):
+            if "conflict" in result:
+                st.error(f"Not scheduled: {result['conflict']}")
+            elif result.get("calendar_error"):
+                st.warning(f"Interview booked, but the calendar invite failed: {result['calendar_error']}. Retry it under Upcoming Interviews.")
+            else:
+                st.success(f"Interview scheduled! Join via [meeting link]({result['join_url']})")
+
+        job_panel("calendar_job", render_scheduled, "Scheduling interview...")
+
+        st.markdown("### 🔍 Free Slots")
+        slot_interviewers = st.text_input("Interviewers (comma-separated)", key="slot_interviewers")
+        col1, col2, col3 = st.columns(3)
+        slot_from = col1.date_input("From", key="slot_from")
+        slot_days = col2.number_input("Days", min_value=1, max_value=30, value=5, key="slot_days")
+        slot_duration = col3.selectbox("Duration (minutes)", [30, 45, 60, 90], index=2, key="slot_duration")
+        names = [n.strip() for n in slot_interviewers.split(",") if n.strip()]
+        if names:
+            slots = free_slots(get_read_connection(), names, slot_from, int(slot_days), slot_duration)
+            if slots:
+                st.dataframe([{"Start": f"{start:%a %Y-%m-%d %H:%M}", "Interviewer": name} for start, name in slots], hide_index=True)
+            else:
+                st.info("No free slots in that window.")
+
+        st.markdown("### 📦 Bulk Scheduling")
+        st.caption("One candidate per line: name, email, position. Each gets the earliest free slot with the least-booked interviewer.")
+        bulk_text = st.text_area("Candidates", key="bulk_candidates")
+        if names and bulk_text.strip() and st.button(f"📅 Schedule with {', '.join(names)}"):
+            candidates = [
+                dict(zip(("name", "email", "position"), [p.strip() for p in line.split(",")] + ["", ""]))
+                for line in bulk_text.splitlines() if line.strip()
+            ]
+            submit_job("schedule_batch_job", "schedule_batch", {
+                "candidates": candidates, "interviewers": names, "day_from": slot_from.isoformat(),
+                "days": int(slot_days), "duration": slot_duration,
+            })
+
+        def render_batch_schedule(result):
+            st.success(f"Scheduled {len(result['booked'])} interviews.")
+            failed = [b["candidate"] for b in result["booked"] if b.get("calendar_error")]
+            if failed:
+                st.warning(f"Calendar invite failed for: {', '.join(failed)}. Retry under Upcoming Interviews.")
+            if result["unassigned"]:
+                st.warning(f"No free slot for: {', '.join(result['unassigned'])}")
+
+        job_panel("schedule_batch_job", render_batch_schedule, "Scheduling interviews...")
+
+        st.markdown("### 🗓️ Upcoming Interviews")
+        upcoming = upcoming_interviews(get_read_connection())
+        if upcoming:
+            st.dataframe([
+                {"When": f"{from_minutes(s):%a %Y-%m-%d %H:%M}", "Minutes": e - s, "Candidate": name, "Position": position, "Interviewer": interviewer or "", "Link": f"⚠️ invite failed: {error}" if error else url}
+                for _, name, _, position, interviewer, s, e, url, error in upcoming
+            ], hide_index=True)
+            if any(row[8] for row in upcoming) and st.button("🔁 Retry failed calendar invites"):
+                submit_job("calendar_retry_job", "calendar_retry", {}, f"calendar_retry:{datetime.now():%Y%m%d%H%M%S}")
+            job_panel("calendar_retry_job", lambda result: (st.warning if result["failed"] else st.success)(
+                f"Retried {result['retried']} invites; {result['failed']} still failing."
+            ), "Retrying calendar invites...")
+        else:
+            st.info("No upcoming interviews.")
+
+    with tab4, timer("render", "onboarding"):
         st.subheader("📁 Onboarding Documents")
 
         with st.form("onboarding_form"):
@@ -273,55 +219,99 @@ def render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8):
             submitted = st.form_submit_button("📄 Generate Offer Letter")
 
             if submitted:
-                filepath = generate_onboarding_doc(name, email, position, start_date, salary)
-                st.success(f"Offer letter generated for {name}")
-
-                if filepath and os.path.exists(filepath):
-                    with open(filepath, "rb") as f:
-                        file_data = f.read()
-                    st.download_button(
-                        "⬇️ Download Document",
-                        data=file_data,
-                        file_name=os.path.basename(filepath),
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                    )
+                submit_job("offer_job", "offer_letter", {
+                    "name": name, "email": email, "position": position,
+                    "start_date": start_date.isoformat(), "salary": salary,
+                })
+
+        def render_offer(log_id):
+            filename, document = offer_document(log_id)
+            if document:
+                st.success(f"Offer letter generated: {filename}")
+                st.download_button("⬇️ Download Document", data=document, file_name=filename, mime=DOCX_MIME)
             else:
                 st.error("Failed to generate or locate the document.")
 
-        # Show existing generated docs
-        conn = sqlite3.connect(DB_FILE)
-        docs = conn.execute("SELECT name, email, position, start_date, salary, filepath, timestamp FROM onboarding_logs ORDER BY timestamp DESC").fetchall()
-        conn.close()
+        job_panel("offer_job", render_offer, "Generating offer letter...")
+
+        st.markdown("### 📦 Batch Offer Letters")
+        hires_file = st.file_uploader("CSV of hires (name, email, position, start_date, salary)", type=["csv"], key="hires_csv")
+        if hires_file:
+            hires, errors = read_hires_csv(hires_file)
+            for error in errors[:20]:
+                st.warning(error)
+            if hires and st.button(f"📄 Generate {len(hires)} offer letters"):
+                submit_job("offer_batch_job", "offer_batch", {"hires": hires})
+
+        def render_batch(log_ids):
+            st.success(f"Generated {len(log_ids)} offer letters.")
+            st.download_button(
+                "⬇️ Download all (.zip)", data=lambda: offers_zip(log_ids),
+                file_name=f"offer_letters_{datetime.now():%Y%m%d}.zip", mime="application/zip"
+            )
+
+        job_panel("offer_batch_job", render_batch, "Generating offer letters...")
 
-        for d in docs:
-            st.markdown(f"**{d[0]}** | {d[1]} | {d[2]} | Start: {d[3]} | 💰 ${d[4]}")
-            st.markdown(f"[📄 Download]({d[5]}) — Created: *{d[6]}*")
+        # Show existing generated docs
+        def render_doc(d):
+            log_id, name, email, position, start_date, salary, filepath, ts = d
+            filename = os.path.basename(filepath or "")
+            st.markdown(f"**{name}** | {email} | {position} | Start: {start_date} | 💰 ${salary}")
+            st.download_button(
+                f"📄 {filename}", data=lambda: offer_document(log_id)[1] or b"", file_name=filename,
+                mime=DOCX_MIME, key=f"offer_download_{log_id}"
+            )
+            st.caption(f"Created: {ts}")
             st.markdown("---")
 
-    with tab5:
+        paginate_table("onboarding_logs", get_storage(), "onboarding_logs", ["id", "name", "email", "position", "start_date", "salary", "filepath", "timestamp"], render_doc)
+
+    with tab5, timer("render", "job_descriptions"):
         st.subheader("📂 Job Description Hub")
 
         with st.form("jd_form"):
             jd_content = st.text_area("Paste or write a job description")
             submitted = st.form_submit_button("💾 Save JD")
             if submitted and jd_content.strip():
-                conn = sqlite3.connect(DB_FILE)
-                conn.execute("INSERT INTO job_descriptions (content, timestamp) VALUES (?, ?)", (jd_content, datetime.now().isoformat()))
-                conn.commit()
-                conn.close()
+                insert_job_description(jd_content)
                 st.success("Job description saved!")
 
-        st.markdown("### 📜 Saved Descriptions")
-        conn = sqlite3.connect(DB_FILE)
-        jds = conn.execute("SELECT content, timestamp FROM job_descriptions ORDER BY timestamp DESC").fetchall()
-        conn.close()
+        st.markdown("### 🎯 Rank Candidates")
+        recent_jds = get_read_connection().execute("SELECT id, content FROM job_descriptions ORDER BY timestamp DESC, id DESC LIMIT 50").fetchall()
+        if recent_jds:
+            jd_id = st.selectbox(
+                "Job description", [jd[0] for jd in recent_jds],
+                format_func=lambda i: f"#{i} · {job_title(dict(recent_jds)[i])}"
+            )
+            top_k = st.slider("Candidates to send for AI scoring", 10, 200, TOP_K, step=10)
+            if st.button("🎯 Score new candidates"):
+                # Keyed on the newest resume id, so the same request is only
+                # re-run once new resumes have arrived.
+                newest = get_read_connection().execute("SELECT MAX(id) FROM resumes").fetchone()[0]
+                submit_job("score_job", "score_jd", {"jd_id": jd_id, "top_k": top_k}, f"score_jd:{jd_id}:{top_k}:{newest}")
+            job_panel("score_job", lambda result: st.success(
+                f"Pre-filtered {result['prefiltered']} new resumes, scored {result['scored']} by AI"
+                + (f"; {result['unscored']} left for the next run." if result.get("unscored") else ".")
+            ), "Scoring candidates...")
+            ranked = ranked_candidates(jd_id)
+            if ranked:
+                st.dataframe(
+                    [{"Name": r[1], "Email": r[2], "Score": r[3], "Keyword match": round(r[4] or 0, 3), "Why": r[5]} for r in ranked],
+                    use_container_width=True, hide_index=True
+                )
+        else:
+            st.info("Save a job description to rank candidates against it.")
 
-        for content, ts in jds:
+        st.markdown("### 📜 Saved Descriptions")
+        def render_jd(jd):
+            content, ts = jd
             st.code(content)
             st.caption(f"🕒 {ts}")
             st.markdown("---")
 
-    with tab6:
+        paginate_table("job_descriptions", get_storage(), "job_descriptions", ["content", "timestamp"], render_jd)
+
+    with tab6, timer("render", "branding"):
         st.subheader("🎨 Employer Branding Assets")
 
         with st.form("branding_form"):
@@ -329,23 +319,19 @@ def render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8):
             content = st.text_area("Content, link, or description")
             submitted = st.form_submit_button("📥 Upload")
             if submitted and name and content:
-                conn = sqlite3.connect(DB_FILE)
-                conn.execute("INSERT INTO branding_assets (name, content, timestamp) VALUES (?, ?, ?)", (name, content, datetime.now().isoformat()))
-                conn.commit()
-                conn.close()
+                insert_branding_asset(name, content)
                 st.success(f"Uploaded asset: {name}")
 
-        conn = sqlite3.connect(DB_FILE)
-        assets = conn.execute("SELECT name, content, timestamp FROM branding_assets ORDER BY timestamp DESC").fetchall()
-        conn.close()
-
-        for name, content, ts in assets:
+        def render_asset(asset):
+            name, content, ts = asset
             st.markdown(f"**{name}**")
             st.markdown(content)
             st.caption(f"🕒 {ts}")
             st.markdown("---")
 
-    with tab7:
+        paginate_table("branding_assets", get_storage(), "branding_assets", ["name", "content", "timestamp"], render_asset)
+
+    with tab7, timer("render", "analytics"):
         st.subheader("📊 Feedback & Candidate Experience")
 
         with st.form("feedback_form"):
@@ -354,24 +340,23 @@ def render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8):
             comments = st.text_area("Additional feedback")
             submitted = st.form_submit_button("📝 Submit Feedback")
             if submitted:
-                conn = sqlite3.connect(DB_FILE)
-                conn.execute("INSERT INTO feedback_surveys (candidate_name, rating, comments, timestamp) VALUES (?, ?, ?, ?)", (name, rating, comments, datetime.now().isoformat()))
-                conn.commit()
-                conn.close()
+                insert_feedback(name, rating, comments)
                 st.success("Thanks for your feedback!")
 
-        st.markdown("### Recent Feedback")
-        conn = sqlite3.connect(DB_FILE)
-        feedback = conn.execute("SELECT candidate_name, rating, comments, timestamp FROM feedback_surveys ORDER BY timestamp DESC").fetchall()
-        conn.close()
+        st.markdown("### 📈 Pipeline Analytics")
+        render_dashboard()
 
-        for name, rating, comments, ts in feedback:
+        st.markdown("### Recent Feedback")
+        def render_feedback(fb):
+            name, rating, comments, ts = fb
             st.markdown(f"**{name}** rated {rating}/10")
             st.markdown(f"💬 {comments}")
             st.caption(f"🕒 {ts}")
             st.markdown("---")
 
-    with tab8:
+        paginate_table("feedback_surveys", get_storage(), "feedback_surveys", ["candidate_name", "rating", "comments", "timestamp"], render_feedback)
+
+    with tab8, timer("render", "coaching"):
         st.subheader("📈 Upskilling & Coaching")
 
         with st.form("coaching_form"):
@@ -379,18 +364,19 @@ def render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8):
             notes = st.text_area("Training content or notes")
             submitted = st.form_submit_button("📚 Save Entry")
             if submitted:
-                conn = sqlite3.connect(DB_FILE)
-                conn.execute("INSERT INTO coaching_materials (title, notes, timestamp) VALUES (?, ?, ?)", (title, notes, datetime.now().isoformat()))
-                conn.commit()
-                conn.close()
+                insert_coaching_material(title, notes)
                 st.success(f"Coaching material saved: {title}")
 
-        conn = sqlite3.connect(DB_FILE)
-        coaching = conn.execute("SELECT title, notes, timestamp FROM coaching_materials ORDER BY timestamp DESC").fetchall()
-        conn.close()
-
-        for title, notes, ts in coaching:
+        def render_coaching(entry):
+            title, notes, ts = entry
             st.markdown(f"### {title}")
             st.markdown(notes)
             st.caption(f"🕒 {ts}")
-            st.markdown("---")
\ No newline at end of file
+            st.markdown("---")
+
+        paginate_table("coaching_materials", get_storage(), "coaching_materials", ["title", "notes", "timestamp"], render_coaching)
+
+    if perf_tab is not None:
+        with perf_tab:
+            st.subheader("⏱️ Performance")
+            render_performance_tab()
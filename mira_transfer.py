@@ -0,0 +1,354 @@
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+
+import streamlit as st
+
+from mira_db import DB_FILE, executemany, get_connection, get_read_connection
+
+# Bulk export/import of MIRA tables as CSV or Parquet. Exports walk the
+# table in id order with keyset pagination and yield the file a chunk at a
+# time; imports read the file in chunks and write each one through
+# mira_db.executemany, i.e. the single writer when one is configured.
+# Memory stays bounded by CHUNK_SIZE rows either way.
+
+TABLES = [
+    "resumes", "mira_logs", "onboarding_logs", "feedback_surveys",
+    "job_descriptions", "branding_assets", "coaching_materials",
+]
+# Generated documents are data of their own, not table rows worth exporting.
+SKIP_COLUMNS = {"onboarding_logs": {"document"}}
+CHUNK_SIZE = 10_000
+FORMATS = ("csv", "parquet")
+
+# --- COLUMNS ---
+def table_columns(conn, table):
+    # [(name, declared type)] in table order, minus SKIP_COLUMNS.
+    if table not in TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    skip = SKIP_COLUMNS.get(table, set())
+    return [(row[1], (row[2] or "").upper()) for row in conn.execute(f"PRAGMA table_info({table})") if row[1] not in skip]
+
+def unique_columns(conn, table):
+    # Columns covered by a UNIQUE index or constraint, e.g. resumes.content_hash.
+    names = set()
+    for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+        if index[2]:
+            names.update(row[2] for row in conn.execute(f"PRAGMA index_info({index[1]})"))
+    return names
+
+def _arrow_type(decl):
+    import pyarrow as pa
+
+    if "INT" in decl:
+        return pa.int64()
+    if "REAL" in decl or "FLOA" in decl or "DOUB" in decl:
+        return pa.float64()
+    if "BLOB" in decl:
+        return pa.binary()
+    return pa.string()
+
+def _coerce(value, decl):
+    # SQLite is dynamically typed; legacy rows can hold '85000' in a REAL
+    # column or 7 in a TEXT one. Arrow columns need one type.
+    if value is None:
+        return None
+    try:
+        if "INT" in decl:
+            return int(value)
+        if "REAL" in decl or "FLOA" in decl or "DOUB" in decl:
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if isinstance(value, (str, bytes)) else str(value)
+
+# --- EXPORT ---
+def iter_chunks(conn, table, chunk_size=CHUNK_SIZE):
+    # Keyset pagination on id: every chunk is an index range scan, so the
+    # millionth row costs the same as the first.
+    names = [name for name, _ in table_columns(conn, table)]
+    cols = ", ".join(names)
+    last_id = None
+    while True:
+        if last_id is None:
+            rows = conn.execute(f"SELECT {cols} FROM {table} ORDER BY id LIMIT ?", (chunk_size,)).fetchall()
+        else:
+            rows = conn.execute(f"SELECT {cols} FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (last_id, chunk_size)).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][names.index("id")]
+
+def csv_blocks(conn, table, chunk_size=CHUNK_SIZE):
+    # The export as UTF-8 bytes, one block per chunk of rows. The generator
+    # returns the number of rows written.
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in table_columns(conn, table)])
+    written = 0
+    for rows in iter_chunks(conn, table, chunk_size):
+        writer.writerows(rows)
+        written += len(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+    return written
+
+class _Sink:
+    # Write target for ParquetWriter that hands its bytes out between row
+    # groups. tell() keeps counting, since the footer records offsets.
+    closed = False
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+def parquet_blocks(conn, table, chunk_size=CHUNK_SIZE):
+    # The export as Parquet bytes; each chunk becomes a row group.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = table_columns(conn, table)
+    schema = pa.schema([(name, _arrow_type(decl)) for name, decl in columns])
+    sink = _Sink()
+    written = 0
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for rows in iter_chunks(conn, table, chunk_size):
+            arrays = [
+                pa.array([_coerce(row[i], decl) for row in rows], type=schema.field(i).type)
+                for i, (_, decl) in enumerate(columns)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            written += len(rows)
+            yield sink.drain()
+    yield sink.drain()
+    return written
+
+def export_blocks(conn, table, fmt, chunk_size=CHUNK_SIZE):
+    if fmt == "csv":
+        return csv_blocks(conn, table, chunk_size)
+    if fmt == "parquet":
+        return parquet_blocks(conn, table, chunk_size)
+    raise ValueError(f"Unsupported format: {fmt}")
+
+def export_table(conn, table, path, fmt=None, chunk_size=CHUNK_SIZE):
+    # Returns the number of rows written.
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    blocks = export_blocks(conn, table, fmt, chunk_size)
+    with open(path, "wb") as f:
+        while True:
+            try:
+                f.write(next(blocks))
+            except StopIteration as done:
+                return done.value
+
+class BlockStream(io.RawIOBase):
+    # A read-only file over a generator of byte blocks, for consumers that
+    # want a file object: nothing is produced until it is read, and only
+    # the block being read is held here.
+
+    def __init__(self, blocks):
+        self._blocks = iter(blocks)
+        self._pending = memoryview(b"")
+        self._started = False
+
+    def readable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # Only the rewind-before-reading that st.download_button does.
+        if offset or whence != io.SEEK_SET or self._started:
+            raise io.UnsupportedOperation("BlockStream only seeks to the start before reading")
+        return 0
+
+    def readinto(self, b):
+        self._started = True
+        while not self._pending:
+            block = next(self._blocks, None)
+            if block is None:
+                return 0
+            self._pending = memoryview(block)
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def readall(self):
+        self._started = True
+        data = b"".join([bytes(self._pending), *self._blocks])
+        self._pending = memoryview(b"")
+        return data
+
+# --- IMPORT ---
+def _csv_chunks(file, chunk_size):
+    if isinstance(file, (str, os.PathLike)):
+        file = open(file, "r", newline="", encoding="utf-8-sig")
+    elif not isinstance(file, io.TextIOBase):
+        file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    reader = csv.reader(file)
+    header = next(reader, [])
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield header, chunk
+            chunk = []
+    if chunk:
+        yield header, chunk
+
+def _parquet_chunks(file, chunk_size):
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(file)
+    header = parquet.schema_arrow.names
+    for batch in parquet.iter_batches(batch_size=chunk_size):
+        columns = [batch.column(i).to_pylist() for i in range(batch.num_columns)]
+        yield header, list(zip(*columns))
+
+class ImportStopped(Exception):
+    # Reading or writing a chunk failed after `committed` rows of the file
+    # were written.
+    def __init__(self, committed, error):
+        super().__init__(f"stopped after {committed} rows: {error}")
+        self.committed = committed
+
+def import_table(table, file, fmt, keep_ids=False, chunk_size=CHUNK_SIZE, db_file=DB_FILE):
+    # Returns (inserted, skipped). Columns are matched by name; unknown
+    # columns are ignored. Without keep_ids rows get new ids (and resumes
+    # already present by content hash are skipped); with keep_ids, rows
+    # whose id exists are updated in place. Each chunk is one executemany
+    # through mira_db, so with MIRA_WRITER set it is committed by the
+    # single writer like every other write. A failure after the first
+    # chunk raises ImportStopped: the chunks before it stay, and importing
+    # the file again skips them where the table has a unique key or with
+    # keep_ids.
+    conn = get_read_connection(db_file)
+    declared = dict(table_columns(conn, table))
+    unique = unique_columns(conn, table)
+    chunks = _csv_chunks(file, chunk_size) if fmt == "csv" else _parquet_chunks(file, chunk_size)
+
+    inserted = seen = 0
+    sql = positions = None
+    try:
+        for header, rows in chunks:
+            if sql is None:
+                names = [h for h in header if h in declared and (keep_ids or h != "id")]
+                if not names:
+                    raise ValueError(f"No columns in the file match {table}")
+                positions = [header.index(n) for n in names]
+                # CSV has no NULL. An empty cell is NULL except in text
+                # columns, where it is an empty string - but not in unique
+                # ones, where every '' after the first would be a conflict.
+                empty_is_null = [("TEXT" not in declared[n]) or n in unique for n in names]
+                placeholders = ", ".join("?" * len(names))
+                if keep_ids and "id" in names:
+                    updates = ", ".join(f"{n} = excluded.{n}" for n in names if n != "id")
+                    sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders}) ON CONFLICT (id) DO UPDATE SET {updates}"
+                else:
+                    sql = f"INSERT OR IGNORE INTO {table} ({', '.join(names)}) VALUES ({placeholders})"
+            params = [
+                tuple(None if (v == "" and null) else v for v, null in zip((row[p] for p in positions), empty_is_null))
+                for row in rows
+            ]
+            inserted += executemany(sql, params, db_file).rowcount
+            seen += len(params)
+    except Exception as e:
+        if not seen:
+            raise
+        raise ImportStopped(seen, e) from e
+    return inserted, seen - inserted
+
+def import_file(table, path, fmt=None, keep_ids=False, chunk_size=CHUNK_SIZE, db_file=DB_FILE):
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    return import_table(table, path, fmt, keep_ids, chunk_size, db_file)
+
+# --- UI ---
+def _export_stream(table, fmt):
+    # Called by st.download_button when it is clicked. Streamlit reads the
+    # whole download into bytes; the stream hands it the export a chunk at
+    # a time, so no other copy of it is built.
+    return BlockStream(export_blocks(get_read_connection(), table, fmt))
+
+def render_transfer_panel():
+    with st.sidebar.expander("🗄️ Export / Import"):
+        table = st.selectbox("Table", TABLES, key="transfer_table")
+        fmt = st.radio("Format", FORMATS, horizontal=True, key="transfer_format")
+        st.download_button(
+            f"⬇️ Export {table}", data=lambda: _export_stream(table, fmt),
+            file_name=f"{table}_{time.strftime('%Y%m%d')}.{fmt}",
+            mime="text/csv" if fmt == "csv" else "application/vnd.apache.parquet",
+        )
+
+        upload = st.file_uploader(f"Import into {table}", type=list(FORMATS), key="transfer_upload")
+        keep_ids = st.checkbox("Keep ids (update matching rows)", key="transfer_keep_ids")
+        if upload and st.button("⬆️ Import"):
+            fmt_in = upload.name.rsplit(".", 1)[-1].lower()
+            try:
+                with st.spinner(f"Importing {upload.name}..."):
+                    inserted, skipped = import_table(table, upload, fmt_in, keep_ids)
+                st.success(f"Imported {inserted} rows into {table} ({skipped} skipped).")
+            except ImportStopped as e:
+                st.error(f"Import {e}. Importing the file again skips rows that are already in, where the table has a unique key.")
+            except Exception as e:
+                st.error(f"Import failed, nothing was changed: {e}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk export/import of MIRA tables.")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database file")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="Export tables to CSV or Parquet")
+    exp.add_argument("tables", nargs="*", default=TABLES, help=f"Tables to export (default: all of {', '.join(TABLES)})")
+    exp.add_argument("--format", choices=FORMATS, default="parquet")
+    exp.add_argument("--out-dir", default="exports")
+    imp = sub.add_parser("import", help="Import a CSV or Parquet file into a table")
+    imp.add_argument("table", choices=TABLES)
+    imp.add_argument("path")
+    imp.add_argument("--keep-ids", action="store_true", help="Keep ids from the file and update rows that exist")
+    args = parser.parse_args()
+
+    from mira_migrations import migrate
+
+    conn = get_connection(args.db)
+    migrate(conn)
+    if args.command == "export":
+        os.makedirs(args.out_dir, exist_ok=True)
+        for table in args.tables:
+            path = os.path.join(args.out_dir, f"{table}.{args.format}")
+            start = time.perf_counter()
+            rows = export_table(conn, table, path, args.format, args.chunk_size)
+            print(f"{table}: {rows} rows -> {path} ({time.perf_counter() - start:.1f}s)")
+    else:
+        start = time.perf_counter()
+        try:
+            inserted, skipped = import_file(args.table, args.path, keep_ids=args.keep_ids, chunk_size=args.chunk_size, db_file=args.db)
+        except ImportStopped as e:
+            sys.exit(f"Import {e}")
+        except Exception as e:
+            sys.exit(f"Import failed, nothing was changed: {e}")
+        print(f"{args.table}: imported {inserted}, skipped {skipped} ({time.perf_counter() - start:.1f}s)")
@@ -0,0 +1,276 @@
+import argparse
+import base64
+import json
+import logging
+import os
+import queue
+import re
+import socket
+import socketserver
+import sqlite3
+import struct
+import threading
+import time
+
+from mira_db import DB_FILE, PRAGMAS
+
+# Single-writer service for running several Streamlit replicas against one
+# SQLite file. Replicas send their INSERT/UPDATE/DELETE statements over a
+# local Unix socket; one thread here owns the only write connection and
+# group-commits whatever has queued up, so replicas never wait on each
+# other's locks and a burst of form submissions costs one fsync.
+#
+# Deployment on one host:
+#   python -m mira_writer serve --db mira_resumes.db --socket /run/mira/writer.sock
+#   MIRA_WRITER=/run/mira/writer.sock MIRA_CACHE_FILE=/run/mira/cache.db streamlit run streamlit_app.py --server.port 8501
+#   (one streamlit process per port behind the load balancer)
+#
+# Each request is wrapped in a savepoint, so one failing request never rolls
+# back the others committed in the same group.
+
+SOCKET_PATH = "mira_writer.sock"
+GROUP_MAX = 64            # requests per commit
+CONNECT_TIMEOUT = 2.0
+REQUEST_TIMEOUT = 30.0
+
+# Raised by sqlite3 for bad parameters; the client re-raises them as such.
+PARAM_ERRORS = {e.__name__: e for e in (OverflowError, TypeError, ValueError)}
+
+WRITE_RE = re.compile(r"\s*(?:INSERT|UPDATE|DELETE|REPLACE)\b", re.I)
+
+logger = logging.getLogger("mira.writer")
+
+# --- WIRE FORMAT ---
+# Frames are a 4-byte big-endian length followed by JSON. Bytes values
+# (e.g. offer letter documents) travel as {"$b": base64}.
+def _encode(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"$b": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+def _decode(value):
+    if isinstance(value, dict) and "$b" in value:
+        return base64.b64decode(value["$b"])
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+def _send(sock, payload):
+    data = json.dumps(payload).encode("utf-8")
+    sock.sendall(struct.pack(">I", len(data)) + data)
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("writer connection closed")
+        buf += chunk
+    return bytes(buf)
+
+def _recv(sock):
+    (size,) = struct.unpack(">I", _recv_exact(sock, 4))
+    return json.loads(_recv_exact(sock, size))
+
+# --- SERVER ---
+class _Request:
+    __slots__ = ("ops", "done", "results", "error")
+
+    def __init__(self, ops):
+        self.ops = ops
+        self.done = threading.Event()
+        self.results = self.error = None
+
+def _error(e):
+    return {"type": type(e).__name__, "message": str(e)}
+
+class WriterService:
+    def __init__(self, db_file=DB_FILE, group_max=GROUP_MAX):
+        self.db_file = os.path.abspath(db_file)
+        self.group_max = group_max
+        self._queue = queue.Queue()
+        self.stats = {"requests": 0, "commits": 0, "errors": 0, "started": time.time()}
+
+    def submit(self, ops):
+        request = _Request(ops)
+        self._queue.put(request)
+        request.done.wait()
+        return request
+
+    def _run_ops(self, conn, ops):
+        results = []
+        for op in ops:
+            sql, params = op["sql"], _decode(op.get("params") or [])
+            if not WRITE_RE.match(sql):
+                raise sqlite3.OperationalError("the writer only accepts INSERT, UPDATE, DELETE and REPLACE")
+            if op.get("many"):
+                cur = conn.executemany(sql, params)
+                results.append({"rowcount": cur.rowcount, "lastrowid": cur.lastrowid, "rows": []})
+            else:
+                cur = conn.execute(sql, params)
+                rows = cur.fetchall()
+                results.append({"rowcount": cur.rowcount, "lastrowid": cur.lastrowid, "rows": _encode(rows)})
+        return results
+
+    def run(self):
+        # The one write connection, in autocommit mode so transactions and
+        # savepoints are spelled out below.
+        conn = sqlite3.connect(self.db_file, isolation_level=None)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.group_max:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for request in batch:
+                    conn.execute("SAVEPOINT request")
+                    try:
+                        request.results = self._run_ops(conn, request.ops)
+                    except Exception as e:
+                        # Bad SQL, but also bad parameters (OverflowError,
+                        # unsupported types) or malformed ops.
+                        conn.execute("ROLLBACK TO request")
+                        request.error = _error(e)
+                        self.stats["errors"] += 1
+                    conn.execute("RELEASE request")
+                conn.execute("COMMIT")
+                self.stats["commits"] += 1
+            except Exception as e:
+                # Whatever went wrong, the loop keeps serving: the group is
+                # rolled back and every request in it gets the error.
+                logger.exception("group commit of %s requests failed", len(batch))
+                try:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    logger.exception("rollback failed")
+                for request in batch:
+                    request.error, request.results = _error(e), None
+            finally:
+                self.stats["requests"] += len(batch)
+                for request in batch:
+                    request.done.set()
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        service = self.server.service
+        while True:
+            try:
+                message = _recv(self.connection)
+            except (ConnectionError, OSError):
+                return
+            if message.get("stats"):
+                _send(self.connection, {"stats": service.stats, "db_file": service.db_file})
+                continue
+            request = service.submit(message["ops"])
+            _send(self.connection, {"error": request.error} if request.error else {"results": request.results})
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve(db_file=DB_FILE, path=SOCKET_PATH):
+    service = WriterService(db_file)
+    threading.Thread(target=service.run, name="mira-writer", daemon=True).start()
+    if os.path.exists(path):
+        os.remove(path)
+    server = _Server(path, _Handler)
+    os.chmod(path, 0o600)   # anyone who can connect can write to the database
+    server.service = service
+    logger.info("writer for %s listening on %s", service.db_file, path)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.remove(path)
+
+# --- CLIENT ---
+class WriterUnavailable(ConnectionError):
+    # The request never reached the writer, so retrying it or writing locally
+    # cannot apply it twice.
+    pass
+
+class WriterClient:
+    # One socket per thread, opened on first use. A request that could not be
+    # sent - the writer is down, or restarted since the socket was opened - is
+    # retried once on a fresh socket; once it has been sent, a lost connection
+    # or a timeout raises, because the writer may already have committed it.
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _socket(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(self.path)
+            sock.settimeout(REQUEST_TIMEOUT)
+            self._local.sock = sock
+        return sock
+
+    def _drop(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+        self._local.sock = None
+
+    def _call(self, message):
+        for attempt in range(2):
+            try:
+                sock = self._socket()
+                # The writer only acts on complete frames, so a failed send
+                # leaves nothing behind.
+                _send(sock, message)
+                break
+            except OSError as e:
+                self._drop()
+                if attempt:
+                    raise WriterUnavailable(f"writer at {self.path} unreachable: {e}") from e
+        try:
+            return _recv(sock)
+        except OSError:
+            self._drop()
+            raise
+
+    def run(self, ops):
+        # ops: [(sql, params)] or [(sql, rows, True)] for executemany; all run
+        # atomically. Returns one {"rowcount", "lastrowid", "rows"} per op.
+        # SQLite and parameter errors are re-raised with their original class.
+        response = self._call({"ops": [
+            {"sql": op[0], "params": _encode(list(op[1])), "many": len(op) > 2 and op[2]} for op in ops
+        ]})
+        if "error" in response:
+            error = getattr(sqlite3, response["error"]["type"], None) or PARAM_ERRORS.get(response["error"]["type"], sqlite3.OperationalError)
+            raise error(response["error"]["message"])
+        for result in response["results"]:
+            result["rows"] = [tuple(row) for row in _decode(result["rows"])]
+        return response["results"]
+
+    def stats(self):
+        return self._call({"stats": True})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MIRA single-writer service.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    srv = sub.add_parser("serve", help="Run the writer")
+    srv.add_argument("--db", default=DB_FILE, help="SQLite database file")
+    srv.add_argument("--socket", default=SOCKET_PATH)
+    st_ = sub.add_parser("status", help="Show a running writer's counters")
+    st_.add_argument("--socket", default=SOCKET_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    if args.command == "serve":
+        from mira_migrations import migrate
+        migrate(sqlite3.connect(args.db))
+        serve(args.db, args.socket)
+    else:
+        print(json.dumps(WriterClient(args.socket).stats(), indent=2))
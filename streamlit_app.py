@@ -1,26 +1,19 @@
+from mira_startup import rerun_started, rerun_finished, show_startup_timings
+_rerun_start = rerun_started()
+
 import streamlit as st
+from mira_assets import show_header
+from mira_metrics import is_admin
 from mira_tab_logic import init_db, render_tabs
-import base64
-import os
 
 # MUST BE FIRST Streamlit command
 st.set_page_config(page_title="MIRA Assistant", layout="wide")
 
 # Initialize database
 init_db()
-show_header()
 
 # --- MIRA Branding Header ---
-if os.path.exists("mira.png"):
-    mira_img_path = "mira.png"
-    with open(mira_img_path, "rb") as f:
-        encoded = base64.b64encode(f.read()).decode()
-        st.markdown(f"""
-            <div style='display: flex; align-items: center; gap: 12px; margin: 1rem 0 2.5rem 0;'>
-                <img src="data:image/png;base64,{encoded}" style="width:60px;height:60px;border-radius:50%;border:2px solid #a047fa;" />
-                <h1 style="font-size: 1.8em; color: #a047fa; margin: 0;">MIRA: Your AI Recruiting Assistant</h1>
-            </div>
-        """, unsafe_allow_html=True)
+show_header()
 
 # --- Tab layout ---
 TABS = [
@@ -34,7 +27,13 @@ TABS = [
     "📈 Upskilling & Coaching"
 ]
 
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs(TABS)
+# Admin-only: MIRA_ADMIN=1 or ?admin=<[admin] token>
+if is_admin():
+    TABS.append("⏱️ Performance")
+
+tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, *perf_tab = st.tabs(TABS)
 
 # --- Render content ---
-render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8)
\ No newline at end of file
+render_tabs(tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, *perf_tab)
+
+show_startup_timings(rerun_finished(_rerun_start))
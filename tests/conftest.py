@@ -0,0 +1,73 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MIRA_METRICS", "0")
+
+from mira_migrations import migrate
+
+@pytest.fixture
+def make_db(tmp_path):
+    # Returns a function that opens a fresh, fully migrated SQLite database.
+    conns = []
+
+    def make(name="mira.db"):
+        conn = sqlite3.connect(tmp_path / name)
+        migrate(conn)
+        conns.append(conn)
+        return conn
+
+    yield make
+    for conn in conns:
+        conn.close()
+
+@pytest.fixture
+def app_db(tmp_path, monkeypatch):
+    # Runs the test inside tmp_path with fresh process-wide resources, so the
+    # app's default mira_resumes.db, pools and caches all live there.
+    import streamlit as st
+
+    import mira_db
+
+    def reset():
+        for pool in mira_db._POOLS:
+            pool.close_all()
+        mira_db._POOLS.clear()
+        st.cache_resource.clear()
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("MIRA_WRITER", raising=False)
+    monkeypatch.delenv("MIRA_DATABASE_URL", raising=False)
+    monkeypatch.setenv("MIRA_CACHE_FILE", str(tmp_path / "mira_cache.db"))
+    reset()
+    conn = mira_db.get_connection()
+    migrate(conn)
+    yield conn
+    reset()
+
+@pytest.fixture
+def writer(app_db, monkeypatch):
+    # A mira_writer service for the app_db database on a private socket,
+    # with MIRA_WRITER pointing the app at it. Yields the WriterService.
+    import streamlit as st
+
+    from mira_writer import WriterService, _Handler, _Server
+
+    service = WriterService("mira_resumes.db")
+    threading.Thread(target=service.run, daemon=True).start()
+    # Unix socket paths are limited to ~100 bytes; tmp_path can be longer.
+    path = os.path.join(tempfile.mkdtemp(), "writer.sock")
+    server = _Server(path, _Handler)
+    server.service = service
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("MIRA_WRITER", path)
+    st.cache_resource.clear()
+    yield service
+    server.shutdown()
+    server.server_close()
+    os.remove(path)
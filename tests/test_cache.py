@@ -0,0 +1,29 @@
+import pickle
+
+from mira_cache import SharedCache, shared_cache
+
+class Boom:
+    def __reduce__(self):
+        return (exec, ("raise SystemExit('unpickled')",))
+
+def test_values_round_trip_as_json(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.db"))
+    cache.set("k", {"counts": {"resume": 2}, "hits": [("resume", 1, "line")]}, ttl=60)
+    assert cache.get("k") == (True, {"counts": {"resume": 2}, "hits": [["resume", 1, "line"]]})
+
+def test_pickled_entries_are_never_loaded(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.db"))
+    with cache._conn() as conn:
+        conn.execute("INSERT INTO cache (key, value, expires) VALUES ('k', ?, 9e18)", (pickle.dumps(Boom()),))
+    assert cache.get("k") == (False, None)
+
+def test_decorator_keys_on_the_arguments(app_db):
+    calls = []
+
+    @shared_cache("test", ttl=60)
+    def double(x, scale=2):
+        calls.append(x)
+        return x * scale
+
+    assert [double(1), double(1), double(2), double(1, scale=3)] == [2, 2, 4, 3]
+    assert calls == [1, 2, 1]
@@ -0,0 +1,41 @@
+import numpy as np
+
+from mira_embeddings import EmbeddingIndex, HashingEmbedder, get_index, index_prefix, semantic_search, sync_index
+
+def _add_resumes(conn, rows):
+    conn.executemany("INSERT INTO resumes (name, skills, experience, timestamp) VALUES (?, ?, ?, '2024-01-01')", rows)
+    conn.commit()
+
+def test_hashing_embedder_is_unit_length_and_maps_listed_synonyms():
+    embedder = HashingEmbedder()
+    ml, spelled_out, design = (embedder.embed(t) for t in ("ML engineer", "machine learning engineer", "graphic design"))
+    assert np.isclose(np.linalg.norm(ml), 1.0)
+    assert ml @ spelled_out > ml @ design
+
+def test_index_appends_and_other_instances_see_them(tmp_path):
+    prefix = str(tmp_path / "idx")
+    writer, reader = EmbeddingIndex(prefix), EmbeddingIndex(prefix)
+    writer.add([1, 2], ["python developer", "pastry chef"])
+    assert [i for i, _ in reader.search("python", 2)] == [1, 2]
+    writer.add([3], ["senior python engineer"])
+    assert {i for i, _ in reader.search("python", 3)} == {1, 2, 3}
+    assert reader.max_id() == 3
+
+def test_sync_only_embeds_new_resumes(make_db, tmp_path):
+    conn = make_db()
+    index = EmbeddingIndex(str(tmp_path / "idx"))
+    _add_resumes(conn, [("Ana", "python", ""), ("Ben", "figma", "")])
+    assert index.sync(conn) == 2
+    assert index.sync(conn) == 0
+    _add_resumes(conn, [("Cy", "kubernetes", "")])
+    assert index.sync(conn) == 1
+    assert len(index) == 3
+
+def test_queries_read_the_index_without_syncing(app_db, monkeypatch):
+    monkeypatch.setenv("MIRA_EMBEDDING_MODEL", "hashing")
+    assert get_index().vec_path == index_prefix() + ".f32"
+    _add_resumes(app_db, [("Ana", "machine learning, python", "")])
+    assert semantic_search(app_db, "ML engineer") == []
+
+    assert sync_index() == 1
+    assert [r[1] for r in semantic_search(app_db, "ML engineer")] == ["Ana"]
@@ -0,0 +1,52 @@
+import zipfile
+
+import pytest
+from docx import Document
+
+from mira_ingest import collect_sources, ingest
+
+def _resume(path, name, skills):
+    doc = Document()
+    for line in (name, f"{name.split()[0].lower()}@example.com", "(555) 123-4567", "Skills", skills, "Experience", "Acme", "Education", "BSc"):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "resumes"
+    (folder / "nested").mkdir(parents=True)
+    _resume(folder / "ana.docx", "Ana Cho", "Python")
+    _resume(folder / "nested" / "ben.docx", "Ben Ito", "Go")
+    (folder / "ana_copy.docx").write_bytes((folder / "ana.docx").read_bytes())
+    (folder / "broken.pdf").write_bytes(b"not a pdf")
+    (folder / "~$ana.docx").write_bytes(b"lock file")
+    (folder / "notes.txt").write_text("ignored")
+    return folder
+
+def test_collects_resumes_from_folders_and_zips(folder, tmp_path):
+    assert sorted(s[1] for s in collect_sources(str(folder))) == ["ana.docx", "ana_copy.docx", "ben.docx", "broken.pdf"]
+
+    archive = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.write(folder / "ana.docx", "batch/ana.docx")
+        z.write(folder / "ana.docx", "__MACOSX/batch/._ana.docx")
+    assert list(collect_sources(str(archive))) == [("zip", "ana.docx", str(archive), "batch/ana.docx")]
+
+    with pytest.raises(ValueError):
+        list(collect_sources(str(folder / "notes.txt")))
+
+def test_ingest_saves_new_resumes_once(folder, app_db):
+    seen = []
+    saved, duplicates, failures = ingest(collect_sources(str(folder)), workers=2, batch_size=2, progress=lambda *a: seen.append(a[0]))
+    assert (saved, duplicates) == (2, 1)
+    assert [name for name, _ in failures] == ["broken.pdf"]
+    assert seen == [1, 2, 3, 4]
+    assert app_db.execute("SELECT name, email, skills FROM resumes ORDER BY name").fetchall() == [
+        ("Ana Cho", "ana@example.com", "Python"), ("Ben Ito", "ben@example.com", "Go"),
+    ]
+    assert app_db.execute("SELECT COUNT(*) FROM resume_parse_cache").fetchone()[0] == 2
+
+    # A second run finds every file in the parse cache and stores nothing new.
+    saved, duplicates, failures = ingest(collect_sources(str(folder)), workers=2)
+    assert (saved, duplicates, len(failures)) == (0, 3, 1)
+    assert app_db.execute("SELECT COUNT(*) FROM resumes").fetchone()[0] == 2
@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+import mira_jobs
+from mira_jobs import LEASE_SECONDS, _finish, _heartbeat, claim, enqueue, get_job, purge_finished, queue_counts, run_one
+
+@pytest.fixture
+def handler(app_db, monkeypatch):
+    # Every job kind runs `handler.run`; tests replace it.
+    class Handler:
+        run = staticmethod(lambda **payload: payload)
+
+    handler = Handler()
+    monkeypatch.setattr(mira_jobs, "_resolve", lambda kind: handler.run)
+    return handler
+
+def _expire_lease(conn, job_id):
+    conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time() - LEASE_SECONDS - 1, job_id))
+    conn.commit()
+
+def test_enqueue_is_idempotent_and_requeues_failed_jobs(app_db):
+    job_id = enqueue("score_jd", {"jd_id": 1})
+    assert enqueue("score_jd", {"jd_id": 1}) == job_id
+    assert enqueue("score_jd", {"jd_id": 2}) != job_id
+    with pytest.raises(ValueError):
+        enqueue("no_such_kind", {})
+
+    app_db.execute("UPDATE jobs SET status = 'failed', attempts = 3, error = 'boom' WHERE id = ?", (job_id,))
+    app_db.commit()
+    assert enqueue("score_jd", {"jd_id": 1}) == job_id
+    job = get_job(job_id)
+    assert (job["status"], job["attempts"], job["error"]) == ("queued", 0, None)
+
+def test_claims_oldest_job_once(app_db):
+    first = enqueue("score_jd", {"jd_id": 1})
+    second = enqueue("score_jd", {"jd_id": 2})
+    assert claim("a")[0] == first
+    assert claim("b")[0] == second
+    assert claim("c") is None
+    assert queue_counts() == {"running": 2}
+
+def test_expired_lease_is_taken_over_and_the_old_worker_cannot_finish(app_db):
+    job_id = enqueue("score_jd", {"jd_id": 1})
+    claim("a")
+    _expire_lease(app_db, job_id)
+
+    job = claim("b")
+    assert (job[0], job[3]) == (job_id, 2)
+    _finish(job_id, "a", result="stale")
+    assert get_job(job_id)["status"] == "running"
+    _finish(job_id, "b", result="fresh")
+    assert (get_job(job_id)["status"], get_job(job_id)["result"]) == ("done", "fresh")
+
+def test_heartbeat_keeps_the_lease(app_db):
+    job_id = enqueue("score_jd", {"jd_id": 1})
+    claim("a")
+    _expire_lease(app_db, job_id)
+    _heartbeat(job_id, "b")
+    assert app_db.execute("SELECT heartbeat_at FROM jobs").fetchone()[0] < time.time() - LEASE_SECONDS
+    _heartbeat(job_id, "a")
+    assert claim("b") is None
+    assert get_job(job_id)["status"] == "running"
+
+def test_expired_lease_counts_as_an_attempt(app_db):
+    job_id = enqueue("score_jd", {"jd_id": 1}, max_attempts=1)
+    claim("a")
+    _expire_lease(app_db, job_id)
+    assert claim("b") is None
+    job = get_job(job_id)
+    assert (job["status"], job["error"]) == ("failed", "worker stopped responding")
+
+def test_failures_retry_with_backoff_then_fail(handler, app_db):
+    def fail(**payload):
+        raise RuntimeError("calendar down")
+
+    handler.run = fail
+    job_id = enqueue("calendar_retry", {}, max_attempts=2)
+    assert run_one("a")
+    job = get_job(job_id)
+    assert (job["status"], job["attempts"], job["error"]) == ("queued", 1, "RuntimeError: calendar down")
+    assert claim("a") is None  # waiting out RETRY_DELAY
+
+    app_db.execute("UPDATE jobs SET run_after = 0 WHERE id = ?", (job_id,))
+    app_db.commit()
+    assert run_one("a")
+    assert (get_job(job_id)["status"], get_job(job_id)["attempts"]) == ("failed", 2)
+    assert not run_one("a")
+
+def test_run_one_stores_the_result_and_purge_removes_old_jobs(handler, app_db):
+    job_id = enqueue("calendar_retry", {"n": 3})
+    assert run_one("a")
+    assert get_job(job_id)["result"] == {"n": 3}
+
+    assert purge_finished() == 0
+    assert purge_finished(days=-1) == 1
+    assert get_job(job_id) is None
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+from mira_llm import LLMBackend, LLMGateway, RetryableLLMError, StubBackend
+
+class CountingBackend(LLMBackend):
+    # Records how many requests are open at once; a stream stays open until
+    # its generator finishes or is closed. fail_first raises a retryable
+    # error on that many calls before answering.
+    name = "counting"
+
+    def __init__(self, latency=0.02, fail_first=0, fail_after_first_delta=False):
+        self.latency = latency
+        self.fail_first = fail_first
+        self.fail_after_first_delta = fail_after_first_delta
+        self.calls = self.open = self.peak = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.calls += 1
+            self.open += 1
+            self.peak = max(self.peak, self.open)
+            return self.calls
+
+    def _exit(self):
+        with self._lock:
+            self.open -= 1
+
+    def complete(self, messages, model, timeout):
+        call = self._enter()
+        try:
+            time.sleep(self.latency)
+            if call <= self.fail_first:
+                raise RetryableLLMError("429")
+            return StubBackend()._completion(messages, model)
+        finally:
+            self._exit()
+
+    def stream(self, messages, model, timeout):
+        call = self._enter()
+        try:
+            if call <= self.fail_first:
+                raise RetryableLLMError("429")
+            for word in ("one", " two", " three"):
+                time.sleep(self.latency)
+                yield word
+                if self.fail_after_first_delta:
+                    raise RetryableLLMError("connection reset")
+        finally:
+            self._exit()
+
+    async def acomplete(self, messages, model, timeout):
+        return self.complete(messages, model, timeout)
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(LLMGateway, "_backoff", lambda self, attempt: 0)
+
+def _run_threads(target, n):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+def test_retries_retryable_errors_then_succeeds():
+    backend = CountingBackend(latency=0, fail_first=2)
+    gateway = LLMGateway(backend, max_retries=3)
+    assert gateway.chat("hi").text
+    assert backend.calls == 3
+    assert gateway.usage()["retries"] == 2
+
+def test_gives_up_after_max_retries():
+    gateway = LLMGateway(CountingBackend(latency=0, fail_first=10), max_retries=2)
+    with pytest.raises(RetryableLLMError):
+        gateway.chat("hi")
+    assert gateway.usage()["errors"] == 1
+
+def test_completions_respect_max_concurrency():
+    backend = CountingBackend()
+    gateway = LLMGateway(backend, max_concurrency=3)
+    _run_threads(lambda: gateway.chat("hi"), 10)
+    assert backend.calls == 10
+    assert backend.peak == 3
+
+def test_streams_hold_their_slot_until_closed():
+    # A consumer that renders slowly keeps its stream open; other streams
+    # must wait for the slot rather than open more requests.
+    backend = CountingBackend(latency=0.005)
+    gateway = LLMGateway(backend, max_concurrency=2)
+
+    def consume():
+        for _ in gateway.stream("hi"):
+            time.sleep(0.02)
+
+    _run_threads(consume, 6)
+    assert backend.calls == 6
+    assert backend.peak == 2
+    assert gateway.usage()["calls"] == 6
+
+def test_closing_a_stream_early_releases_the_slot():
+    gateway = LLMGateway(CountingBackend(latency=0), max_concurrency=1)
+    stream = gateway.stream("hi")
+    assert next(stream) == "one"
+    stream.close()
+    assert "".join(gateway.stream("hi")) == "one two three"
+
+def test_streams_retry_only_before_the_first_delta():
+    backend = CountingBackend(latency=0, fail_first=1)
+    assert "".join(LLMGateway(backend).stream("hi")) == "one two three"
+    assert backend.calls == 2
+
+    backend = CountingBackend(latency=0, fail_after_first_delta=True)
+    received = []
+    with pytest.raises(RetryableLLMError):
+        for delta in LLMGateway(backend).stream("hi"):
+            received.append(delta)
+    assert received == ["one"]
+    assert backend.calls == 1
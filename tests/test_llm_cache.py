@@ -0,0 +1,65 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import mira_llm_cache
+from mira_llm_cache import cache_key, cached_completion, lookup_cached, store_response
+
+@pytest.fixture
+def clock(monkeypatch):
+    # A settable clock for mira_llm_cache only; clock[0] is "now".
+    now = [1000.0]
+    monkeypatch.setattr(mira_llm_cache, "time", SimpleNamespace(time=lambda: now[0], perf_counter=time.perf_counter))
+    return now
+
+def _compute(calls):
+    def compute(prompt):
+        calls.append(prompt)
+        return f"answer {len(calls)}"
+    return compute
+
+def test_normalized_prompts_share_an_entry(app_db):
+    calls = []
+    assert cached_completion("m", "sys", "Who knows Python?", _compute(calls), similarity=False) == ("answer 1", "llm")
+    assert cached_completion("m", "sys", "who knows   python", _compute(calls), similarity=False) == ("answer 1", "cache")
+    assert cached_completion("other", "sys", "who knows python", _compute(calls), similarity=False) == ("answer 2", "llm")
+    assert app_db.execute("SELECT hits FROM llm_cache WHERE cache_key = ?", (cache_key("m", "sys", "who knows python"),)).fetchone() == (1,)
+
+def test_expired_entries_are_recomputed_and_removed(app_db, clock):
+    store_response("m", "sys", "old question", "old answer", 0.5)
+
+    assert lookup_cached("m", "sys", "old question", ttl=60, similarity=False) == ("old answer", "cache")
+    clock[0] += 61
+    assert lookup_cached("m", "sys", "old question", ttl=60, similarity=False) == (None, None)
+    assert app_db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] == 0
+
+def test_store_evicts_least_recently_used_and_expired(app_db, clock, monkeypatch):
+    monkeypatch.setattr(mira_llm_cache, "MAX_ENTRIES", 3)
+    monkeypatch.setattr(mira_llm_cache, "TTL_SECONDS", 100)
+    store_response("m", "sys", "stale", "x", 0)
+    clock[0] += 150
+    for q in ("a", "b", "c"):
+        clock[0] += 1
+        store_response("m", "sys", q, q.upper(), 0)
+    assert app_db.execute("SELECT prompt FROM llm_cache ORDER BY prompt").fetchall() == [("a",), ("b",), ("c",)]
+
+    clock[0] += 1
+    assert lookup_cached("m", "sys", "a", similarity=False)[0] == "A"
+    clock[0] += 1
+    store_response("m", "sys", "d", "D", 0)
+    assert app_db.execute("SELECT prompt FROM llm_cache ORDER BY prompt").fetchall() == [("a",), ("c",), ("d",)]
+
+def test_similar_question_reuses_a_logged_answer(app_db):
+    app_db.executemany("INSERT INTO mira_logs (question, answer, timestamp, context_tokens) VALUES (?, ?, ?, ?)", [
+        ("Which candidates know Kubernetes?", "Cy Park [resume:3]", "2024-01-01", 0),
+        ("and which of them know Go?", "Cy Park", "2024-01-02", 120),
+    ])
+    app_db.commit()
+
+    assert lookup_cached("m", "sys", "which candidates know kubernetes") == ("Cy Park [resume:3]", "similar")
+    # Stored in the exact tier for next time.
+    assert lookup_cached("m", "sys", "Which candidates know Kubernetes", similarity=False)[1] == "cache"
+    assert lookup_cached("m", "sys", "which candidates know rust") == (None, None)
+    # Follow-ups asked with conversation context are never reused.
+    assert lookup_cached("m", "sys", "and which of them know Go") == (None, None)
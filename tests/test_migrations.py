@@ -0,0 +1,52 @@
+import sqlite3
+
+from mira_analytics import rebuild_rollups
+from mira_migrations import MIGRATIONS, migrate
+from mira_retrieval import rebuild_knowledge_index
+
+ROLLUPS = ["analytics_daily", "analytics_ratings", "analytics_funnel", "analytics_time_to_offer"]
+
+def _seed(conn):
+    conn.executemany("INSERT INTO resumes (name, email, status, timestamp) VALUES (?, ?, ?, ?)", [
+        ("Ana Cho", "ana@example.com", "New", "2024-01-02T10:00:00"),
+        ("Ben Ito", "ben@example.com", "Interviewing", "2024-01-03T10:00:00"),
+    ])
+    conn.execute("INSERT INTO onboarding_logs (name, email, position, timestamp) VALUES ('Ana Cho', 'ana@example.com', 'Engineer', '2024-01-12T10:00:00')")
+    conn.executemany("INSERT INTO feedback_surveys (candidate_name, rating, comments, timestamp) VALUES (?, ?, ?, ?)", [
+        ("Ana Cho", 9, "great", "2024-01-05T10:00:00"),
+        ("Ben Ito", None, "", "2024-01-06T10:00:00"),
+    ])
+    conn.execute("INSERT INTO job_descriptions (content, timestamp) VALUES ('Platform Engineer\nKubernetes, Go', '2024-01-01T09:00:00')")
+    conn.execute("INSERT INTO coaching_materials (title, notes, timestamp) VALUES ('Interviewing', 'STAR answers', '2024-01-04T09:00:00')")
+    conn.commit()
+
+def _dump(conn, tables):
+    return {t: conn.execute(f"SELECT * FROM {t} ORDER BY 1, 2").fetchall() for t in tables}
+
+def test_rebuilds_match_trigger_maintained_tables(make_db):
+    conn = make_db()
+    _seed(conn)
+    rollups = _dump(conn, ROLLUPS)
+    knowledge = conn.execute("SELECT rowid, title, body, kind, timestamp FROM knowledge_fts ORDER BY rowid").fetchall()
+    assert len(knowledge) == 4
+
+    with conn:
+        rebuild_rollups(conn)
+        rebuild_knowledge_index(conn)
+
+    assert _dump(conn, ROLLUPS) == rollups
+    assert conn.execute("SELECT rowid, title, body, kind, timestamp FROM knowledge_fts ORDER BY rowid").fetchall() == knowledge
+
+def test_snapshot_values_become_real(tmp_path, monkeypatch):
+    conn = sqlite3.connect(tmp_path / "old.db")
+    monkeypatch.setattr("mira_migrations.MIGRATIONS", [m for m in MIGRATIONS if m[0] < 20])
+    migrate(conn)
+    conn.execute("INSERT INTO analytics_snapshots (metric, value, timestamp) VALUES ('resumes', 12, '2024-01-01')")
+    conn.commit()
+    monkeypatch.setattr("mira_migrations.MIGRATIONS", MIGRATIONS)
+
+    assert 20 in migrate(conn)
+    assert {r[1]: r[2] for r in conn.execute("PRAGMA table_info(analytics_snapshots)")}["value"] == "REAL"
+    conn.execute("INSERT INTO analytics_snapshots (metric, value, timestamp) VALUES ('avg_rating', 7.5, '2024-01-02')")
+    assert conn.execute("SELECT metric, value FROM analytics_snapshots ORDER BY id").fetchall() == [("resumes", 12.0), ("avg_rating", 7.5)]
+    conn.close()
@@ -0,0 +1,75 @@
+import io
+import os
+import zipfile
+
+import pytest
+from docx import Document
+
+from mira_offers import _builtin_template, generate_offers, load_template, offer_document, offers_zip, read_hires_csv, render_offer
+
+HIRE = {"name": "Ana O'Neil & Co", "email": "ana@example.com", "position": "Data <Engineer>", "start_date": "2024-03-01", "salary": 95000}
+
+def _text(docx):
+    return "\n".join(p.text for p in Document(io.BytesIO(docx)).paragraphs)
+
+def _template(tmp_path, *paragraphs):
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    path = tmp_path / "offer.docx"
+    doc.save(path)
+    return str(path)
+
+def test_placeholders_are_filled_and_escaped():
+    text = _text(render_offer(HIRE))
+    assert "Dear Ana O'Neil & Co," in text
+    assert "position of Data <Engineer>. Your start date will be 2024-03-01, with a starting salary of $95,000." in text
+    assert "{{" not in text
+
+def test_letters_share_the_template_but_not_their_fields():
+    template = load_template(None)
+    first, second = render_offer(HIRE, template), render_offer({**HIRE, "name": "Ben Ito", "salary": "n/a"}, template)
+    assert "Ana" in _text(first) and "Ana" not in _text(second)
+    assert "salary of $n/a" in _text(second)
+    with zipfile.ZipFile(io.BytesIO(first)) as a, zipfile.ZipFile(io.BytesIO(_builtin_template())) as b:
+        assert sorted(a.namelist()) == sorted(b.namelist())
+
+def test_custom_template_and_reload_on_edit(tmp_path):
+    path = _template(tmp_path, "Hi {{ name }}: {{position}} from {{start_date}} at {{salary}} ({{unknown}})")
+    assert "Hi Ana O'Neil & Co: Data <Engineer> from 2024-03-01 at 95,000 ({{unknown}})" in _text(render_offer(HIRE, load_template(path)))
+
+    path = _template(tmp_path, "Hello {{name}}, {{position}} {{start_date}} {{salary}}")
+    os.utime(path, (os.path.getmtime(path) + 5,) * 2)
+    assert _text(render_offer(HIRE, load_template(path))).startswith("Hello")
+
+def test_template_missing_placeholders_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="salary"):
+        load_template(_template(tmp_path, "Dear {{name}}, {{position}} from {{start_date}}"))
+
+def test_read_hires_csv():
+    hires, errors = read_hires_csv(io.BytesIO(
+        "﻿ Name ,EMAIL,Position,Start_Date,Salary\n"
+        "Ana Cho,ana@example.com,Engineer,2024-03-01,\"$95,000\"\n"
+        "Ben Ito,,Analyst,2024-03-04,lots\n"
+        ",,Analyst,2024-03-04,1\n".encode()
+    ))
+    assert hires == [{"name": "Ana Cho", "email": "ana@example.com", "position": "Engineer", "start_date": "2024-03-01", "salary": 95000.0}]
+    assert errors == ["Line 3: salary 'lots' is not a number", "Line 4: name and position are required"]
+    assert read_hires_csv(io.StringIO("name,salary\n")) == ([], ["Missing columns: position, start_date"])
+
+def test_generated_letters_are_stored_and_downloadable(app_db, tmp_path):
+    ids = generate_offers([HIRE, {**HIRE, "name": "Ben Ito"}])
+    filename, document = offer_document(ids[1])
+    assert filename.startswith("Ben_Ito_") and "Dear Ben Ito," in _text(document)
+
+    # Letters from before documents were stored are read from disk.
+    legacy = tmp_path / "legacy.docx"
+    legacy.write_bytes(render_offer(HIRE))
+    app_db.execute("INSERT INTO onboarding_logs (name, filepath, timestamp) VALUES ('Cy', ?, '2024-01-01')", (str(legacy),))
+    app_db.commit()
+    legacy_id = app_db.execute("SELECT MAX(id) FROM onboarding_logs").fetchone()[0]
+    assert offer_document(legacy_id) == ("legacy.docx", legacy.read_bytes())
+    assert offer_document(999) == (None, None)
+
+    with zipfile.ZipFile(io.BytesIO(offers_zip([*ids, legacy_id, 999]))) as z:
+        assert [n.split("_")[0] for n in z.namelist()] == [str(i) for i in (*ids, legacy_id)]
@@ -0,0 +1,63 @@
+from mira_pagination import estimate_count, fetch_page, offset_fetcher
+
+def _seed(conn, n):
+    # Several rows share a timestamp, so the id has to break the tie.
+    conn.executemany(
+        "INSERT INTO job_descriptions (content, timestamp) VALUES (?, ?)",
+        [(f"JD {i}", f"2024-01-{i // 3 + 1:02}T10:00:00") for i in range(n)],
+    )
+    conn.commit()
+
+def _walk(conn, limit):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = fetch_page(conn, "job_descriptions", ["content"], limit, cursor)
+        pages.append([r[0] for r in rows])
+        if cursor is None:
+            return pages
+
+def test_pages_cover_every_row_once_newest_first(make_db):
+    conn = make_db()
+    _seed(conn, 11)
+    pages = _walk(conn, 4)
+
+    assert [len(p) for p in pages] == [4, 4, 3]
+    expected = [r[0] for r in conn.execute("SELECT content FROM job_descriptions ORDER BY timestamp DESC, id DESC")]
+    assert sum(pages, []) == expected
+    assert pages[0][:3] == ["JD 10", "JD 9", "JD 8"]
+
+def test_exact_multiple_has_no_empty_last_page(make_db):
+    conn = make_db()
+    _seed(conn, 8)
+    assert [len(p) for p in _walk(conn, 4)] == [4, 4]
+
+def test_rows_added_while_paging_do_not_shift_later_pages(make_db):
+    conn = make_db()
+    _seed(conn, 6)
+    first, cursor = fetch_page(conn, "job_descriptions", ["content"], 3)
+    conn.execute("INSERT INTO job_descriptions (content, timestamp) VALUES ('new', '2025-01-01T00:00:00')")
+    second, _ = fetch_page(conn, "job_descriptions", ["content"], 3, cursor)
+
+    assert [r[0] for r in first] == ["JD 5", "JD 4", "JD 3"]
+    assert [r[0] for r in second] == ["JD 2", "JD 1", "JD 0"]
+
+def test_cursor_with_null_timestamp_still_pages(make_db):
+    # Cursors saved before migration 17 can carry a NULL timestamp.
+    conn = make_db()
+    _seed(conn, 3)
+    rows, _ = fetch_page(conn, "job_descriptions", ["content"], 10, (None, 10**9))
+    assert rows == []
+    rows, _ = fetch_page(conn, "job_descriptions", ["content"], 10, ("9999", 10**9))
+    assert len(rows) == 3
+
+def test_estimate_count_and_offset_fetcher(make_db):
+    conn = make_db()
+    _seed(conn, 5)
+    # MAX(id) over-counts deleted rows; that is what the label promises.
+    conn.execute("DELETE FROM job_descriptions WHERE content = 'JD 0'")
+    assert estimate_count(conn, "job_descriptions") == 5
+    assert estimate_count(conn, "branding_assets") == 0
+
+    fetch = offset_fetcher(lambda limit, offset: list(range(7))[offset:offset + limit])
+    assert fetch(None, 3) == ([0, 1, 2], 3)
+    assert fetch(6, 3) == ([6], None)
@@ -0,0 +1,70 @@
+from mira_parsing import (ResumeDetails, extract_details, extract_details_from_chunks, find_emails, find_links,
+                          find_phones)
+
+PAGES = [
+    "Ana Cho\nana@example.com | (555) 123-4567\nhttps://www.linkedin.com/in/anacho\n\nSUMMARY: Data engineer\n",
+    "Skills & Tools\nPython, AWS\nWork Experience - 5 years\nAcme, pipelines\n",
+    "Education\nBSc Computer Science\n",
+    "Certifications\nAWS Solutions Architect\n",
+]
+
+class Pages:
+    # A page generator that records how far it was read and whether it was closed.
+    def __init__(self, pages):
+        self.pages = pages
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.read == len(self.pages):
+            raise StopIteration
+        self.read += 1
+        return self.pages[self.read - 1]
+
+    def close(self):
+        self.closed = True
+
+def test_contact_fields_and_sections():
+    details = extract_details("".join(PAGES))
+    assert (details.name, details.email, details.phone) == ("Ana Cho", "ana@example.com", "(555) 123-4567")
+    assert details.links == ("https://www.linkedin.com/in/anacho",)
+    assert details.summary == "Data engineer"
+    assert details.skills == "Python, AWS"
+    assert details.experience == "5 years\nAcme, pipelines"
+    assert details.education == "BSc Computer Science"
+    assert details.certifications == "AWS Solutions Architect"
+
+def test_stops_once_required_sections_are_closed():
+    # Experience is closed by the Education header on page three; page four
+    # is never read and the source is closed.
+    pages = Pages(PAGES)
+    text, details = extract_details_from_chunks(pages)
+    assert pages.read == 3 and pages.closed
+    assert "Certifications" not in text
+    assert details.experience == "5 years\nAcme, pipelines"
+    assert details.certifications == ""
+
+def test_reads_everything_when_a_required_section_never_closes():
+    pages = Pages([PAGES[0], "Skills\nGo\nExperience\nlong\n", "more experience\n"])
+    _, details = extract_details_from_chunks(pages)
+    assert pages.read == 3 and pages.closed
+    assert details.experience == "long\nmore experience"
+
+def test_sentences_are_not_headers():
+    details = extract_details("Ana Cho\nSkills\nPython\nMy experience with teams and people is broad\nExperience\nAcme\n")
+    assert details.skills == "Python\nMy experience with teams and people is broad"
+    assert details.experience == "Acme"
+
+def test_contact_finders():
+    text = "mail ana.cho+jobs@mail.example.co.uk, or @handle; call +1 555.123.4567 or 2024-01-02 see github.com/ana."
+    assert find_emails(text) == ["ana.cho+jobs@mail.example.co.uk"]
+    assert find_phones(text) == ["+1 555.123.4567"]
+    assert find_links(text) == ["github.com/ana"]
+
+def test_details_round_trip_through_a_row():
+    details = extract_details("".join(PAGES))
+    assert ResumeDetails.from_row(details.row()) == details
+    assert ResumeDetails.from_row([None] * 11) == ResumeDetails()
@@ -0,0 +1,67 @@
+import pytest
+
+import mira_pdf
+from mira_pdf import PDFBackend, PDFTooLarge, extract_pdf_text, iter_pdf_pages
+
+class FakeBackend(PDFBackend):
+    # "PDF" bytes are pages separated by form feeds; records every page read.
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+        self.read = []
+
+    def page_count(self, data):
+        if self.fail:
+            raise ValueError("cannot open")
+        return len(data.split(b"\f"))
+
+    def pages(self, data, start, stop):
+        for i in range(start, stop):
+            self.read.append(i)
+            yield data.split(b"\f")[i].decode()
+
+@pytest.fixture
+def backends(monkeypatch):
+    def install(*backends):
+        monkeypatch.setattr(mira_pdf, "BACKENDS", {b.name: b for b in backends})
+        return backends
+    return install
+
+def _pdf(*pages):
+    return "\f".join(pages).encode()
+
+def test_pages_are_read_only_as_far_as_the_caller_goes(backends):
+    fake, = backends(FakeBackend("fake"))
+    pages = iter_pdf_pages(_pdf("one", "two", "three", "four"), parallel=False)
+    assert next(pages) == "one"
+    assert next(pages) == "two"
+    pages.close()
+    assert fake.read == [0, 1]
+
+def test_each_page_is_read_once_and_blank_pages_skipped(backends):
+    fake, = backends(FakeBackend("fake"))
+    assert list(iter_pdf_pages(_pdf("one", " ", "three"), parallel=False)) == ["one", "three"]
+    assert fake.read == [0, 1, 2]
+
+def test_page_and_character_limits(backends):
+    fake, = backends(FakeBackend("fake"))
+    assert list(iter_pdf_pages(_pdf("a", "b", "c", "d"), parallel=False, max_pages=2)) == ["a", "b"]
+    assert fake.read == [0, 1]
+    assert list(iter_pdf_pages(_pdf("abcd", "efgh", "ijkl"), parallel=False, max_chars=6)) == ["abcd", "ef"]
+
+def test_too_large_is_rejected_before_reading(backends, monkeypatch):
+    fake, = backends(FakeBackend("fake"))
+    monkeypatch.setattr(mira_pdf, "MAX_BYTES", 10)
+    with pytest.raises(PDFTooLarge):
+        extract_pdf_text(_pdf("x" * 20))
+    assert fake.read == []
+
+def test_falls_back_to_a_backend_that_finds_text(backends):
+    broken, scanned, text = backends(FakeBackend("broken", fail=True), FakeBackend("scanned"), FakeBackend("text"))
+    scanned.pages = lambda data, start, stop: iter([""] * (stop - start))
+    assert extract_pdf_text(_pdf("one", "two"), parallel=False) == "one\ntwo"
+    assert text.read == [0, 1]
+
+    backends(FakeBackend("broken", fail=True))
+    with pytest.raises(ValueError, match="Could not read PDF"):
+        extract_pdf_text(_pdf("one"))
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+from mira_retrieval import parse_question, retrieval_context, retrieve
+
+def _seed(conn):
+    now = datetime.now()
+    conn.executemany("INSERT INTO resumes (name, email, skills, timestamp) VALUES (?, ?, ?, ?)", [
+        ("Ana Cho", "ana@example.com", "python, aws", now.isoformat()),
+        ("Ben Ito", "ben@example.com", "python", (now - timedelta(days=60)).isoformat()),
+        ("Cy Park", "cy@example.com", "kubernetes", now.isoformat()),
+    ])
+    conn.execute("INSERT INTO job_descriptions (content, timestamp) VALUES ('Data Engineer\nPython and AWS', ?)", (now.isoformat(),))
+    conn.execute("INSERT INTO feedback_surveys (candidate_name, rating, comments, timestamp) VALUES ('Ana Cho', 9, 'strong python', ?)", (now.isoformat(),))
+    conn.commit()
+
+def test_parse_question():
+    now = datetime(2024, 5, 15, 12, 30)
+    terms, kinds, since = parse_question("Which candidates know Python and AWS this month?", now)
+    assert terms == ["python", "aws"]
+    assert kinds == {"resume"}
+    assert since == "2024-05-01T00:00:00"
+
+    terms, kinds, since = parse_question("feedback for kubernetes roles in the last 7 days", now)
+    assert terms == ["kubernetes"]
+    assert kinds == {"feedback", "jd"}
+    assert since == "2024-05-08T12:30:00"
+
+def test_records_must_match_every_term(app_db):
+    _seed(app_db)
+    result = retrieve("candidates with python and aws")
+    assert result["match"] == "all"
+    assert [(kind, rid) for kind, rid, _ in result["hits"]] == [("resume", 1)]
+    assert result["counts"] == {"resume": 1}
+
+def test_falls_back_to_any_term_only_when_nothing_matches_all(app_db):
+    _seed(app_db)
+    result = retrieve("candidates with aws or kubernetes")
+    assert result["match"] == "any"
+    assert sorted(rid for _, rid, _ in result["hits"]) == [1, 3]
+
+    text, _ = retrieval_context("candidates with aws or kubernetes")
+    assert "matching any of aws, kubernetes" in text
+    assert "[resume:3] Cy Park" in text
+
+def test_time_filter_and_sources(app_db):
+    _seed(app_db)
+    result = retrieve("python this month")
+    assert sorted(result["counts"].items()) == [("feedback", 1), ("jd", 1), ("resume", 1)]
+    assert {kind for kind, _, _ in result["hits"]} == {"resume", "jd", "feedback"}
+
+    result = retrieve("python candidates")
+    assert result["counts"] == {"resume": 2}
+
+def test_new_rows_are_not_hidden_by_the_cache(app_db):
+    _seed(app_db)
+    assert retrieve("kubernetes candidates")["counts"] == {"resume": 1}
+    app_db.execute("INSERT INTO resumes (name, skills, timestamp) VALUES ('Di Lee', 'kubernetes', '2024-01-01')")
+    app_db.commit()
+    assert retrieve("kubernetes candidates")["counts"] == {"resume": 2}
+
+def test_no_content_words_searches_nothing(app_db):
+    assert retrieve("who are the candidates?")["hits"] == []
+    assert retrieval_context("show me all of them")[0] == ""
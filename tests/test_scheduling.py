@@ -0,0 +1,79 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import mira_scheduling
+from mira_calendar import CalendarError, FakeCalendarProvider
+from mira_scheduling import (SchedulingConflict, book_interview, bulk_schedule, cancel_interview, free_slots,
+                             retry_calendar_events)
+
+# A Monday far enough ahead that every slot is in the future.
+MONDAY = date.today() + timedelta(days=14 - date.today().weekday())
+
+def at(hour, minute=0, day=MONDAY):
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour, minutes=minute)
+
+@pytest.fixture
+def calendar(app_db, monkeypatch):
+    calendar = FakeCalendarProvider()
+    monkeypatch.setattr(mira_scheduling, "get_calendar", lambda: calendar)
+    return calendar
+
+def test_overlaps_conflict_but_back_to_back_does_not(calendar):
+    first = book_interview("Ana Cho", "ana@example.com", "Engineer", at(10), "Kim")
+    assert first["join_url"] == "https://meet.example.com/fake-1"
+
+    with pytest.raises(SchedulingConflict, match="Ana Cho's interview with Kim at .* 10:00"):
+        book_interview("Ben Ito", "ben@example.com", "Engineer", at(10, 30), "Kim")
+    with pytest.raises(SchedulingConflict, match="Ana Cho"):
+        book_interview("Ana Cho", "ana@example.com", "Engineer", at(9, 30), "Lee")
+    book_interview("Ben Ito", "ben@example.com", "Engineer", at(11), "Kim")
+    book_interview("Cy Park", "cy@example.com", "Engineer", at(9), "Kim")
+    assert len(calendar.events) == 3
+
+def test_cancelling_frees_the_slot(calendar):
+    first = book_interview("Ana Cho", "ana@example.com", "Engineer", at(10), "Kim")
+    assert cancel_interview(first["id"])
+    assert calendar.events == {}
+    book_interview("Ben Ito", "ben@example.com", "Engineer", at(10), "Kim")
+    assert not cancel_interview(999)
+
+def test_free_slots_skip_busy_time(calendar, app_db):
+    book_interview("Ana Cho", "ana@example.com", "Engineer", at(9), "Kim")
+    slots = free_slots(app_db, ["Kim", "Lee"], MONDAY, days=1, limit=6)
+    # Lee has never been booked and is free throughout; Kim is busy 9-10.
+    assert slots == [(at(9), "Lee"), (at(9, 30), "Lee"), (at(10), "Kim"), (at(10), "Lee"), (at(10, 30), "Kim"), (at(10, 30), "Lee")]
+    # The weekend has no slots.
+    assert free_slots(app_db, ["Kim"], MONDAY + timedelta(days=5), days=2) == []
+
+def test_bulk_schedule_spreads_load_and_respects_existing_bookings(calendar):
+    book_interview("Ana Cho", "ana@example.com", "Engineer", at(9), "Kim")
+    candidates = [{"name": n, "email": f"{n.lower()}@example.com", "position": "Engineer"} for n in ("Ana", "Ben", "Cy")]
+    candidates[0]["email"] = "ana@example.com"
+    result = bulk_schedule(candidates, ["Kim", "Lee"], MONDAY, days=1, work_hours=(9, 11))
+
+    booked = [(b["candidate"], b["interviewer"], b["start"]) for b in result["booked"]]
+    # Ana is already busy 9-10; Ben takes Lee at 9, Ana and Cy share 10:00.
+    assert booked == [
+        ("Ana", "Kim", at(10).isoformat()),
+        ("Ben", "Lee", at(9).isoformat()),
+        ("Cy", "Lee", at(10).isoformat()),
+    ]
+    assert result["unassigned"] == []
+
+    result = bulk_schedule([{"name": "Di", "email": "di@example.com"}], ["Kim", "Lee"], MONDAY, days=1, work_hours=(9, 11))
+    assert result == {"booked": [], "unassigned": ["Di"]}
+
+def test_calendar_failures_are_recorded_and_retried(calendar, app_db):
+    def down(*args, **kwargs):
+        raise CalendarError("calendar down")
+
+    calendar.create_event = down
+    result = book_interview("Ana Cho", "ana@example.com", "Engineer", at(10), "Kim")
+    assert result["calendar_error"] == "calendar down"
+    assert retry_calendar_events() == {"retried": 1, "failed": 1}
+
+    del calendar.create_event
+    assert retry_calendar_events() == {"retried": 1, "failed": 0}
+    assert retry_calendar_events() == {"retried": 0, "failed": 0}
+    assert app_db.execute("SELECT provider, external_id, calendar_error FROM interviews").fetchall() == [("fake", "fake-1", None)]
@@ -0,0 +1,115 @@
+import json
+import re
+from collections import Counter
+
+import pytest
+
+import mira_scoring
+from mira_db import get_read_connection
+from mira_llm import Completion
+from mira_scoring import index_new_resumes, prefilter_new_resumes, score_job_description
+
+JD_PYTHON = "Python Engineer\nPython, Kubernetes and PostgreSQL; builds data pipelines."
+JD_DESIGN = "Product Designer\nFigma, user research, prototyping."
+
+class FakeGateway:
+    # Scores every candidate in the prompt: 90 if "python" is in its skills,
+    # else 10. Batches listed in fail_batches raise instead.
+    def __init__(self, fail_batches=()):
+        self.calls = 0
+        self.fail_batches = set(fail_batches)
+
+    async def achat(self, prompt, system_prompt=None):
+        self.calls += 1
+        if self.calls in self.fail_batches:
+            raise RuntimeError("LLM unavailable")
+        items = [
+            {"id": int(i), "score": 90 if "python" in skills.lower() else 10, "reason": "fake"}
+            for i, skills in re.findall(r"- id: (\d+)\n  name: .*\n  skills: (.*)", prompt)
+        ]
+        return Completion(json.dumps(items), "fake")
+
+def _add_resumes(conn, rows):
+    conn.executemany("INSERT INTO resumes (name, skills, experience, timestamp) VALUES (?, ?, ?, '2024-01-01')", rows)
+    conn.commit()
+
+def _jd(conn, content):
+    cur = conn.execute("INSERT INTO job_descriptions (content, timestamp) VALUES (?, '2024-01-01')", (content,))
+    conn.commit()
+    return cur.lastrowid
+
+def _stored_df(conn):
+    return {term: df for term, df in conn.execute("SELECT term, df FROM scoring_terms") if df}
+
+def _expected_df(conn):
+    return dict(Counter(t for (terms,) in conn.execute("SELECT terms FROM scoring_docs") for t in json.loads(terms)))
+
+def test_prefilter_only_tokenizes_new_resumes(app_db, monkeypatch):
+    conn = app_db
+    _add_resumes(conn, [("Ana", "python, sql", "data pipelines"), ("Ben", "figma", "design systems")])
+    assert prefilter_new_resumes(conn, 1, JD_PYTHON) == 2
+
+    tokenized = []
+    monkeypatch.setattr(mira_scoring, "tokenize", lambda text, real=mira_scoring.tokenize: tokenized.append(text) or real(text))
+    _add_resumes(conn, [("Cy", "python, kubernetes", "platform")])
+    assert prefilter_new_resumes(conn, 1, JD_PYTHON) == 1
+    assert [t for t in tokenized if t != JD_PYTHON] == [mira_scoring._resume_text("python, kubernetes", "platform")]
+
+    sims = dict(conn.execute("SELECT r.name, s.prefilter FROM resume_scores s JOIN resumes r ON r.id = s.resume_id"))
+    assert min(sims["Ana"], sims["Cy"]) > sims["Ben"] == 0
+
+def test_document_frequencies_follow_deletes_and_edits(app_db):
+    conn = app_db
+    _add_resumes(conn, [("Ana", "python, sql", ""), ("Ben", "python, go", ""), ("Cy", "figma", "")])
+    index_new_resumes(conn)
+    assert _stored_df(conn)["python"] == 2
+
+    conn.execute("DELETE FROM resumes WHERE name = 'Ana'")
+    conn.execute("UPDATE resumes SET skills = 'rust' WHERE name = 'Ben'")
+    conn.commit()
+    assert index_new_resumes(conn) == 1
+    assert "python" not in _stored_df(conn)
+    assert _stored_df(conn) == _expected_df(conn)
+    assert index_new_resumes(conn) == 0
+
+def test_scores_are_kept_per_job_description(app_db):
+    _add_resumes(app_db, [("Ana", "python, sql", "data pipelines"), ("Ben", "figma, user research", "prototyping")])
+    app_db.execute("UPDATE resumes SET score = 0, job_title = 'Original'")
+    app_db.commit()
+    python_jd, design_jd = _jd(app_db, JD_PYTHON), _jd(app_db, JD_DESIGN)
+
+    score_job_description(python_jd, gateway=FakeGateway())
+    score_job_description(design_jd, gateway=FakeGateway())
+
+    scores = app_db.execute("SELECT jd_id, resume_id, score FROM resume_scores WHERE score IS NOT NULL ORDER BY 1, 2").fetchall()
+    assert scores == [(python_jd, 1, 90), (design_jd, 2, 10)]
+    # The resume row itself is not overwritten by whichever JD ran last.
+    assert app_db.execute("SELECT score, job_title, status FROM resumes ORDER BY id").fetchall() == [(0, "Original", "Scored"), (0, "Original", "Scored")]
+
+def test_failed_batches_stay_unscored_for_the_next_run(app_db):
+    _add_resumes(app_db, [(f"Dev {i}", "python", "") for i in range(4)])
+    jd = _jd(app_db, JD_PYTHON)
+
+    with pytest.raises(RuntimeError):
+        score_job_description(jd, batch_size=2, gateway=FakeGateway(fail_batches={2}))
+    assert app_db.execute("SELECT COUNT(*) FROM resume_scores WHERE score IS NULL").fetchone()[0] == 2
+
+    assert score_job_description(jd, batch_size=2, gateway=FakeGateway()) == {"prefiltered": 0, "scored": 2, "unscored": 0}
+    assert app_db.execute("SELECT COUNT(*) FROM resume_scores WHERE score IS NULL").fetchone()[0] == 0
+
+def test_concurrent_indexing_counts_each_resume_once(writer, app_db, monkeypatch):
+    _add_resumes(app_db, [("Ana", "python, sql", ""), ("Ben", "python, go", "")])
+    real, racing = mira_scoring.tokenize, []
+
+    def tokenize(text):
+        # Another replica indexes the same resumes between this run's read
+        # and its write.
+        if not racing:
+            racing.append(True)
+            assert index_new_resumes(get_read_connection()) == 2
+        return real(text)
+
+    monkeypatch.setattr(mira_scoring, "tokenize", tokenize)
+    assert index_new_resumes(get_read_connection()) == 0
+    assert _stored_df(app_db) == _expected_df(app_db) == {"python": 2, "sql": 1, "go": 1}
+    assert writer.stats["requests"] == 2 and writer.stats["errors"] == 0
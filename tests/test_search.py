@@ -0,0 +1,53 @@
+from mira_search import build_fts_query, rebuild_resume_index, search_resumes
+
+RESUMES = [
+    ("Ana Cho", "ana@example.com", "python, aws", "Built data pipelines"),
+    ("Ben Ito", "ben@example.com", "java", "Python scripting for tests"),
+    ("Cy Park", "cy@example.com", "go, kubernetes", "Machine learning platform"),
+]
+
+def _seed(conn):
+    conn.executemany(
+        "INSERT INTO resumes (name, email, skills, experience, timestamp) VALUES (?, ?, ?, ?, '2024-01-02')", RESUMES
+    )
+    conn.commit()
+
+def _names(rows):
+    return [r[1] for r in rows]
+
+def test_build_fts_query():
+    assert build_fts_query("python aws") == '"python"* "aws"*'
+    assert build_fts_query('skills:python "machine learning"') == 'skills : "python"* "machine learning"'
+    assert build_fts_query("python OR java") == '"python"* OR "java"*'
+    # Leading and trailing operators, unknown fields and punctuation.
+    assert build_fts_query("OR python AND") == '"python"*'
+    assert build_fts_query("https://example.com") == '("https"* "example"* "com"*)'
+    assert build_fts_query("  \"\" ") == ""
+
+def test_terms_must_all_match_unless_or(make_db):
+    conn = make_db()
+    _seed(conn)
+    assert _names(search_resumes(conn, "python aws")) == ["Ana Cho"]
+    assert sorted(_names(search_resumes(conn, "aws OR kubernetes"))) == ["Ana Cho", "Cy Park"]
+    assert _names(search_resumes(conn, "pyth NOT java")) == ["Ana Cho"]
+    assert search_resumes(conn, "") == []
+
+def test_field_scope_and_weights(make_db):
+    conn = make_db()
+    _seed(conn)
+    # Both mention python; the skills column outranks experience.
+    assert _names(search_resumes(conn, "python")) == ["Ana Cho", "Ben Ito"]
+    assert _names(search_resumes(conn, "exp:python")) == ["Ben Ito"]
+    assert _names(search_resumes(conn, '"machine learning"')) == ["Cy Park"]
+    assert _names(search_resumes(conn, "python", limit=1, offset=1)) == ["Ben Ito"]
+
+def test_index_follows_updates_and_deletes(make_db):
+    conn = make_db()
+    _seed(conn)
+    conn.execute("UPDATE resumes SET skills = 'rust' WHERE name = 'Ana Cho'")
+    conn.execute("DELETE FROM resumes WHERE name = 'Ben Ito'")
+    assert _names(search_resumes(conn, "python")) == []
+    assert _names(search_resumes(conn, "rust")) == ["Ana Cho"]
+
+    rebuild_resume_index(conn)
+    assert _names(search_resumes(conn, "rust")) == ["Ana Cho"]
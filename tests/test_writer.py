@@ -0,0 +1,157 @@
+import os
+import socket
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import mira_db
+from mira_jobs import claim, enqueue, get_job, run_one
+from mira_scheduling import SchedulingConflict, book_interview
+from mira_writer import WriterClient, WriterService, WriterUnavailable, _recv, _send
+
+INSERT_FEEDBACK = "INSERT INTO feedback_surveys (candidate_name, rating, timestamp) VALUES (?, ?, '2024-01-01')"
+
+def _submit_all(service, requests):
+    # Queues every request before the writer thread starts, so they all
+    # land in one group; returns the finished _Request objects in order.
+    done = [None] * len(requests)
+
+    def submit(i):
+        done[i] = service.submit(requests[i])
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(requests))]
+    for t in threads:
+        t.start()
+    while service._queue.qsize() < len(requests):
+        pass
+    threading.Thread(target=service.run, daemon=True).start()
+    for t in threads:
+        t.join()
+    return done
+
+def _op(sql, params):
+    return {"sql": sql, "params": list(params)}
+
+def test_queued_requests_share_one_commit(make_db, tmp_path):
+    conn = make_db()
+    service = WriterService(tmp_path / "mira.db")
+    done = _submit_all(service, [[_op(INSERT_FEEDBACK, (f"C{i}", i % 10 + 1))] for i in range(20)])
+
+    assert all(r.error is None for r in done)
+    assert service.stats["commits"] == 1 and service.stats["requests"] == 20
+    assert conn.execute("SELECT COUNT(*) FROM feedback_surveys").fetchone()[0] == 20
+
+def test_a_failing_request_does_not_undo_the_others(make_db, tmp_path):
+    conn = make_db()
+    service = WriterService(tmp_path / "mira.db")
+    done = _submit_all(service, [
+        [_op(INSERT_FEEDBACK, ("Ana", 9))],
+        # The first op applies, the second fails: the whole request is undone.
+        [_op(INSERT_FEEDBACK, ("Ben", 8)), _op("INSERT INTO no_such_table VALUES (?)", (1,))],
+        [_op("SELECT * FROM resumes", ())],
+        [_op(INSERT_FEEDBACK, ("Cy", 7))],
+    ])
+
+    assert [r.error["type"] if r.error else None for r in done] == [None, "OperationalError", "OperationalError", None]
+    assert service.stats["commits"] == 1 and service.stats["errors"] == 2
+    assert conn.execute("SELECT candidate_name FROM feedback_surveys ORDER BY id").fetchall() == [("Ana",), ("Cy",)]
+
+class FakeWriter:
+    # A socket that answers frames per connection: connection n runs
+    # script[n], a list of "reply" (answer one frame) and "hang up" (read
+    # one frame and close without answering). Records every frame read and
+    # counts the connections it has closed.
+    def __init__(self, *script):
+        self.path = os.path.join(tempfile.mkdtemp(), "writer.sock")
+        self.received = []
+        self.closed = 0
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen()
+        threading.Thread(target=self._serve, args=(script,), daemon=True).start()
+
+    def _serve(self, script):
+        for steps in script:
+            conn, _ = self._server.accept()
+            with conn:
+                for step in steps:
+                    self.received.append(_recv(conn))
+                    if step == "hang up":
+                        break
+                    _send(conn, {"results": [{"rowcount": 1, "lastrowid": len(self.received), "rows": []}]})
+            self.closed += 1
+
+    def close(self):
+        self._server.close()
+        os.remove(self.path)
+
+def test_client_reconnects_when_the_writer_restarted():
+    # The first connection serves one request and goes away, as when the
+    # writer restarts; the next request is sent again on a new socket.
+    writer = FakeWriter(["reply"], ["reply"])
+    client = WriterClient(writer.path)
+    try:
+        assert client.run([(INSERT_FEEDBACK, ("Ana", 9))])[0]["lastrowid"] == 1
+        while not writer.closed:
+            pass
+        assert client.run([(INSERT_FEEDBACK, ("Ben", 8))])[0]["lastrowid"] == 2
+        assert len(writer.received) == 2
+    finally:
+        writer.close()
+
+def test_client_never_resends_a_request_the_writer_received():
+    writer = FakeWriter(["hang up"], ["reply"])
+    client = WriterClient(writer.path)
+    try:
+        with pytest.raises(ConnectionError) as lost:
+            client.run([(INSERT_FEEDBACK, ("Ana", 9))])
+        assert not isinstance(lost.value, WriterUnavailable)
+        assert len(writer.received) == 1
+    finally:
+        writer.close()
+
+def test_lost_reply_is_not_written_locally_as_well(app_db, monkeypatch):
+    # Unlike an unreachable writer, a lost reply must not fall back to a
+    # local write: the writer may have committed the request.
+    writer = FakeWriter(["hang up"])
+    monkeypatch.setenv("MIRA_WRITER", writer.path)
+    mira_db.get_writer.clear()
+    try:
+        with pytest.raises(ConnectionError):
+            mira_db.execute(INSERT_FEEDBACK, ("Ana", 9))
+        assert app_db.execute("SELECT COUNT(*) FROM feedback_surveys").fetchone()[0] == 0
+    finally:
+        writer.close()
+
+def test_unreachable_writer_falls_back_to_local_writes(app_db, monkeypatch):
+    monkeypatch.setenv("MIRA_WRITER", os.path.join(tempfile.mkdtemp(), "missing.sock"))
+    mira_db.get_writer.clear()
+    mira_db.execute(INSERT_FEEDBACK, ("Ana", 9))
+    assert app_db.execute("SELECT candidate_name FROM feedback_surveys").fetchall() == [("Ana",)]
+
+def test_job_queue_goes_through_the_writer(writer, app_db):
+    job_id = enqueue("calendar_retry", {})
+    assert enqueue("calendar_retry", {}) == job_id
+    assert run_one("worker-1")
+    assert get_job(job_id)["status"] == "done"
+    assert claim("worker-1") is None
+    # enqueue twice, claim, finish, and the empty claim.
+    assert writer.stats["requests"] == 5 and writer.stats["errors"] == 0
+
+def test_booking_through_the_writer_rejects_double_bookings(writer, app_db, monkeypatch):
+    monkeypatch.setenv("MIRA_CALENDAR_PROVIDER", "fake")
+    start = datetime.combine(datetime.now().date() + timedelta(days=7), datetime.min.time()) + timedelta(hours=10)
+    first = book_interview("Ana Cho", "ana@example.com", "Engineer", start, "Kim")
+    with pytest.raises(SchedulingConflict, match="Ana Cho"):
+        book_interview("Ben Ito", "ben@example.com", "Engineer", start + timedelta(minutes=30), "Kim")
+    with pytest.raises(SchedulingConflict):
+        book_interview("Ana Cho", "ana@example.com", "Engineer", start, "Lee")
+    book_interview("Ben Ito", "ben@example.com", "Engineer", start, "Lee")
+
+    assert app_db.execute("""
+        SELECT i.candidate_name, v.name FROM interviews i JOIN interviewers v ON v.id = i.interviewer_id ORDER BY i.id
+    """).fetchall() == [("Ana Cho", "Kim"), ("Ben Ito", "Lee")]
+    assert first["calendar_error"] is None
+    assert writer.stats["errors"] == 0